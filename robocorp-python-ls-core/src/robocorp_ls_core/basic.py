@@ -422,6 +422,27 @@ def isinstance_name(obj, classname, memo={}):
         return memo[key]
 
 
+def create_tmp_filename(filename: str) -> str:
+    """
+    Creates an empty temporary file in the same directory of the given
+    filename (to be written and then moved to the given filename with
+    `os.replace`).
+
+    The name is unique, so, it's safe to use it when different threads or
+    processes write to the same filename at the same time.
+
+    Note: the temporary filename always ends with `.tmp`.
+    """
+    import tempfile
+
+    directory, basename = os.path.split(filename)
+    fd, tmp_filename = tempfile.mkstemp(
+        prefix=basename + ".", suffix=".tmp", dir=directory or None
+    )
+    os.close(fd)
+    return tmp_filename
+
+
 def build_subprocess_kwargs(cwd, env, **kwargs) -> dict:
     from robocorp_ls_core.subprocess_wrapper import subprocess
 
@@ -203,6 +203,18 @@ class CompletionItem(_Base):
         self.documentationFormat = documentationFormat
 
 
+class CompletionList(_Base):
+    def __init__(self, items, isIncomplete=False):
+        """
+        :param List[CompletionItem|dict] items:
+        :param bool isIncomplete:
+            Whether the list isn't complete (in which case the client should
+            request the completions again as the user types).
+        """
+        self.isIncomplete = isIncomplete
+        self.items = items
+
+
 class MarkupContent(_Base):
     def __init__(self, kind: "MarkupKind", value: str):
         self.kind = kind
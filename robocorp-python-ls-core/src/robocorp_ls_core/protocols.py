@@ -208,7 +208,12 @@ class ILanguageServerClientBase(IRequestCancellable, Protocol):
 
 class IRobotFrameworkApiClient(ILanguageServerClientBase, Protocol):
     def initialize(
-        self, msg_id=None, process_id=None, root_uri="", workspace_folders=()
+        self,
+        msg_id=None,
+        process_id=None,
+        root_uri="",
+        workspace_folders=(),
+        initialization_options=None,
     ):
         pass
 
@@ -221,6 +226,13 @@ class IRobotFrameworkApiClient(ILanguageServerClientBase, Protocol):
     def request_lint(self, doc_uri: str) -> Optional[IIdMessageMatcher]:
         pass
 
+    def request_lint_dependents(
+        self, doc_uri: str, max_fan_out: int
+    ) -> Optional[IIdMessageMatcher]:
+        """
+        :Note: async complete.
+        """
+
     def forward(self, method_name, params):
         pass
 
@@ -11,12 +11,19 @@ I.e.:
         print('not acquired')
     
     
-Or to keep trying to get the mutex until a given timeout elapses:
+Or to wait for the mutex to be released until a given timeout elapses:
 
     with timed_acquire_mutex('mutex_name'):
         # Do something without any racing condition with other processes
         ...
 
+Readers may use a shared lock (so that they don't serialize among themselves,
+only waiting for writers which hold the exclusive lock):
+
+    with timed_acquire_mutex('mutex_name', shared=True):
+        # Read something
+        ...
+
 License: Dual-licensed under LGPL and Apache 2.0
 
 Copyright: Brainwy Software
@@ -80,23 +87,50 @@ if sys.platform == "win32":
 
     import os
 
+    # Interval to check whether the lock file can be created when waiting.
+    _WIN32_POLL_TIME = 0.05
+
     class SystemMutex(object):
-        def __init__(self, mutex_name, check_reentrant=True, log_info=False):
+        def __init__(
+            self, mutex_name, check_reentrant=True, log_info=False, shared=False, timeout=0
+        ):
             """
             :param check_reentrant:
                 Should only be False if this mutex is expected to be released in
                 a different thread.
+
+            :param shared:
+                Shared locks aren't available on Windows (an exclusive lock is
+                always obtained).
+
+            :param timeout:
+                The time to wait for the lock to be released by its holder
+                (0 means that it's not waited for).
             """
             check_valid_mutex_name(mutex_name)
             self.mutex_name = mutex_name
             self.thread_id = get_tid()
+            self.shared = False
             filename = os.path.join(tempfile.gettempdir(), mutex_name)
+            finish_at = time.time() + timeout
+
+            def create_lock_file():
+                while True:
+                    try:
+                        os.unlink(filename)
+                    except Exception:
+                        pass
+                    try:
+                        return os.open(filename, os.O_CREAT | os.O_EXCL | os.O_RDWR)
+                    except Exception:
+                        if time.time() >= finish_at:
+                            raise
+                        if check_reentrant:
+                            _verify_prev_acquired_in_thread(mutex_name)
+                        time.sleep(_WIN32_POLL_TIME)
+
             try:
-                os.unlink(filename)
-            except Exception:
-                pass
-            try:
-                handle = os.open(filename, os.O_CREAT | os.O_EXCL | os.O_RDWR)
+                handle = create_lock_file()
                 try:
                     try:
                         pid = str(os.getpid())
@@ -156,30 +190,141 @@ else:  # Linux
     import os
     import fcntl  # @UnresolvedImport
 
+    def _blocking_flock(handle, operation, timeout):
+        """
+        Waits for the lock in a helper thread (flock() itself has no timeout).
+
+        :return:
+            True if the lock was obtained in the given timeout and False
+            otherwise (in which case the lock obtained later by the helper
+            thread is released right away).
+        """
+        # The helper thread uses its own fd for the same open file description
+        # (flock() locks are bound to it): this way the handle may be closed
+        # if the timeout elapses while the helper thread is still waiting.
+        fd = os.dup(handle.fileno())
+        state_lock = threading.Lock()
+        state = {"acquired": False, "cancelled": False}
+        acquired_event = threading.Event()
+
+        def wait_for_lock():
+            try:
+                fcntl.flock(fd, operation)
+            except Exception:
+                os.close(fd)
+                acquired_event.set()
+                return
+
+            with state_lock:
+                if state["cancelled"]:
+                    try:
+                        fcntl.flock(fd, fcntl.LOCK_UN)
+                    except Exception:
+                        pass
+                else:
+                    state["acquired"] = True
+            # Closing the dup'ed fd keeps the lock (the handle still has the
+            # open file description).
+            os.close(fd)
+            acquired_event.set()
+
+        t = threading.Thread(target=wait_for_lock, name="SystemMutex wait")
+        t.daemon = True
+        t.start()
+
+        acquired_event.wait(timeout)
+        with state_lock:
+            if state["acquired"]:
+                return True
+            state["cancelled"] = True
+            return False
+
+    def _lock_file(filename, operation, timeout, before_wait):
+        """
+        :return:
+            The handle for the locked file or None if it wasn't possible to
+            obtain the lock.
+        """
+        finish_at = time.time() + timeout
+        while True:
+            handle = open(filename, "a+")
+            try:
+                try:
+                    fcntl.flock(handle, operation | fcntl.LOCK_NB)
+                except (BlockingIOError, PermissionError):
+                    remaining = finish_at - time.time()
+                    if remaining <= 0:
+                        handle.close()
+                        return None
+                    before_wait()
+                    if not _blocking_flock(handle, operation, remaining):
+                        handle.close()
+                        return None
+
+                # The previous holder of an exclusive lock removes the file
+                # (before releasing it), so, check that the file locked is
+                # still the one in the filesystem (otherwise, start over).
+                try:
+                    if os.stat(filename).st_ino == os.fstat(handle.fileno()).st_ino:
+                        return handle
+                except FileNotFoundError:
+                    pass
+                handle.close()
+            except BaseException:
+                handle.close()
+                raise
+
     class SystemMutex(object):
-        def __init__(self, mutex_name, check_reentrant=True, log_info=False):
+        def __init__(
+            self, mutex_name, check_reentrant=True, log_info=False, shared=False, timeout=0
+        ):
             """
             :param check_reentrant:
                 Should only be False if this mutex is expected to be released in
                 a different thread.
+
+            :param shared:
+                If True a shared lock is obtained (any number of shared locks
+                may be held at the same time, but not along with an exclusive
+                lock). Used for readers while writers use an exclusive lock.
+
+            :param timeout:
+                The time to wait for the lock to be released by its holder(s)
+                (0 means that it's not waited for).
             """
 
             check_valid_mutex_name(mutex_name)
             self.mutex_name = mutex_name
             self.thread_id = get_tid()
+            self.shared = shared
             filename = os.path.join(tempfile.gettempdir(), mutex_name)
+
+            def before_wait():
+                # Waiting for a mutex held by this same thread would never work.
+                if check_reentrant:
+                    _verify_prev_acquired_in_thread(mutex_name)
+
+            handle = None
             try:
-                handle = open(filename, "a+")
-                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
-                handle.write(str(os.getpid()) + "\n")
-                handle.flush()
+                handle = _lock_file(
+                    filename,
+                    fcntl.LOCK_SH if shared else fcntl.LOCK_EX,
+                    timeout,
+                    before_wait,
+                )
+                if handle is None:
+                    raise RuntimeError("Unable to lock: %s" % (filename,))
+                if not shared:
+                    handle.write(str(os.getpid()) + "\n")
+                    handle.flush()
             except Exception:
                 self._release_mutex = NULL
                 self._acquired = False
                 if check_reentrant:
                     _verify_prev_acquired_in_thread(mutex_name)
                 try:
-                    handle.close()
+                    if handle is not None:
+                        handle.close()
                 except Exception:
                     pass
 
@@ -217,6 +362,17 @@ else:  # Linux
                     # Note: can't use self here!
                     if not getattr(release_mutex, "called", False):
                         release_mutex.called = True
+                        if not shared:
+                            # Removing is pretty much optional (but let's do it to
+                            # keep the filesystem cleaner). Note: it must be done
+                            # while still holding the lock (the ones waiting for
+                            # the removed file will notice that it changed) and
+                            # only for exclusive locks (other shared locks may
+                            # still be held).
+                            try:
+                                os.unlink(filename)
+                            except Exception:
+                                pass
                         try:
                             fcntl.flock(handle, fcntl.LOCK_UN)
                         except Exception:
@@ -225,12 +381,6 @@ else:  # Linux
                             handle.close()
                         except Exception:
                             traceback.print_exc()
-                        try:
-                            # Removing is pretty much optional (but let's do it to keep the
-                            # filesystem cleaner).
-                            os.unlink(filename)
-                        except Exception:
-                            pass
 
                 # Don't use __del__: this approach doesn't have as many pitfalls.
                 self._ref = weakref.ref(self, release_mutex)
@@ -271,9 +421,12 @@ class _MutexHandle(object):
         # log.info("Released mutex: %s in pid: %s", self._mutex_name, os.getpid())
 
 
-def timed_acquire_mutex(mutex_name, timeout=20, sleep_time=0.15, check_reentrant=True):
+def timed_acquire_mutex(
+    mutex_name, timeout=20, sleep_time=0.15, check_reentrant=True, shared=False
+):
     """
-    Acquires the mutex given its name, a number of attempts and a time to sleep between each attempt.
+    Acquires the mutex given its name, waiting up to the given timeout for it
+    to be released.
 
     :throws RuntimeError if it was not possible to get the mutex in the given time.
 
@@ -287,25 +440,29 @@ def timed_acquire_mutex(mutex_name, timeout=20, sleep_time=0.15, check_reentrant
     :param check_reentrant:
         Should only be False if this mutex is expected to be released in
         a different thread.
-    """
-    finish_at = time.time() + timeout
-    while True:
-        last_attempt = time.time() >= finish_at
-        mutex = SystemMutex(
-            mutex_name, check_reentrant=check_reentrant, log_info=last_attempt
-        )
-        if not mutex.get_mutex_aquired():
-            if last_attempt:
-                log.info("Unable to obtain mutex: %s", mutex_name)
-                raise RuntimeError(
-                    "Could not get mutex: %s after: %s secs." % (mutex_name, timeout)
-                )
 
-            time.sleep(sleep_time)
+    :param shared:
+        If True, a shared lock is obtained (i.e.: for readers which may run in
+        parallel as long as no writer holds the exclusive lock). On Windows an
+        exclusive lock is always obtained.
 
-            mutex = None
-        else:
-            return _MutexHandle(mutex, mutex_name)
+    :param sleep_time:
+        Deprecated (kept for backward compatibility): the mutex release is
+        waited for without polling.
+    """
+    mutex = SystemMutex(
+        mutex_name,
+        check_reentrant=check_reentrant,
+        log_info=True,
+        shared=shared,
+        timeout=timeout,
+    )
+    if not mutex.get_mutex_aquired():
+        log.info("Unable to obtain mutex: %s", mutex_name)
+        raise RuntimeError(
+            "Could not get mutex: %s after: %s secs." % (mutex_name, timeout)
+        )
+    return _MutexHandle(mutex, mutex_name)
 
 
 def generate_mutex_name(target_name, prefix=""):
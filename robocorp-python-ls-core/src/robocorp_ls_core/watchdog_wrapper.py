@@ -123,7 +123,9 @@ class _Observer(object):
             self._started = True
             self._observer.start()
 
-    def notify_on_extensions_change(self, paths, extensions, on_change, call_args=()):
+    def notify_on_extensions_change(
+        self, paths, extensions, on_change, call_args=(), exclude_dirs=()
+    ):
         """
         To be used as:
         
@@ -148,31 +150,54 @@ class _Observer(object):
         :param list(PathInfo) paths:
         :param list(str) extensions:
             The file extensions that should be tracked.
+        :param list(str) exclude_dirs:
+            Names (or globs) of directories (inside the tracked paths) whose
+            changes should not be notified (i.e.: '.git', 'node_modules').
         """
         _import_watchdog()
 
         from watchdog.events import FileSystemEventHandler
+        from fnmatch import fnmatch
+
+        extensions = tuple(ext.lower() for ext in extensions)
+        exclude_dirs = tuple(exclude_dirs)
 
         class _Handler(FileSystemEventHandler):
-            def __init__(self, extensions):
+            def __init__(self, root):
                 FileSystemEventHandler.__init__(self)
-                extensions = [ext.lower() for ext in extensions]
-                self._extensions = extensions
+                self._root = os.path.join(os.path.abspath(root), "")
+
+            def _accept(self, path):
+                if not path.lower().endswith(extensions):
+                    return False
+
+                if exclude_dirs and path.startswith(self._root):
+                    relative = path[len(self._root) :]
+                    for part in relative.replace("\\", "/").split("/")[:-1]:
+                        for exclude in exclude_dirs:
+                            if fnmatch(part, exclude):
+                                return False
+                return True
 
             def on_any_event(self, event):
                 if event.is_directory:
                     return None
-                for ext in self._extensions:
-                    if event.src_path.lower().endswith(ext):
-                        on_change(event.src_path, *call_args)
-                        break
+                if self._accept(event.src_path):
+                    on_change(event.src_path, *call_args)
+
+                # i.e.: files saved by writing to a temporary file and then
+                # moving it must also be notified.
+                dest_path = getattr(event, "dest_path", None)
+                if dest_path and self._accept(dest_path):
+                    on_change(dest_path, *call_args)
 
-        handler = _Handler(extensions)
         watches = []
         for path_info in paths:
             watches.append(
                 self._observer.schedule(
-                    handler, path_info.path, recursive=path_info.recursive
+                    _Handler(path_info.path),
+                    path_info.path,
+                    recursive=path_info.recursive,
                 )
             )
 
@@ -216,6 +241,12 @@ class _Observer(object):
                 # Note: notify on directory and file changes.
                 on_change(event.src_path, *call_args)
 
+                # i.e.: files saved by writing to a temporary file and then
+                # moving it must also be notified.
+                dest_path = getattr(event, "dest_path", None)
+                if dest_path:
+                    on_change(dest_path, *call_args)
+
         handler = _Handler()
         watches = []
         for path_info in paths:
@@ -19,3 +19,16 @@ def test_isinstance_name():
 
         assert not isinstance_name(B(), "C")
         assert not isinstance_name(B(), ("C", "D"))
+
+
+def test_create_tmp_filename(tmpdir):
+    import os
+    from robocorp_ls_core.basic import create_tmp_filename
+
+    target = str(tmpdir.join("target.libspec"))
+    tmp_filenames = set(create_tmp_filename(target) for _i in range(10))
+    assert len(tmp_filenames) == 10
+    for tmp_filename in tmp_filenames:
+        assert os.path.dirname(tmp_filename) == str(tmpdir)
+        assert tmp_filename.endswith(".tmp")
+        assert os.path.exists(tmp_filename)
@@ -53,9 +53,11 @@ def test_system_mutex():
         mutex4.release_mutex()
 
     t = threading.Thread(target=release_mutex)
+    # Note: the time must be taken before the thread starts (its sleep starts
+    # right away and the mutex is acquired as soon as it's released).
+    initial_time = time.time()
     t.start()
 
-    initial_time = time.time()
     with timed_acquire_mutex(
         mutex_name, check_reentrant=False
     ):  # The current mutex will be released in a thread, so, check_reentrant=False.
@@ -119,3 +121,67 @@ time.sleep(30)
     wait_for_condition(acquire_mutex, timeout=5)
     
     
+
+
+def test_system_mutex_shared():
+    import sys
+    import pytest
+    import threading
+    import time
+    from robocorp_ls_core.system_mutex import SystemMutex
+    from robocorp_ls_core.system_mutex import timed_acquire_mutex
+    from robocorp_ls_core.basic import wait_for_condition
+
+    if sys.platform == "win32":
+        pytest.skip("Shared locks are not available on Windows.")
+
+    mutex_name = "mutex_name_test_system_mutex_shared"
+
+    reader1 = SystemMutex(mutex_name, shared=True)
+    assert reader1.get_mutex_aquired()
+
+    def check_in_thread(func):
+        result = []
+        t = threading.Thread(target=lambda: result.append(func()))
+        t.start()
+        t.join()
+        return result[0]
+
+    # Readers don't block each other but block writers.
+    assert check_in_thread(
+        lambda: SystemMutex(mutex_name, shared=True).get_mutex_aquired()
+    )
+    assert not check_in_thread(lambda: SystemMutex(mutex_name).get_mutex_aquired())
+
+    # A writer waits for the readers to release the lock (without polling).
+    time_to_release_mutex = 0.5
+
+    def release_reader():
+        time.sleep(time_to_release_mutex)
+        reader1.release_mutex()
+
+    t = threading.Thread(target=release_reader)
+    initial_time = time.time()
+    t.start()
+
+    with timed_acquire_mutex(mutex_name, timeout=5):
+        assert time.time() - initial_time >= time_to_release_mutex
+
+        # Readers are blocked while the writer holds the lock.
+        assert not check_in_thread(
+            lambda: SystemMutex(mutex_name, shared=True).get_mutex_aquired()
+        )
+
+        def acquire_with_timeout():
+            try:
+                with timed_acquire_mutex(mutex_name, timeout=0.2, shared=True):
+                    return True
+            except RuntimeError:
+                return False
+
+        assert not check_in_thread(acquire_with_timeout)
+    t.join()
+
+    # After a timeout the lock (obtained later in the background) must not be
+    # kept.
+    wait_for_condition(lambda: SystemMutex(mutex_name).get_mutex_aquired())
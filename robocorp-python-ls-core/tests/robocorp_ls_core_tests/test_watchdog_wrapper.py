@@ -195,6 +195,52 @@ def test_watchdog_extensions(tmpdir):
         observer.dispose()
 
 
+def test_watchdog_extensions_exclude_dirs(tmpdir):
+    import os.path
+    from robocorp_ls_core import watchdog_wrapper
+    from robocorp_ls_core.watchdog_wrapper import PathInfo
+    from robocorp_ls_core.unittest_tools.fixtures import wait_for_test_condition
+
+    tmpdir.join("dir_rec").mkdir()
+    tmpdir.join("dir_rec").join(".git").mkdir()
+    tmpdir.join("dir_rec").join("out").mkdir()
+
+    found = []
+
+    def on_change(filepath, *args):
+        found.append(filepath)
+
+    notifier = watchdog_wrapper.create_notifier(on_change, timeout=0.1)
+    observer = watchdog_wrapper.create_observer()
+
+    watch = observer.notify_on_extensions_change(
+        [PathInfo(tmpdir.join("dir_rec"), True)],
+        ["libspec"],
+        notifier.on_change,
+        exclude_dirs=[".git", "o*"],
+    )
+
+    try:
+        tmpdir.join("dir_rec").join(".git").join("my1.libspec").write("foo")
+        tmpdir.join("dir_rec").join("out").join("my2.libspec").write("foo")
+        tmpdir.join("dir_rec").join("my3.libspec").write("foo")
+
+        wait_for_test_condition(
+            lambda: any(filepath.endswith("my3.libspec") for filepath in found),
+            msg=lambda: "Expected to find my3.libspec. Found:\n%s"
+            % ("\n".join(found),),
+        )
+
+        # Give time to check if some other change arrives.
+        time.sleep(0.5)
+        assert [os.path.basename(filepath) for filepath in found] == ["my3.libspec"]
+        watch.stop_tracking()
+
+    finally:
+        notifier.dispose()
+        observer.dispose()
+
+
 def test_watchdog_only_recursive(tmpdir):
     from robocorp_ls_core import watchdog_wrapper
 
@@ -160,6 +160,111 @@ class Dev(object):
         with open(readme, "w") as f:
             f.write(new_content)
 
+    def create_builtin_libspecs_archive(self):
+        """
+        Creates the archive with the prebuilt .libspec files of the builtin
+        libraries for the currently installed robot version.
+        """
+        import tempfile
+        from robotframework_ls.impl import prebuilt_libspecs
+        from robotframework_ls.impl.libspec_manager import LibspecManager
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            builtins_libspec_dir = os.path.join(tmpdir, "builtins")
+            libspec_manager = LibspecManager(
+                builtin_libspec_dir=builtins_libspec_dir,
+                user_libspec_dir=os.path.join(tmpdir, "user"),
+            )
+            try:
+                libnames = sorted(
+                    os.path.splitext(f)[0]
+                    for f in os.listdir(builtins_libspec_dir)
+                    if f.endswith(".libspec")
+                )
+                archive_filename = prebuilt_libspecs.create_prebuilt_archive(
+                    builtins_libspec_dir, LibspecManager.get_robot_version(), libnames
+                )
+            finally:
+                libspec_manager.dispose()
+        print("Created: %s" % (archive_filename,))
+
+    def benchmark_libspec_memory(self, *libraries):
+        """
+        Reports the memory used by the spec model (LibraryDoc, KeywordDoc,
+        KeywordArg) loaded for the builtin libraries and the given libraries
+        (library names to be generated or .libspec files).
+
+        i.e.:
+
+            python -m dev benchmark-libspec-memory SeleniumLibrary my.libspec
+        """
+        import gc
+        import tempfile
+        import tracemalloc
+        from robotframework_ls.impl.libspec_manager import LibspecManager
+        from robotframework_ls.impl.robot_specbuilder import SpecDocBuilder
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            builtins_libspec_dir = os.path.join(tmpdir, "builtins")
+            libspec_manager = LibspecManager(
+                builtin_libspec_dir=builtins_libspec_dir,
+                user_libspec_dir=os.path.join(tmpdir, "user"),
+            )
+            try:
+                spec_filenames = sorted(
+                    os.path.join(builtins_libspec_dir, f)
+                    for f in os.listdir(builtins_libspec_dir)
+                    if f.endswith(".libspec")
+                )
+                for library in libraries:
+                    if library.endswith(".libspec"):
+                        spec_filenames.append(os.path.abspath(library))
+                        continue
+                    library_doc = libspec_manager.get_library_info(library)
+                    if library_doc is None:
+                        print("Unable to generate libspec for: %s" % (library,))
+                        continue
+                    spec_filenames.append(library_doc.filename)
+
+                loaded = []
+                gc.collect()
+                tracemalloc.start()
+                total_size = 0
+                total_keywords = 0
+                for spec_filename in spec_filenames:
+                    initial_size, _peak = tracemalloc.get_traced_memory()
+                    library_doc = SpecDocBuilder().build(spec_filename)
+                    keywords = library_doc.inits + library_doc.keywords
+                    for keyword in keywords:
+                        # Arguments are lazily created.
+                        keyword.args
+                    loaded.append(library_doc)
+                    gc.collect()
+                    size = tracemalloc.get_traced_memory()[0] - initial_size
+                    total_size += size
+                    total_keywords += len(keywords)
+                    print(
+                        "%-30s %5s keywords %10s bytes %8.1f bytes/keyword"
+                        % (
+                            library_doc.name,
+                            len(keywords),
+                            size,
+                            size / max(1, len(keywords)),
+                        )
+                    )
+                tracemalloc.stop()
+                print(
+                    "%-30s %5s keywords %10s bytes %8.1f bytes/keyword"
+                    % (
+                        "Total",
+                        total_keywords,
+                        total_size,
+                        total_size / max(1, total_keywords),
+                    )
+                )
+            finally:
+                libspec_manager.dispose()
+
 
 def test_lines():
     """
@@ -1,5 +1,5 @@
 import sys
-from typing import Iterator, Optional, List
+from typing import Iterator, Optional, List, Dict
 
 import ast as ast_module
 from robocorp_ls_core.lsp import Error
@@ -146,21 +146,47 @@ def print_ast(node, stream=None):
     errors_visitor.visit(node)
 
 
+# Attributes used to cache information in the AST nodes (note: the nodes of an
+# AST are never changed after it's created, so, the cache is valid for the
+# lifetime of the node; copies of a node must not keep those).
+SECTIONS_LINES_CACHE_ATTR = "_sections_lines_cache"
+LINE_INDEX_CACHE_ATTR = "_line_index_cache"
+CACHE_ATTRS = (SECTIONS_LINES_CACHE_ATTR, LINE_INDEX_CACHE_ATTR)
+
+
 def find_section(node, line: int):
     """
     :param line:
         0-based
     """
-    last_section = None
-    for section in node.sections:
-        # section.lineno is 1-based.
-        if (section.lineno - 1) <= line:
-            last_section = section
+    from bisect import bisect_right
 
+    sections = node.sections
+    sections_lines = getattr(node, SECTIONS_LINES_CACHE_ATTR, None)
+    if sections_lines is None:
+        # section.lineno is 1-based.
+        sections_lines = tuple(section.lineno - 1 for section in sections)
+        if all(
+            sections_lines[i] <= sections_lines[i + 1]
+            for i in range(len(sections_lines) - 1)
+        ):
+            setattr(node, SECTIONS_LINES_CACHE_ATTR, sections_lines)
         else:
+            # Not sorted (shouldn't really happen): use the linear search.
+            last_section = None
+            for section in sections:
+                if (section.lineno - 1) <= line:
+                    last_section = section
+
+                else:
+                    return last_section
+
             return last_section
 
-    return last_section
+    i = bisect_right(sections_lines, line)
+    if i == 0:
+        return None
+    return sections[i - 1]
 
 
 def _iter_nodes(node, stack=None, recursive=True):
@@ -192,26 +218,93 @@ def _iter_nodes(node, stack=None, recursive=True):
                 stack.pop()
 
 
-def find_token(ast, line, col) -> Optional[TokenInfo]:
-    for stack, node in _iter_nodes(ast):
-        try:
-            tokens = node.tokens
-        except AttributeError:
-            continue
-        for token in tokens:
-            lineno = token.lineno - 1
-            if lineno != line:
+class _LineTokens(object):
+    """
+    The tokens in a given line (in the order in which they're found in the
+    AST).
+    """
+
+    __slots__ = ["entries", "starts", "ends", "sorted"]
+
+    def __init__(self):
+        # tuple(token, stack, node)
+        self.entries: list = []
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+
+        # Whether the tokens are sorted by column and don't overlap (in which
+        # case it's possible to bisect on the columns).
+        self.sorted = True
+
+    def add(self, token, stack, node):
+        start = token.col_offset
+        end = token.end_col_offset
+        if self.entries and (start < self.starts[-1] or end < self.ends[-1]):
+            self.sorted = False
+        self.entries.append((token, stack, node))
+        self.starts.append(start)
+        self.ends.append(end)
+
+
+def _token_contains_col(token, col) -> bool:
+    if token.type == token.SEPARATOR:
+        # For separator tokens, it must be entirely within the section
+        # i.e.: if it's in the boundary for a word, we want the word,
+        # not the separator.
+        return token.col_offset < col < token.end_col_offset
+    else:
+        return token.col_offset <= col <= token.end_col_offset
+
+
+def _get_line_index(ast) -> Dict[int, _LineTokens]:
+    """
+    :return:
+        A dict with the 0-based line -> tokens in that line (computed once for
+        a given node and then cached in it).
+    """
+    line_index = getattr(ast, LINE_INDEX_CACHE_ATTR, None)
+    if line_index is None:
+        line_index = {}
+        for stack, node in _iter_nodes(ast):
+            try:
+                tokens = node.tokens
+            except AttributeError:
                 continue
+            stack_tuple = tuple(stack)
+            for token in tokens:
+                lineno = token.lineno - 1
+                line_tokens = line_index.get(lineno)
+                if line_tokens is None:
+                    line_tokens = line_index[lineno] = _LineTokens()
+                line_tokens.add(token, stack_tuple, node)
 
-            if token.type == token.SEPARATOR:
-                # For separator tokens, it must be entirely within the section
-                # i.e.: if it's in the boundary for a word, we want the word,
-                # not the separator.
-                if token.col_offset < col < token.end_col_offset:
-                    return TokenInfo(tuple(stack), node, token)
-            else:
-                if token.col_offset <= col <= token.end_col_offset:
-                    return TokenInfo(tuple(stack), node, token)
+        # Note: no lock needed (at worst it's computed more than once).
+        setattr(ast, LINE_INDEX_CACHE_ATTR, line_index)
+    return line_index
+
+
+def find_token(ast, line, col) -> Optional[TokenInfo]:
+    from bisect import bisect_left
+
+    line_tokens = _get_line_index(ast).get(line)
+    if line_tokens is None:
+        return None
+
+    entries = line_tokens.entries
+    if line_tokens.sorted:
+        # The first token which may contain the column is the first one which
+        # ends at or after it.
+        i = bisect_left(line_tokens.ends, col)
+        starts = line_tokens.starts
+        while i < len(entries) and starts[i] <= col:
+            token, stack, node = entries[i]
+            if _token_contains_col(token, col):
+                return TokenInfo(stack, node, token)
+            i += 1
+    else:
+        for token, stack, node in entries:
+            if _token_contains_col(token, col):
+                return TokenInfo(stack, node, token)
 
     return None
 
@@ -317,6 +410,16 @@ def iter_keywords(ast) -> Iterator[NodeInfo]:
         yield NodeInfo(tuple(stack), node)
 
 
+def iter_keywords_and_imports(ast) -> Iterator[NodeInfo]:
+    """
+    Provides the keywords and the library/resource imports in a single pass.
+    """
+    for stack, node in _iter_nodes_filtered(
+        ast, accept_class=("Keyword", "LibraryImport", "ResourceImport")
+    ):
+        yield NodeInfo(tuple(stack), node)
+
+
 def iter_variables(ast) -> Iterator[NodeInfo]:
     for stack, node in _iter_nodes_filtered(ast, accept_class="Variable"):
         yield NodeInfo(tuple(stack), node)
@@ -22,9 +22,7 @@ class _KeywordContainer(object):
         self._multiple_keywords = {}
 
     def add_keyword(self, keyword_found):
-        from robotframework_ls.impl.text_utilities import normalize_robot_name
-
-        normalized_name = normalize_robot_name(keyword_found.keyword_name)
+        normalized_name = keyword_found.normalized_keyword_name
         if normalized_name in self._name_to_keyword:
             if (self._name_to_keyword[normalized_name].library_name == keyword_found.library_name or self._name_to_keyword[normalized_name].resource_name == keyword_found.resource_name) \
                     and self._name_to_keyword[normalized_name].library_alias == keyword_found.library_alias:
@@ -67,7 +65,7 @@ class _KeywordsCollector(IKeywordCollector):
         self._resource_name_to_keywords_container = {}
         self._library_name_to_keywords_container = {}
 
-    def accepts(self, keyword_name):
+    def accepts(self, keyword_name, normalized_keyword_name):
         return True
 
     def on_keyword(self, keyword_found):
@@ -1,4 +1,3 @@
-from collections import namedtuple
 import os.path
 
 from robocorp_ls_core.cache import instance_cache
@@ -10,7 +9,8 @@ from robotframework_ls.impl.protocols import (
     IKeywordCollector,
 )
 from robotframework_ls.impl.robot_specbuilder import KeywordArg
-from typing import Tuple, Sequence
+from robotframework_ls.impl.text_utilities import normalize_robot_name
+from typing import Optional, Tuple, Sequence
 
 
 log = get_logger(__name__)
@@ -22,7 +22,6 @@ class _KeywordFoundFromAst(object):
         "_module_ast",
         "_keyword_node",
         "_keyword_name",
-        "_keyword_args",
         "completion_context",
         "completion_item_kind",
         "__instance_cache__",
@@ -33,7 +32,6 @@ class _KeywordFoundFromAst(object):
         module_ast,
         keyword_node,
         keyword_name,
-        keyword_args: Sequence[KeywordArg],
         completion_context,
         completion_item_kind,
     ):
@@ -41,7 +39,6 @@ class _KeywordFoundFromAst(object):
         self._keyword_node = keyword_node
 
         self._keyword_name = keyword_name
-        self._keyword_args = keyword_args
         self.completion_context = completion_context
         self.completion_item_kind = completion_item_kind
 
@@ -50,8 +47,19 @@ class _KeywordFoundFromAst(object):
         return self._keyword_name
 
     @property
+    @instance_cache
+    def normalized_keyword_name(self):
+        return normalize_robot_name(self._keyword_name)
+
+    @property
+    @instance_cache
     def keyword_args(self) -> Sequence[KeywordArg]:
-        return self._keyword_args
+        from robotframework_ls.impl import ast_utils
+
+        return tuple(
+            KeywordArg(arg)
+            for arg in ast_utils.iter_keyword_arguments_as_str(self._keyword_node)
+        )
 
     @property
     def library_alias(self):
@@ -108,34 +116,82 @@ class _KeywordFoundFromAst(object):
         _: IKeywordFound = check_implements(self)
 
 
+class _LibraryKeywordEntry(object):
+    """
+    The information on a library keyword which doesn't depend on the
+    completion context (created once for each keyword of a LibraryDoc and
+    shared by all the requests which collect keywords from it).
+    """
+
+    __slots__ = [
+        "keyword_doc",
+        "keyword_name",
+        "normalized_keyword_name",
+        "keyword_args",
+        "_docs_and_format",
+    ]
+
+    def __init__(self, keyword_doc):
+        self.keyword_doc = keyword_doc
+        self.keyword_name = keyword_doc.name
+        self.normalized_keyword_name = keyword_doc.normalized_name
+        self.keyword_args: Sequence[KeywordArg] = keyword_doc.args or ()
+        self._docs_and_format: Optional[Tuple[str, str]] = None
+
+    def get_docs_and_format(self) -> Tuple[str, str]:
+        docs_and_format = self._docs_and_format
+        if docs_and_format is None:
+            from robotframework_ls.impl import robot_specbuilder
+
+            docs, docs_format = robot_specbuilder.docs_and_format(self.keyword_doc)
+            if self.keyword_args:
+                args = [x.original_arg for x in self.keyword_args]
+                docs = "%s(%s)\n\n%s" % (self.keyword_name, ", ".join(args), docs)
+
+            # Note: no lock needed (at worst it's computed more than once).
+            docs_and_format = self._docs_and_format = (docs, docs_format)
+        return docs_and_format
+
+
+def get_library_keyword_entries(library_doc) -> Tuple[_LibraryKeywordEntry, ...]:
+    """
+    :return:
+        The entries for the keywords of the given LibraryDoc (created on the
+        first request and then cached in the LibraryDoc).
+    """
+    entries = library_doc.keyword_entries_cache
+    if entries is None:
+        entries = library_doc.keyword_entries_cache = tuple(
+            _LibraryKeywordEntry(keyword_doc) for keyword_doc in library_doc.keywords
+        )
+    return entries
+
+
 class _KeywordFoundFromLibrary(object):
+    """
+    Binds a (shared) library keyword entry to the completion context and
+    alias of the request.
+    """
 
     __slots__ = [
         "_library_doc",
         "_library_alias",
-        "_keyword_doc",
-        "_keyword_name",
-        "_keyword_args",
+        "_entry",
         "completion_context",
         "completion_item_kind",
-        "__instance_cache__",
     ]
 
     def __init__(
         self,
         library_doc,
-        keyword_doc,
-        keyword_name,
-        keyword_args: Sequence[KeywordArg],
+        entry: _LibraryKeywordEntry,
         completion_context,
         completion_item_kind,
         library_alias=None,
     ):
 
         self._library_doc = library_doc
-        self._keyword_doc = keyword_doc
-        self._keyword_name = keyword_name
-        self._keyword_args = keyword_args
+        self._entry = entry
 
         self.completion_context = completion_context
         self.completion_item_kind = completion_item_kind
@@ -143,11 +199,15 @@ class _KeywordFoundFromLibrary(object):
 
     @property
     def keyword_name(self):
-        return self._keyword_name
+        return self._entry.keyword_name
+
+    @property
+    def normalized_keyword_name(self):
+        return self._entry.normalized_keyword_name
 
     @property
     def keyword_args(self) -> Sequence[KeywordArg]:
-        return self._keyword_args
+        return self._entry.keyword_args
 
     @property
     def library_alias(self):
@@ -162,15 +222,12 @@ class _KeywordFoundFromLibrary(object):
         return None
 
     @property
-    @instance_cache
     def source(self):
-        source = self._keyword_doc.source or self._library_doc.source
-        return source
+        return self._entry.keyword_doc.source or self._library_doc.source
 
     @property
-    @instance_cache
     def lineno(self):
-        return self._keyword_doc.lineno - 1  # i.e.: make 0-based.
+        return self._entry.keyword_doc.lineno - 1  # i.e.: make 0-based.
 
     @property
     def end_lineno(self):
@@ -185,110 +242,74 @@ class _KeywordFoundFromLibrary(object):
         return 0
 
     @property
-    @instance_cache
-    def _docs_and_format(self) -> Tuple[str, str]:
-        from robotframework_ls.impl.robot_specbuilder import docs_and_format
-
-        docs, docs_format = docs_and_format(self._keyword_doc)
-        if self.keyword_args:
-            args = [x.original_arg for x in self.keyword_args]
-            docs = "%s(%s)\n\n%s" % (self.keyword_name, ", ".join(args), docs)
-
-        return docs, docs_format
-
-    @property
-    @instance_cache
     def docs(self):
-        docs, _docs_format = self._docs_and_format
+        docs, _docs_format = self._entry.get_docs_and_format()
         return docs
 
     @property
-    @instance_cache
     def docs_format(self):
-        _docs, docs_format = self._docs_and_format
+        _docs, docs_format = self._entry.get_docs_and_format()
         return docs_format
 
     def __typecheckself__(self) -> None:
         _: IKeywordFound = check_implements(self)
 
 
-def _collect_completions_from_ast(
-    ast, completion_context: ICompletionContext, collector
+def _collect_current_doc_keywords(
+    completion_context: ICompletionContext, doc_symbols, collector
 ):
-    from robotframework_ls.impl import ast_utils
+    """
+    :param DocumentSymbols doc_symbols:
+        The symbols of the document of the completion context.
+    """
     from robocorp_ls_core.lsp import CompletionItemKind
 
-    for keyword in ast_utils.iter_keywords(ast):
-        completion_context.check_cancelled()
-        keyword_name = keyword.node.name
-        if collector.accepts(keyword_name):
-            keyword_args = []
-            for arg in ast_utils.iter_keyword_arguments_as_str(keyword.node):
-                keyword_args.append(KeywordArg(arg))
-
+    ast = doc_symbols.ast
+    for entry in doc_symbols.keywords:
+        keyword_name = entry.keyword_name
+        if collector.accepts(keyword_name, entry.normalized_keyword_name):
             collector.on_keyword(
                 _KeywordFoundFromAst(
                     ast,
-                    keyword.node,
+                    entry.keyword_node,
                     keyword_name,
-                    keyword_args,
                     completion_context,
                     CompletionItemKind.Function,
                 )
             )
 
 
-def _collect_current_doc_keywords(completion_context: ICompletionContext, collector):
-    """
-    :param CompletionContext completion_context:
-    """
-    # Get keywords defined in the file itself
-
-    ast = completion_context.get_ast()
-    _collect_completions_from_ast(ast, completion_context, collector)
-
-
-_LibInfo = namedtuple("_LibInfo", "name, alias, args")
-
-
-def _collect_libraries_keywords(completion_context: ICompletionContext, collector):
+def _collect_libraries_keywords(
+    completion_context: ICompletionContext, doc_symbols, collector
+):
     """
-    :param CompletionContext completion_context:
+    :param DocumentSymbols doc_symbols:
+        The symbols of the document of the completion context.
     """
     # Get keywords from libraries
-    from robotframework_ls.impl.robot_constants import BUILTIN_LIB
     from robocorp_ls_core.lsp import CompletionItemKind
 
-    libraries = completion_context.get_imported_libraries()
-    library_infos = set(_LibInfo(library.name, library.alias, library.args) for library in libraries)
-    library_infos.add(_LibInfo(BUILTIN_LIB, None, ()))
     libspec_manager = completion_context.workspace.libspec_manager
 
-    for library_info in library_infos:        
+    for library_info in doc_symbols.library_imports:
         completion_context.check_cancelled()
         if not completion_context.memo.complete_for_library(library_info.name, library_info.alias, library_info.args):
             continue
-        
+
         library_doc = libspec_manager.get_library_info(
             library_info.name, create=True, current_doc_uri=completion_context.doc.uri,
             arguments=library_info.args, alias=library_info.alias
         )
         if library_doc is not None:
-            #: :type keyword: KeywordDoc
-            for keyword in library_doc.keywords:
-                keyword_name = keyword.name
-                if collector.accepts(keyword_name):
-
-                    keyword_args = []
-                    if keyword.args:
-                        keyword_args = keyword.args
-
+            for entry in get_library_keyword_entries(library_doc):
+                if collector.accepts(
+                    entry.keyword_name, entry.normalized_keyword_name
+                ):
+                    # Only bound to the context when actually accepted.
                     collector.on_keyword(
                         _KeywordFoundFromLibrary(
                             library_doc,
-                            keyword,
-                            keyword_name,
-                            keyword_args,
+                            entry,
                             completion_context,
                             CompletionItemKind.Method,
                             library_alias=library_info.alias,
@@ -296,31 +317,37 @@ def _collect_libraries_keywords(completion_context: ICompletionContext, collecto
                     )
 
 
-def _collect_resource_imports_keywords(completion_context: ICompletionContext, collector):
-    """
-    :param CompletionContext completion_context:
-    """
-    for resource_doc in completion_context.get_resource_imports_as_docs():
-        new_ctx = completion_context.create_copy(resource_doc)
-        _collect_following_imports(new_ctx, collector)
-
-
-def _collect_following_imports(completion_context: ICompletionContext, collector):
-    completion_context.check_cancelled()
-    if completion_context.memo.follow_import(completion_context.doc.uri):
-        # i.e.: prevent collecting keywords for the same doc more than once.
-
-        _collect_current_doc_keywords(completion_context, collector)
-
-        _collect_resource_imports_keywords(completion_context, collector)
-
-        _collect_libraries_keywords(completion_context, collector)
-
-
 def collect_keywords(
     completion_context: ICompletionContext, collector: IKeywordCollector
 ):
     """
     Collects all the keywords that are available to the given completion_context.
+
+    The documents reachable through resource imports are obtained from the
+    workspace symbol table (see: `keyword_symbol_table`).
     """
-    _collect_following_imports(completion_context, collector)
+    from robotframework_ls.impl.keyword_symbol_table import get_visible_keywords
+
+    visible_keywords = get_visible_keywords(completion_context)
+
+    doc_contexts = {}
+    followed = set()
+    for doc_symbols, collect_libraries in visible_keywords.steps:
+        completion_context.check_cancelled()
+        doc = doc_symbols.doc
+        if not collect_libraries:
+            if not completion_context.memo.follow_import(doc.uri):
+                # i.e.: prevent collecting keywords for the same doc more than once.
+                continue
+            followed.add(doc.uri)
+            if doc is completion_context.doc:
+                doc_context = completion_context
+            else:
+                doc_context = completion_context.create_copy(doc)
+            doc_contexts[doc.uri] = doc_context
+            _collect_current_doc_keywords(doc_context, doc_symbols, collector)
+
+        elif doc.uri in followed:
+            _collect_libraries_keywords(
+                doc_contexts[doc.uri], doc_symbols, collector
+            )
@@ -425,8 +425,16 @@ class CompletionContext(ICompletionContext):
             while token_info.token.type == token_info.token.EOL:
                 sel = cp.sel
                 if sel.col > 0:
-                    cp = cp.create_copy_with_selection(sel.line, sel.col - 1)
-                    token_info = cp.get_current_token()
+                    # Go directly to the start of the EOL (the columns inside
+                    # it would just provide the same EOL token).
+                    col = token_info.token.col_offset
+                    if col >= sel.col:
+                        col = sel.col - 1
+                    cp = cp.create_copy_with_selection(sel.line, col)
+                    new_token_info = cp.get_current_token()
+                    if new_token_info is None:
+                        break
+                    token_info = new_token_info
                 else:
                     break
 
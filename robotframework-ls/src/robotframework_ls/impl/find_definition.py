@@ -109,7 +109,7 @@ class _DefinitionFromVariable(object):
 
 
 class IDefinitionsCollector(object):
-    def accepts(self, keyword_name):
+    def accepts(self, keyword_name, normalized_keyword_name):
         pass
 
     def on_keyword(self, keyword_found):
@@ -130,14 +130,14 @@ class _FindDefinitionKeywordCollector(IDefinitionsCollector):
         self._scope_matchers = build_matchers_with_resource_or_library_scope(
             match_name)
 
-    def accepts(self, keyword_name):
+    def accepts(self, keyword_name, normalized_keyword_name):
         return True
 
     def on_keyword(self, keyword_found):
         if any(x.keyword_name == keyword_found.keyword_name for x in self.matches):
             return
 
-        if self._matcher.is_keyword_name_match(keyword_found.keyword_name):
+        if self._matcher.is_normalized_keyword_name_match(keyword_found.normalized_keyword_name):
             definition = _DefinitionFromKeyword(keyword_found)
             self.matches.append(definition)
             return
@@ -125,3 +125,34 @@ def run_doc(library_name: str, output_filename: str, additional_path: str, addit
         return None, msg, warning
     finally:
         sys.path = old_path
+
+
+def run_docs(
+    libraries: List[Tuple[str, str]],
+    additional_pythonpath_entries: List[str],
+    variables: Dict[str, str],
+    strip_traceback=True,
+) -> List[Tuple[str, Optional[str], Optional[str]]]:
+    """
+    Generates the libspec for multiple libraries in a single call (so that
+    robot is imported only once).
+
+    :param libraries:
+        A list with (library_name, output_filename).
+
+    :return:
+        A list with (library_name, error, warning) for each library.
+    """
+    ret = []
+    for library_name, output_filename in libraries:
+        # Note: the LibraryDoc isn't returned to avoid pickling it.
+        _libdoc, error, warning = run_doc(
+            library_name,
+            output_filename,
+            None,
+            additional_pythonpath_entries,
+            variables,
+            strip_traceback,
+        )
+        ret.append((library_name, error, warning))
+    return ret
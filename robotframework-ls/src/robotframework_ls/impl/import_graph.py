@@ -0,0 +1,130 @@
+"""
+A directed graph with the imports of the documents (resource and library
+edges) kept by the server api.
+
+It's updated whenever the imports of a document are resolved (see:
+`keyword_symbol_table`) and is kept as the documents change (i.e.: it's not
+recomputed for each request), so, it can be used to know which documents may
+be affected by a change in a resource (its dependents).
+
+Along with the edges, the signature of the keywords provided by each document
+is kept so that it's possible to know whether a change in a document actually
+changed its keywords (in which case its dependents should be linted again).
+"""
+import threading
+from typing import Dict, Iterator, List, Set, Tuple, Any
+
+from robocorp_ls_core.robotframework_log import get_logger
+
+
+log = get_logger(__name__)
+
+
+class ImportGraph(object):
+    """
+    Note: thread-safe.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+        # uri -> resource uris imported by it.
+        self._uri_to_resource_uris: Dict[str, Tuple[str, ...]] = {}
+
+        # uri -> library names imported by it.
+        self._uri_to_library_names: Dict[str, Tuple[str, ...]] = {}
+
+        # resource uri -> uris which import it (the reverse edges).
+        self._resource_uri_to_importers: Dict[str, Set[str]] = {}
+
+        # uri -> signature of the keywords provided by the document.
+        self._uri_to_keywords_signature: Dict[str, Any] = {}
+
+    def set_imports(
+        self,
+        uri: str,
+        resource_uris: Tuple[str, ...],
+        library_names: Tuple[str, ...],
+        keywords_signature: Any,
+    ) -> None:
+        """
+        Sets the imports of the given uri (replacing any previous edges).
+
+        :param keywords_signature:
+            The signature of the keywords of the document. Only used if
+            there's still no signature for the uri (afterwards it's only
+            updated through `update_keywords_signature`).
+        """
+        with self._lock:
+            old_resource_uris = self._uri_to_resource_uris.get(uri, ())
+            for resource_uri in old_resource_uris:
+                importers = self._resource_uri_to_importers.get(resource_uri)
+                if importers is not None:
+                    importers.discard(uri)
+                    if not importers:
+                        del self._resource_uri_to_importers[resource_uri]
+
+            self._uri_to_resource_uris[uri] = resource_uris
+            self._uri_to_library_names[uri] = library_names
+            for resource_uri in resource_uris:
+                self._resource_uri_to_importers.setdefault(resource_uri, set()).add(
+                    uri
+                )
+            self._uri_to_keywords_signature.setdefault(uri, keywords_signature)
+
+    def get_resource_imports(self, uri: str) -> Tuple[str, ...]:
+        with self._lock:
+            return self._uri_to_resource_uris.get(uri, ())
+
+    def get_library_imports(self, uri: str) -> Tuple[str, ...]:
+        with self._lock:
+            return self._uri_to_library_names.get(uri, ())
+
+    def get_importers(self, uri: str) -> Set[str]:
+        """
+        :return:
+            The uris which import the given uri directly.
+        """
+        with self._lock:
+            return set(self._resource_uri_to_importers.get(uri, ()))
+
+    def iter_dependents(self, uri: str) -> Iterator[str]:
+        """
+        Provides the uris which import the given uri (directly or indirectly),
+        the nearest ones first.
+        """
+        with self._lock:
+            resource_uri_to_importers = dict(
+                (key, tuple(value))
+                for key, value in self._resource_uri_to_importers.items()
+            )
+
+        visited = set([uri])
+        level: List[str] = [uri]
+        while level:
+            next_level = []
+            for resource_uri in level:
+                for importer in sorted(resource_uri_to_importers.get(resource_uri, ())):
+                    if importer not in visited:
+                        visited.add(importer)
+                        next_level.append(importer)
+                        yield importer
+            level = next_level
+
+    def update_keywords_signature(self, uri: str, keywords_signature: Any) -> bool:
+        """
+        :return:
+            True if there was a previous signature and it's different from the
+            given one.
+        """
+        with self._lock:
+            old = self._uri_to_keywords_signature.get(uri)
+            self._uri_to_keywords_signature[uri] = keywords_signature
+            return old is not None and old != keywords_signature
+
+    def clear(self) -> None:
+        with self._lock:
+            self._uri_to_resource_uris = {}
+            self._uri_to_library_names = {}
+            self._resource_uri_to_importers = {}
+            self._uri_to_keywords_signature = {}
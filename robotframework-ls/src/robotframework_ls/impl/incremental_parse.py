@@ -0,0 +1,304 @@
+"""
+Helpers to create the AST of a document from the AST of its previous version
+and the change applied to it (instead of parsing the whole source again).
+
+The unit re-parsed is the test case/keyword which contains the change (or the
+whole section if the change isn't inside a test case/keyword). The new unit
+is spliced into the previous model: the nodes before it are reused and the
+nodes after it are reused as is if the number of lines didn't change or are
+cloned with the line numbers adjusted otherwise (the previous model is never
+changed as it may still be in use by other threads).
+
+If the boundaries of the unit would change (i.e.: a new test case/keyword or
+section is created or the name of the unit is removed) or if the lexing
+depends on other parts of the file (i.e.: when a `Test Template` is used) a
+full parse must be done (in which case None is returned).
+"""
+import ast as ast_module
+from typing import Callable, List, Optional, Sequence
+
+from robocorp_ls_core.robotframework_log import get_logger
+
+
+log = get_logger(__name__)
+
+_BLOCK_SECTIONS = ("TestCaseSection", "KeywordSection")
+_BLOCKS = ("TestCase", "Keyword")
+
+
+def _contains(node, start_line: int, end_line: int, is_last: bool) -> bool:
+    """
+    :param start_line:
+        0-based start line of the change.
+    :param end_line:
+        0-based end line of the change.
+    :param is_last:
+        Whether the node is the last one in the file (in which case it also
+        contains the lines after it).
+    """
+    lineno = node.lineno
+    if lineno < 1:
+        return False
+    if start_line < lineno - 1:
+        return False
+    if is_last:
+        return True
+    return end_line <= node.end_lineno - 1
+
+
+def _has_template(section) -> bool:
+    from robot.api import Token
+
+    for node in section.body:
+        if getattr(node, "type", None) == Token.TEST_TEMPLATE:
+            return True
+    return False
+
+
+def _file_has_template(model) -> bool:
+    for section in model.sections:
+        if section.__class__.__name__ == "SettingSection" and _has_template(section):
+            return True
+    return False
+
+
+def _has_header_like_line(lines: Sequence[str]) -> bool:
+    for line in lines:
+        if line.startswith("*"):
+            return True
+    return False
+
+
+def _shift_in_place(node, delta: int) -> None:
+    from robot.parsing.model.statements import Statement
+
+    for child in ast_module.walk(node):
+        if isinstance(child, Statement):
+            for token in child.tokens:
+                token.lineno += delta
+
+
+def _copy_node(node):
+    # Note: copy.copy() can't be used because the AST nodes are reconstructed
+    # with the fields as positional arguments (which fails for the statements
+    # in some Python versions).
+    from robotframework_ls.impl.ast_utils import CACHE_ATTRS
+
+    new_node = node.__class__.__new__(node.__class__)
+    new_node.__dict__.update(node.__dict__)
+    for attr in CACHE_ATTRS:
+        # The caches are computed again for the copy if needed.
+        new_node.__dict__.pop(attr, None)
+    return new_node
+
+
+def clone_with_line_delta(node, delta: int):
+    """
+    :return:
+        A copy of the given node where the line of each token is changed by
+        the given delta (the tokens are also copied).
+    """
+    from robot.api import Token
+    from robot.parsing.model.statements import Statement
+
+    new_node = _copy_node(node)
+    if isinstance(node, Statement):
+        new_tokens = []
+        for token in node.tokens:
+            new_tokens.append(
+                Token(
+                    token.type,
+                    token.value,
+                    token.lineno + delta,
+                    token.col_offset,
+                    token.error,
+                )
+            )
+        new_node.tokens = tuple(new_tokens)
+        return new_node
+
+    for field in node._fields:
+        value = getattr(node, field, None)
+        if isinstance(value, list):
+            setattr(
+                new_node, field, [clone_with_line_delta(v, delta) for v in value]
+            )
+        elif isinstance(value, ast_module.AST):
+            setattr(new_node, field, clone_with_line_delta(value, delta))
+    return new_node
+
+
+def _reuse(nodes: Sequence, delta: int) -> list:
+    if not delta:
+        return list(nodes)
+    return [clone_with_line_delta(node, delta) for node in nodes]
+
+
+def _reparse_block(
+    model, section_index: int, block_index: int, new_lines, delta, get_model
+):
+    section = model.sections[section_index]
+    block = section.body[block_index]
+    if section.header is None:
+        return None
+
+    is_last_in_file = section_index == len(model.sections) - 1 and block_index == (
+        len(section.body) - 1
+    )
+    header_line = new_lines[section.header.lineno - 1]
+    if not header_line.endswith(("\r", "\n")):
+        return None
+
+    start = block.lineno - 1
+    if is_last_in_file:
+        block_lines = new_lines[start:]
+    else:
+        block_lines = new_lines[start : block.end_lineno + delta]
+
+    new_model = get_model(header_line + "".join(block_lines))
+    if len(new_model.sections) != 1:
+        return None
+    new_section = new_model.sections[0]
+    if new_section.__class__ is not section.__class__:
+        return None
+    if len(new_section.body) != 1:
+        return None
+    new_block = new_section.body[0]
+    if new_block.__class__ is not block.__class__:
+        return None
+
+    # The block must still start with its name at its first line (i.e.: if the
+    # name is indented or becomes a continuation, the lines would be a part of
+    # the previous block).
+    header = getattr(new_block, "header", None)
+    if not new_block.name or header is None or header.lineno != 2:
+        return None
+
+    # The block was parsed starting at the 2nd line.
+    _shift_in_place(new_block, block.lineno - 2)
+
+    new_section_copy = _copy_node(section)
+    new_section_copy.body = (
+        list(section.body[:block_index])
+        + [new_block]
+        + _reuse(section.body[block_index + 1 :], delta)
+    )
+    return new_section_copy
+
+
+def _reparse_section(model, section_index: int, new_lines, delta, get_model):
+    section = model.sections[section_index]
+    is_last_in_file = section_index == len(model.sections) - 1
+
+    start = section.lineno - 1
+    if is_last_in_file:
+        section_lines = new_lines[start:]
+    else:
+        section_lines = new_lines[start : section.end_lineno + delta]
+
+    new_model = get_model("".join(section_lines))
+    if len(new_model.sections) != 1:
+        return None
+    new_section = new_model.sections[0]
+    if new_section.__class__ is not section.__class__:
+        return None
+
+    if new_section.__class__.__name__ == "SettingSection":
+        # A template changes how the test cases are lexed.
+        if _has_template(new_section) or _has_template(section):
+            return None
+
+    _shift_in_place(new_section, section.lineno - 1)
+    return new_section
+
+
+def reparse(
+    model,
+    old_lines: Sequence[str],
+    new_lines: Sequence[str],
+    change_range: dict,
+    get_model: Callable[[str], object],
+) -> Optional[object]:
+    """
+    :param model:
+        The model (File) of the previous version of the document.
+    :param old_lines:
+        The lines (with line endings) of the previous version.
+    :param new_lines:
+        The lines (with line endings) of the new version.
+    :param change_range:
+        The range (in the previous version) of the change applied.
+    :param get_model:
+        The function used to parse the contents (i.e.: get_model,
+        get_resource_model, get_init_model).
+
+    :return:
+        The new model or None if a full parse is needed.
+    """
+    try:
+        start_line = change_range["start"]["line"]
+        end_line = change_range["end"]["line"]
+        delta = len(new_lines) - len(old_lines)
+
+        if _has_header_like_line(old_lines[start_line : end_line + 1]) or (
+            _has_header_like_line(new_lines[start_line : end_line + delta + 1])
+        ):
+            # A line starting with '*' is a section header (even if invalid)
+            # and changes how the lines after it are lexed.
+            return None
+
+        sections = model.sections
+        for section_index, section in enumerate(sections):
+            is_last_section = section_index == len(sections) - 1
+            if not _contains(section, start_line, end_line, is_last_section):
+                continue
+
+            new_section = None
+            if section.__class__.__name__ in _BLOCK_SECTIONS:
+                body = section.body
+                for block_index, block in enumerate(body):
+                    if block.__class__.__name__ not in _BLOCKS:
+                        continue
+                    is_last = is_last_section and block_index == len(body) - 1
+                    if _contains(block, start_line, end_line, is_last):
+                        if (
+                            section.__class__.__name__ == "TestCaseSection"
+                            and _file_has_template(model)
+                        ):
+                            return None
+                        # If it's not possible to re-parse only the block,
+                        # the whole section is re-parsed.
+                        new_section = _reparse_block(
+                            model,
+                            section_index,
+                            block_index,
+                            new_lines,
+                            delta,
+                            get_model,
+                        )
+                        break
+
+            if new_section is None:
+                if (
+                    section.__class__.__name__ == "TestCaseSection"
+                    and _file_has_template(model)
+                ):
+                    return None
+                new_section = _reparse_section(
+                    model, section_index, new_lines, delta, get_model
+                )
+                if new_section is None:
+                    return None
+
+            new_sections: List = (
+                list(sections[:section_index])
+                + [new_section]
+                + _reuse(sections[section_index + 1 :], delta)
+            )
+            new_model = _copy_node(model)
+            new_model.sections = new_sections
+            return new_model
+
+    except Exception:
+        log.exception("Error parsing incrementally (a full parse will be done).")
+    return None
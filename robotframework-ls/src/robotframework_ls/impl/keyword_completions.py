@@ -1,13 +1,21 @@
+import heapq
 import re
 from robocorp_ls_core.robotframework_log import get_logger
 from robotframework_ls.impl.protocols import ICompletionContext, IKeywordFound
-from typing import List
+from typing import List, Optional, Tuple
 
 log = get_logger(__name__)
 
 
+# The default maximum number of keyword completions returned (when there are
+# more matches, the best ones are returned and the completion list is marked
+# as incomplete so that the client asks for it again as the user types).
+# Can be customized with `robot.completions.keywords.max-results`.
+MAX_KEYWORD_COMPLETIONS = 250
+
+
 class _Collector(object):
-    def __init__(self, selection, token):
+    def __init__(self, selection, token, max_completions=None):
         from robotframework_ls.impl.string_matcher import RobotStringMatcher
         from robotframework_ls.impl.string_matcher import (
             build_matchers_with_resource_or_library_scope,
@@ -15,7 +23,10 @@ class _Collector(object):
 
         token_str = token.value if token is not None else None
 
-        self.completion_items = []
+        # The labels of all the keywords accepted (even the ones which are
+        # later discarded from the heap, so that a keyword with the same name
+        # found later on doesn't take its place).
+        self._completion_labels = set()
         self.selection = selection
         self.token = token
 
@@ -23,23 +34,36 @@ class _Collector(object):
 
         self._scope_matchers = build_matchers_with_resource_or_library_scope(token_str) if token_str is not None else []
 
-    def accepts(self, keyword_name):
-        if any(x.label == keyword_name for x in self.completion_items):
+        # A min-heap with the best entries found so far (see: `on_keyword`).
+        self._heap: list = []
+        if max_completions is None:
+            max_completions = MAX_KEYWORD_COMPLETIONS
+        # 0 means no limit.
+        self._max_completions = max_completions
+        self._found = 0
+        self.is_incomplete = False
+
+    def accepts(self, keyword_name, normalized_keyword_name):
+        if keyword_name in self._completion_labels:
             return False
 
-        if self._matcher is None:
+        # Note: this is done before the keyword found is created (so, keywords
+        # which don't match aren't bound to the completion context). When
+        # matched through a scope matcher, the library/resource name is
+        # checked in `on_keyword`.
+        matcher = self._matcher
+        if matcher is None or matcher.accepts_normalized_keyword_name(
+            normalized_keyword_name
+        ):
             return True
 
-        if self._matcher.accepts_keyword_name(keyword_name):
-            return True
-        for matcher in self._scope_matchers:
-            if matcher.accepts_keyword_name(keyword_name):
+        for scope_matcher in self._scope_matchers:
+            if scope_matcher.accepts_normalized_keyword_name(normalized_keyword_name):
                 return True
-            
         return False
 
     def _create_completion_item_from_keyword(
-        self, keyword_found: IKeywordFound, selection, token, col_delta=0
+        self, keyword_found: IKeywordFound, selection, token, col_delta=0, sort_text=None
     ):
         from robocorp_ls_core.lsp import (
             CompletionItem,
@@ -78,6 +102,7 @@ class _Collector(object):
             kind=keyword_found.completion_item_kind,
             text_edit=text_edit,
             insertText=text_edit.newText,
+            sortText=sort_text,
             documentation=keyword_found.docs,
             insertTextFormat=InsertTextFormat.Snippet,
             documentationFormat=(
@@ -89,35 +114,118 @@ class _Collector(object):
 
     def on_keyword(self, keyword_found):
         col_delta = 0
-        
-        if self._matcher is not None and not self._matcher.accepts_keyword_name(keyword_found.keyword_name):
-            for matcher in self._scope_matchers:
-                if matcher.accepts_keyword(keyword_found):
-                    # +1 for the dot
-                    col_delta = len(matcher.resource_or_library_name) + 1
-                    break
+        score = 0
+
+        matcher = self._matcher
+        if matcher is not None:
+            normalized_keyword_name = keyword_found.normalized_keyword_name
+            if matcher.accepts_normalized_keyword_name(normalized_keyword_name):
+                score = matcher.get_normalized_keyword_name_score(
+                    keyword_found.keyword_name, normalized_keyword_name
+                )
             else:
-                return  # i.e.: don't add completion
-
-        item = self._create_completion_item_from_keyword(
-            keyword_found, self.selection, self.token, col_delta=col_delta
+                for scope_matcher in self._scope_matchers:
+                    if scope_matcher.accepts_keyword(keyword_found):
+                        # +1 for the dot
+                        col_delta = len(scope_matcher.resource_or_library_name) + 1
+                        score = scope_matcher.get_normalized_keyword_name_score(
+                            keyword_found.keyword_name, normalized_keyword_name
+                        )
+                        break
+                else:
+                    return  # i.e.: don't add completion
+
+        self._completion_labels.add(keyword_found.keyword_name)
+
+        # Note: the completion item (which requires the docs) is only created
+        # for the entries which are actually returned.
+        #
+        # The entries are compared by (score, shorter name, found first).
+        self._found += 1
+        entry = (
+            score,
+            -len(keyword_found.keyword_name),
+            -self._found,
+            keyword_found,
+            col_delta,
         )
-
-        self.completion_items.append(item)
-
-
-def complete(completion_context: ICompletionContext) -> List[dict]:
+        heap = self._heap
+        if not self._max_completions or len(heap) < self._max_completions:
+            heapq.heappush(heap, entry)
+        else:
+            self.is_incomplete = True
+            heapq.heappushpop(heap, entry)
+
+    def get_completion_items(self) -> list:
+        """
+        Note: creates the completion items (and their docs) at each call.
+
+        :return:
+            The completion items (the best entries first, with a `sortText`
+            so that the client keeps that order).
+        """
+        entries = sorted(self._heap, key=lambda entry: entry[:3], reverse=True)
+        return [
+            self._create_completion_item_from_keyword(
+                keyword_found,
+                self.selection,
+                self.token,
+                col_delta=col_delta,
+                sort_text="%05d" % (i,),
+            )
+            for i, (_score, _len, _found, keyword_found, col_delta) in enumerate(
+                entries
+            )
+        ]
+
+
+def _collect(completion_context: ICompletionContext) -> Optional[_Collector]:
     from robotframework_ls.impl.collect_keywords import collect_keywords
     from robotframework_ls.impl import ast_utils
+    from robotframework_ls.impl.robot_lsp_constants import (
+        OPTION_ROBOT_COMPLETION_KEYWORDS_MAX_RESULTS,
+    )
 
     token_info = completion_context.get_current_token()
     if token_info is not None:
         keyword_token = ast_utils.get_keyword_name_token(token_info.node, token_info.token)
         if keyword_token is not None:
-            collector = _Collector(completion_context.sel, keyword_token)
-                
+            max_completions = MAX_KEYWORD_COMPLETIONS
+            config = completion_context.config
+            if config is not None:
+                max_completions = config.get_setting(
+                    OPTION_ROBOT_COMPLETION_KEYWORDS_MAX_RESULTS,
+                    int,
+                    MAX_KEYWORD_COMPLETIONS,
+                )
+            collector = _Collector(
+                completion_context.sel, keyword_token, max_completions=max_completions
+            )
+
             collect_keywords(completion_context, collector)
 
-            return list([x.to_dict() for x in collector.completion_items])
+            return collector
 
-    return []
+    return None
+
+
+def complete(completion_context: ICompletionContext) -> List[dict]:
+    collector = _collect(completion_context)
+    if collector is None:
+        return []
+    return list([x.to_dict() for x in collector.get_completion_items()])
+
+
+def complete_with_info(completion_context: ICompletionContext) -> Tuple[List[dict], bool]:
+    """
+    :return:
+        The completions and whether the completions were truncated (i.e.: the
+        completion list is incomplete).
+    """
+    collector = _collect(completion_context)
+    if collector is None:
+        return [], False
+    return (
+        list([x.to_dict() for x in collector.get_completion_items()]),
+        collector.is_incomplete,
+    )
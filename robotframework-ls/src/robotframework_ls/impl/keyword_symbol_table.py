@@ -0,0 +1,362 @@
+"""
+Keeps a table with the keywords defined and the imports of each document so
+that the keywords visible from a document can be obtained by merging the
+tables of the documents reachable through resource imports (instead of
+traversing the ASTs of all those documents at each request).
+
+The table of a document is computed once for each document instance (the
+workspace creates a new document whenever the contents change, so, it's never
+stale).
+
+The merged view (i.e.: which documents are reachable from a given document)
+is kept by the `WorkspaceSymbolTable` (available in the RobotWorkspace) and
+is invalidated when any of the documents in it changes (didOpen, didChange,
+didClose or a file-watch event). As the documents which aren't opened may also
+change in the filesystem without any notification, the documents in a cached
+view are also checked against the workspace before it's reused (which is a
+dict lookup and a stat for each document).
+
+The imports resolved are also kept in an `ImportGraph` (used to know which
+documents should be linted again when the keywords of a resource change).
+"""
+from collections import namedtuple
+import threading
+from typing import Dict, Optional, Set, Tuple, List
+
+from robocorp_ls_core.robotframework_log import get_logger
+from robotframework_ls.impl.import_graph import ImportGraph
+from robotframework_ls.impl.protocols import ICompletionContext, IRobotDocument
+
+
+log = get_logger(__name__)
+
+LibraryImportInfo = namedtuple("LibraryImportInfo", "name, alias, args")
+
+
+class KeywordDefinitionEntry(object):
+    """
+    A keyword defined in a document (i.e.: in its `*** Keywords ***` section).
+    """
+
+    __slots__ = ["keyword_node", "keyword_name", "normalized_keyword_name"]
+
+    def __init__(self, keyword_node, keyword_name, normalized_keyword_name):
+        self.keyword_node = keyword_node
+        self.keyword_name = keyword_name
+        self.normalized_keyword_name = normalized_keyword_name
+
+
+class DocumentSymbols(object):
+    """
+    The keywords defined and the imports of a single document.
+    """
+
+    __slots__ = ["doc", "ast", "keywords", "library_imports", "resource_imports"]
+
+    def __init__(
+        self,
+        doc: IRobotDocument,
+        ast,
+        keywords: Tuple[KeywordDefinitionEntry, ...],
+        library_imports: Tuple[LibraryImportInfo, ...],
+        resource_imports: tuple,
+    ):
+        self.doc = doc
+        self.ast = ast
+        self.keywords = keywords
+        self.library_imports = library_imports
+
+        # The ResourceImport nodes (they're resolved to documents in the
+        # `WorkspaceSymbolTable` because the resolution depends on the config).
+        self.resource_imports = resource_imports
+
+    def get_keywords_signature(self) -> tuple:
+        """
+        :return:
+            Something which changes when the keywords the document provides
+            to the documents which import it change (i.e.: the names of the
+            keywords defined in it or its imports).
+        """
+        return (
+            frozenset(entry.normalized_keyword_name for entry in self.keywords),
+            self.library_imports,
+            tuple(node.name for node in self.resource_imports),
+        )
+
+
+def get_document_symbols(doc: IRobotDocument) -> DocumentSymbols:
+    """
+    :return:
+        The symbols of the given document (computed on the first request and
+        then cached in the document).
+    """
+    doc_symbols = doc.document_symbols_cache
+    if doc_symbols is None:
+        doc_symbols = doc.document_symbols_cache = _compute_document_symbols(doc)
+    return doc_symbols
+
+
+def _compute_document_symbols(doc: IRobotDocument) -> DocumentSymbols:
+    from robotframework_ls.impl import ast_utils
+    from robotframework_ls.impl.robot_constants import BUILTIN_LIB
+    from robotframework_ls.impl.text_utilities import normalize_robot_name
+
+    ast = doc.get_ast()
+
+    keywords = []
+    library_imports = []
+    resource_imports = []
+
+    # Note: a single pass in the AST for everything.
+    for node_info in ast_utils.iter_keywords_and_imports(ast):
+        node = node_info.node
+        class_name = node.__class__.__name__
+        if class_name == "Keyword":
+            keyword_name = node.name
+            keywords.append(
+                KeywordDefinitionEntry(
+                    node, keyword_name, normalize_robot_name(keyword_name)
+                )
+            )
+        elif class_name == "LibraryImport":
+            library_info = LibraryImportInfo(node.name, node.alias, node.args)
+            if library_info not in library_imports:
+                library_imports.append(library_info)
+        else:
+            resource_imports.append(node)
+
+    builtin_info = LibraryImportInfo(BUILTIN_LIB, None, ())
+    if builtin_info not in library_imports:
+        library_imports.append(builtin_info)
+
+    return DocumentSymbols(
+        doc, ast, tuple(keywords), tuple(library_imports), tuple(resource_imports)
+    )
+
+
+class VisibleKeywords(object):
+    """
+    The documents whose keywords are visible from a given document (the
+    document itself and the ones reachable through resource imports).
+
+    :ivar steps:
+        A tuple(DocumentSymbols, bool) in the order in which the keywords
+        should be collected. Each document appears twice: first to collect the
+        keywords defined in it (with False) and then, after the documents it
+        imports, to collect the keywords from its libraries (with True).
+    """
+
+    __slots__ = ["root_doc", "config_key", "steps", "documents", "complete"]
+
+    def __init__(self, root_doc, config_key, steps, documents, complete):
+        self.root_doc = root_doc
+        self.config_key = config_key
+        self.steps: Tuple[Tuple[DocumentSymbols, bool], ...] = steps
+        self.documents: Tuple[DocumentSymbols, ...] = documents
+
+        # False if some resource import couldn't be resolved (in which case
+        # it's not cached as a file may be created to satisfy it).
+        self.complete: bool = complete
+
+    def iter_uris(self):
+        for doc_symbols in self.documents:
+            yield doc_symbols.doc.uri
+
+
+def _get_config_key(completion_context: ICompletionContext):
+    """
+    :return:
+        The settings which affect the resolution of the resource imports.
+    """
+    from robotframework_ls.impl.robot_lsp_constants import (
+        OPTION_ROBOT_PYTHONPATH,
+        OPTION_ROBOT_VARIABLES,
+    )
+
+    config = completion_context.config
+    if config is None:
+        return None
+    return repr(
+        (
+            config.get_setting(OPTION_ROBOT_PYTHONPATH, list, []),
+            sorted(config.get_setting(OPTION_ROBOT_VARIABLES, dict, {}).items()),
+        )
+    )
+
+
+def _compute_visible_keywords(
+    completion_context: ICompletionContext,
+    config_key,
+    import_graph: Optional[ImportGraph] = None,
+) -> VisibleKeywords:
+    steps: List[Tuple[DocumentSymbols, bool]] = []
+    documents: List[DocumentSymbols] = []
+    followed: Set[str] = set()
+    complete = True
+
+    def follow(ctx: ICompletionContext):
+        nonlocal complete
+        ctx.check_cancelled()
+        doc = ctx.doc
+        if doc.uri in followed:
+            return
+        followed.add(doc.uri)
+
+        doc_symbols = get_document_symbols(doc)
+        documents.append(doc_symbols)
+        steps.append((doc_symbols, False))
+        resource_uris = []
+        for resource_import in doc_symbols.resource_imports:
+            resource_doc = ctx.get_resource_import_as_doc(resource_import)
+            if resource_doc is None:
+                complete = False
+                continue
+            resource_uris.append(resource_doc.uri)
+            follow(ctx.create_copy(resource_doc))
+        steps.append((doc_symbols, True))
+
+        if import_graph is not None:
+            import_graph.set_imports(
+                doc.uri,
+                tuple(resource_uris),
+                tuple(library_info.name for library_info in doc_symbols.library_imports),
+                doc_symbols.get_keywords_signature(),
+            )
+
+    follow(completion_context)
+    return VisibleKeywords(
+        completion_context.doc, config_key, tuple(steps), tuple(documents), complete
+    )
+
+
+class WorkspaceSymbolTable(object):
+    """
+    Provides the keywords visible from a document (see: `VisibleKeywords`).
+
+    Note: the requests are done from multiple threads while the notifications
+    on changes are done in the thread which mutates the workspace.
+    """
+
+    def __init__(self, workspace):
+        self._workspace = workspace
+        self._lock = threading.Lock()
+
+        # root uri -> VisibleKeywords
+        self._uri_to_visible_keywords: Dict[str, VisibleKeywords] = {}
+
+        # uri -> root uris whose VisibleKeywords include the uri.
+        self._uri_to_dependent_roots: Dict[str, Set[str]] = {}
+
+        # Note: kept even when the views are discarded (the edges of a
+        # document are updated when its imports are resolved again).
+        self.import_graph = ImportGraph()
+
+    def get_visible_keywords(
+        self, completion_context: ICompletionContext
+    ) -> VisibleKeywords:
+        doc = completion_context.doc
+        config_key = _get_config_key(completion_context)
+
+        with self._lock:
+            visible_keywords = self._uri_to_visible_keywords.get(doc.uri)
+
+        if visible_keywords is not None and self._is_valid(
+            visible_keywords, doc, config_key
+        ):
+            return visible_keywords
+
+        visible_keywords = _compute_visible_keywords(
+            completion_context, config_key, self.import_graph
+        )
+        if visible_keywords.complete:
+            with self._lock:
+                self._discard(doc.uri)
+                self._uri_to_visible_keywords[doc.uri] = visible_keywords
+                for uri in visible_keywords.iter_uris():
+                    self._uri_to_dependent_roots.setdefault(uri, set()).add(doc.uri)
+        return visible_keywords
+
+    def _is_valid(self, visible_keywords: VisibleKeywords, doc, config_key) -> bool:
+        if visible_keywords.root_doc is not doc:
+            return False
+        if visible_keywords.config_key != config_key:
+            return False
+
+        workspace = self._workspace
+        for doc_symbols in visible_keywords.documents:
+            symbols_doc = doc_symbols.doc
+            if symbols_doc.document_symbols_cache is not doc_symbols:
+                # i.e.: the source of the document was changed in-place.
+                return False
+
+            if symbols_doc is not doc and (
+                workspace.get_document(symbols_doc.uri, accept_from_file=True)
+                is not symbols_doc
+            ):
+                return False
+        return True
+
+    def _discard(self, root_uri: str) -> None:
+        # Note: must be called with the lock held.
+        visible_keywords = self._uri_to_visible_keywords.pop(root_uri, None)
+        if visible_keywords is not None:
+            for uri in visible_keywords.iter_uris():
+                roots = self._uri_to_dependent_roots.get(uri)
+                if roots is not None:
+                    roots.discard(root_uri)
+                    if not roots:
+                        del self._uri_to_dependent_roots[uri]
+
+    def on_document_changed(self, uri: str) -> None:
+        """
+        Discards the cached views which include the given document.
+        """
+        with self._lock:
+            roots = self._uri_to_dependent_roots.get(uri)
+            if roots:
+                for root_uri in tuple(roots):
+                    self._discard(root_uri)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._uri_to_visible_keywords = {}
+            self._uri_to_dependent_roots = {}
+
+    def get_dependents_to_lint(self, doc: IRobotDocument, max_fan_out: int) -> List[str]:
+        """
+        :return:
+            The uris of the opened documents which import the given document
+            (directly or indirectly) if the keywords it provides changed since
+            the last time this was checked (at most `max_fan_out` uris, the
+            nearest ones first).
+        """
+        keywords_signature = get_document_symbols(doc).get_keywords_signature()
+        if not self.import_graph.update_keywords_signature(doc.uri, keywords_signature):
+            return []
+
+        ret: List[str] = []
+        if max_fan_out <= 0:
+            return ret
+
+        workspace = self._workspace
+        for uri in self.import_graph.iter_dependents(doc.uri):
+            if workspace.get_document(uri, accept_from_file=False) is not None:
+                ret.append(uri)
+                if len(ret) >= max_fan_out:
+                    log.info(
+                        "Max fan-out (%s) reached for dependents of: %s.",
+                        max_fan_out,
+                        doc.uri,
+                    )
+                    break
+        return ret
+
+
+def get_visible_keywords(completion_context: ICompletionContext) -> VisibleKeywords:
+    workspace = completion_context.workspace
+    symbol_table: Optional[WorkspaceSymbolTable] = getattr(
+        workspace, "keyword_symbol_table", None
+    )
+    if symbol_table is None:
+        return _compute_visible_keywords(completion_context, None)
+    return symbol_table.get_visible_keywords(completion_context)
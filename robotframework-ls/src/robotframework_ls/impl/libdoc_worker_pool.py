@@ -0,0 +1,177 @@
+"""
+A pool of processes used to run libdoc (which imports user libraries).
+
+The processes are recycled (so that the memory used by imported libraries
+is given back and stale imports aren't kept around) when:
+
+- The pool executed `max_tasks_per_child` tasks per worker.
+- The pool is idle for `idle_timeout` seconds (the processes are shut down
+  and recreated on demand).
+- A task requests a fresh worker (i.e.: a library whose source changed is
+  being regenerated and the current workers may have it imported).
+"""
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Optional, Set
+
+from robocorp_ls_core.robotframework_log import get_logger
+
+
+log = get_logger(__name__)
+
+DEFAULT_MAX_TASKS_PER_CHILD = 50
+DEFAULT_IDLE_TIMEOUT = 60.0
+
+
+def get_default_max_workers() -> int:
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+def _dummy_process():
+    pass
+
+
+class LibdocWorkerPool(object):
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_tasks_per_child: int = DEFAULT_MAX_TASKS_PER_CHILD,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    ):
+        """
+        :param max_workers:
+            The maximum number of processes (if None or <= 0 a default based
+            on the number of cpus is used).
+
+        :param max_tasks_per_child:
+            The number of tasks (on average) that each worker executes before
+            the pool is recycled (<= 0 means no recycling).
+
+        :param idle_timeout:
+            Seconds without any task after which the worker processes are
+            shut down (<= 0 means they're kept alive).
+        """
+        self._lock = threading.RLock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._tasks_in_executor = 0
+        self._pending = 0
+        # The futures not finished yet (cancelled on dispose).
+        self._pending_futures: Set[Future] = set()
+        self._idle_timer: Optional[threading.Timer] = None
+        self._disposed = False
+
+        self.max_workers = max_workers
+        self.max_tasks_per_child = max_tasks_per_child
+        self.idle_timeout = idle_timeout
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    @max_workers.setter
+    def max_workers(self, max_workers: Optional[int]) -> None:
+        if not max_workers or max_workers <= 0:
+            max_workers = get_default_max_workers()
+        with self._lock:
+            if getattr(self, "_max_workers", max_workers) != max_workers:
+                # Changes are applied in the next executor.
+                self._recycle("max workers changed")
+            self._max_workers = max_workers
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        log.debug("Creating libdoc worker pool (max workers: %s).", self._max_workers)
+        executor = ProcessPoolExecutor(self._max_workers)
+
+        # we have to submit a dummy process to start the process pool,
+        # because it does not start correctly if we do it from another
+        # thread
+        executor.submit(_dummy_process).result()
+        return executor
+
+    def _recycle(self, reason: str) -> None:
+        # Must be called with the lock held.
+        executor = self._executor
+        if executor is not None:
+            log.debug("Recycling libdoc worker pool (%s).", reason)
+            self._executor = None
+            self._tasks_in_executor = 0
+            # Running tasks are still finished (we just don't wait for them).
+            executor.shutdown(wait=False)
+
+    def submit(self, fn, *args, fresh_worker: bool = False) -> Future:
+        """
+        :param fresh_worker:
+            If True, the task is run in a process which didn't run any other
+            task from this pool (so, modules imported by previous tasks are
+            not reused).
+        """
+        with self._lock:
+            if self._disposed:
+                raise RuntimeError("The libdoc worker pool is already disposed.")
+
+            self._cancel_idle_timer()
+
+            if fresh_worker and self._tasks_in_executor > 0:
+                self._recycle("fresh worker requested")
+
+            elif (
+                self.max_tasks_per_child > 0
+                and self._tasks_in_executor
+                >= self.max_tasks_per_child * self._max_workers
+            ):
+                self._recycle("max tasks per child reached")
+
+            if self._executor is None:
+                self._executor = self._create_executor()
+
+            self._tasks_in_executor += 1
+            self._pending += 1
+            future = self._executor.submit(fn, *args)
+            self._pending_futures.add(future)
+
+        future.add_done_callback(self._on_task_done)
+        return future
+
+    def _on_task_done(self, future) -> None:
+        with self._lock:
+            self._pending -= 1
+            self._pending_futures.discard(future)
+            if self._pending == 0 and self.idle_timeout > 0 and not self._disposed:
+                self._idle_timer = threading.Timer(
+                    self.idle_timeout, self._on_idle_timeout
+                )
+                self._idle_timer.daemon = True
+                self._idle_timer.start()
+
+    def _cancel_idle_timer(self) -> None:
+        # Must be called with the lock held.
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+
+    def _on_idle_timeout(self) -> None:
+        with self._lock:
+            if self._pending == 0:
+                self._idle_timer = None
+                self._recycle("idle timeout")
+
+    @property
+    def is_running(self) -> bool:
+        return self._executor is not None
+
+    def dispose(self) -> None:
+        with self._lock:
+            self._disposed = True
+            self._cancel_idle_timer()
+            executor = self._executor
+            self._executor = None
+
+            # Note: `shutdown(cancel_futures=True)` is only available in
+            # Python 3.9 onwards, so, the pending futures are cancelled
+            # explicitly (the ones already running are just not waited for).
+            for future in tuple(self._pending_futures):
+                future.cancel()
+
+            if executor is not None:
+                executor.shutdown(wait=False)
@@ -0,0 +1,391 @@
+"""
+Helpers to persist a LibraryDoc loaded from a .libspec in a binary format
+(so that other processes don't have to parse the .libspec XML again).
+
+The cache is stored beside the .libspec (by default) and is only valid for
+the spec mtime/size, robot version and python version used to create it (if
+any of those doesn't match, the cache is considered stale and the XML is used).
+
+The file layout is:
+
+    header: struct("<II") with the size of the key and of the library data.
+    key: marshalled cache key.
+    library data: marshalled LibraryDoc data (see: `library_doc_to_data`)
+        where the documentation of each keyword is an (offset, length) into
+        the docs blob.
+    docs blob: the utf-8 encoded documentation of all the keywords (along
+        with the documentation converted to markdown for html docs, so that
+        it's converted only once, when the cache is created).
+
+This makes it possible to load the library data without reading the docs
+blob (the documentation is then read on demand).
+
+The cache file is memory-mapped read-only, so, the docs blob (which is the
+bulk of the data) is kept only once in memory by the OS even when the same
+library is used by multiple processes (i.e.: the regular and the lint
+servers): one process publishes the cache and the others just map it.
+
+Note that only the docs blob is shared: the library data (keywords,
+arguments, etc.) is still unmarshalled into regular python objects in
+each process which loads the cache (sharing it would require a layout
+which could be used without unmarshalling it, which isn't done as the
+docs are the bulk of the memory used by a LibraryDoc).
+"""
+from collections import OrderedDict
+import marshal
+import mmap
+import os
+import struct
+import sys
+import threading
+from typing import Optional
+
+from robocorp_ls_core.robotframework_log import get_logger
+from robotframework_ls.impl.robot_specbuilder import LibraryDoc
+
+
+log = get_logger(__name__)
+
+# Should be raised whenever the data saved changes.
+CACHE_VERSION = 4
+
+# Note: marshal is used because it's fast and only deals with builtin types
+# (the python version is part of the key because its format may change).
+_MARSHAL_VERSION = 4
+
+_HEADER = struct.Struct("<II")
+
+
+def get_binary_cache_filename(spec_filename: str) -> str:
+    return spec_filename + ".cache"
+
+
+def _create_cache_key(spec_stat, robot_version: str) -> tuple:
+    return (
+        CACHE_VERSION,
+        tuple(sys.version_info[:2]),
+        robot_version,
+        spec_stat.st_mtime_ns,
+        spec_stat.st_size,
+    )
+
+
+def _read_header_and_key(stream):
+    """
+    :return tuple(key, data_len, docs_blob_offset)
+    """
+    header = stream.read(_HEADER.size)
+    key_len, data_len = _HEADER.unpack(header)
+    key = marshal.loads(stream.read(key_len))
+    return key, data_len, _HEADER.size + key_len + data_len
+
+
+def _read_mapped_header_and_key(mapped):
+    """
+    :return tuple(key, data_len, docs_blob_offset)
+    """
+    key_len, data_len = _HEADER.unpack_from(mapped, 0)
+    key = marshal.loads(mapped[_HEADER.size : _HEADER.size + key_len])
+    return key, data_len, _HEADER.size + key_len + data_len
+
+
+# Cache files are memory-mapped (read-only) so that the docs blob isn't
+# copied into each process which uses the library: the mapped pages are shared
+# by all the processes mapping the same file (i.e.: the regular and the lint
+# servers). Note: not done on Windows because a mapped file can't be replaced
+# there (which would prevent other processes from updating a stale cache).
+_USE_MMAP = sys.platform != "win32"
+
+# Maximum number of cache files kept mapped at the same time (each mapping
+# keeps a file descriptor open). Files unmapped are mapped again on demand.
+_MAX_MAPPED_FILES = 128
+
+_mapped_files_lock = threading.Lock()
+_mapped_files: "OrderedDict[_MappedCacheFile, bool]" = OrderedDict()
+
+
+class _MappedCacheFile(object):
+    """
+    Provides the contents of the docs blob of a cache file.
+
+    While mapped, the contents are always the ones which match the loaded key
+    (the cache file is never changed in-place, only replaced). If it has to be
+    mapped again (or if mmap isn't used), the key is checked again.
+    """
+
+    def __init__(self, cache_filename: str, key: tuple, docs_blob_offset: int, mapped):
+        self._cache_filename = cache_filename
+        self._key = key
+        self._docs_blob_offset = docs_blob_offset
+        self._mapped = mapped
+        if mapped is not None:
+            with _mapped_files_lock:
+                self._register()
+
+    def _register(self):
+        # Note: must be called with _mapped_files_lock held.
+        _mapped_files[self] = True
+        _mapped_files.move_to_end(self)
+        while len(_mapped_files) > _MAX_MAPPED_FILES:
+            oldest, _ = _mapped_files.popitem(last=False)
+            oldest._close()
+
+    def _close(self):
+        mapped = self._mapped
+        self._mapped = None
+        if mapped is not None:
+            mapped.close()
+
+    def read(self, offset: int, length: int) -> Optional[bytes]:
+        """
+        :return:
+            The bytes or None if the cache file changed (or couldn't be read).
+        """
+        start = self._docs_blob_offset + offset
+        if not _USE_MMAP:
+            with open(self._cache_filename, "rb") as stream:
+                key, _data_len, _docs_blob_offset = _read_header_and_key(stream)
+                if key != self._key:
+                    return None
+                stream.seek(start)
+                return stream.read(length)
+
+        with _mapped_files_lock:
+            mapped = self._mapped
+            if mapped is None:
+                with open(self._cache_filename, "rb") as stream:
+                    mapped = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+                key, _data_len, _docs_blob_offset = _read_mapped_header_and_key(
+                    mapped
+                )
+                if key != self._key:
+                    mapped.close()
+                    return None
+                self._mapped = mapped
+            self._register()
+            return mapped[start : start + length]
+
+    def close(self):
+        with _mapped_files_lock:
+            _mapped_files.pop(self, None)
+            self._close()
+
+
+class _LazyDocsReader(object):
+    """
+    Reads the documentation of keywords from the docs blob of a cache file
+    (using the spec if the cache file was changed in the meanwhile).
+    """
+
+    def __init__(self, spec_filename: str, cache_file: _MappedCacheFile):
+        self._spec_filename = spec_filename
+        self._cache_file = cache_file
+        self._lock = threading.Lock()
+        self._fallback_docs: Optional[dict] = None
+
+    def read_doc(
+        self, offset: int, length: int, keyword_name: str, markdown: bool = False
+    ) -> str:
+        if not length:
+            return ""
+        try:
+            contents = self._cache_file.read(offset, length)
+            if contents is not None:
+                return contents.decode("utf-8")
+        except Exception:
+            log.exception("Error reading doc from cache of: %s", self._spec_filename)
+
+        return self._read_doc_from_spec(keyword_name, markdown)
+
+    def _read_doc_from_spec(self, keyword_name: str, markdown: bool) -> str:
+        # The cache changed (or couldn't be read): this may happen if the
+        # spec was regenerated after the LibraryDoc was loaded. Use the docs
+        # from the spec as a fallback.
+        with self._lock:
+            fallback_docs = self._fallback_docs
+            if fallback_docs is None:
+                from robotframework_ls.impl.robot_specbuilder import SpecDocBuilder
+
+                fallback_docs = {}
+                try:
+                    libdoc = SpecDocBuilder().build(self._spec_filename)
+                    for keyword in libdoc.inits + libdoc.keywords:
+                        fallback_docs[keyword.name] = keyword
+                except Exception:
+                    log.exception("Error loading docs from: %s", self._spec_filename)
+                self._fallback_docs = fallback_docs
+
+        keyword = fallback_docs.get(keyword_name)
+        if keyword is None:
+            return ""
+        if markdown:
+            from robotframework_ls.impl.robot_specbuilder import markdown_doc
+
+            return markdown_doc(keyword)
+        return keyword.doc
+
+
+class _LazyDoc(object):
+
+    __slots__ = ["_reader", "_offset", "_length", "_keyword_name", "_markdown"]
+
+    def __init__(
+        self, reader: _LazyDocsReader, offset, length, keyword_name, markdown
+    ):
+        self._reader = reader
+        self._offset = offset
+        self._length = length
+        self._keyword_name = keyword_name
+        self._markdown = markdown
+
+    def __call__(self) -> str:
+        return self._reader.read_doc(
+            self._offset, self._length, self._keyword_name, self._markdown
+        )
+
+
+def load_library_doc(
+    spec_filename: str,
+    spec_stat,
+    robot_version: str,
+    lazy_docs: bool = False,
+    cache_filename: Optional[str] = None,
+) -> Optional[LibraryDoc]:
+    """
+    :param spec_stat:
+        The os.stat() of the spec filename (obtained before loading).
+
+    :param cache_filename:
+        If given, the cache is read from this file (otherwise it's beside the
+        spec).
+
+    :param lazy_docs:
+        If True, the documentation of the keywords is only read from the cache
+        when it's first requested (the cache file is kept mapped in memory to
+        do that).
+
+    :return:
+        The LibraryDoc or None if the cache is missing or stale.
+    """
+    from robotframework_ls.impl.robot_specbuilder import library_doc_from_data
+
+    if cache_filename is None:
+        cache_filename = get_binary_cache_filename(spec_filename)
+    try:
+        stream = open(cache_filename, "rb")
+    except FileNotFoundError:
+        return None
+    except Exception:
+        log.exception("Error reading: %s", cache_filename)
+        return None
+
+    mapped = None
+    try:
+        with stream:
+            if _USE_MMAP:
+                mapped = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+                key, data_len, docs_blob_offset = _read_mapped_header_and_key(mapped)
+            else:
+                key, data_len, docs_blob_offset = _read_header_and_key(stream)
+
+            if key != _create_cache_key(spec_stat, robot_version):
+                if mapped is not None:
+                    mapped.close()
+                return None
+
+            if mapped is not None:
+                data = marshal.loads(
+                    mapped[docs_blob_offset - data_len : docs_blob_offset]
+                )
+            else:
+                data = marshal.loads(stream.read(data_len))
+
+            if lazy_docs:
+                reader = _LazyDocsReader(
+                    spec_filename,
+                    _MappedCacheFile(cache_filename, key, docs_blob_offset, mapped),
+                )
+                mapped = None  # Now owned by the _MappedCacheFile.
+
+                def data_to_doc(doc_data, keyword_name, markdown=False):
+                    offset, length = doc_data
+                    if not length:
+                        return ""
+                    return _LazyDoc(reader, offset, length, keyword_name, markdown)
+
+            else:
+                if mapped is not None:
+                    docs_blob = mapped[docs_blob_offset:]
+                    mapped.close()
+                    mapped = None
+                else:
+                    docs_blob = stream.read()
+
+                def data_to_doc(doc_data, keyword_name, markdown=False):
+                    offset, length = doc_data
+                    return docs_blob[offset : offset + length].decode("utf-8")
+
+            return library_doc_from_data(spec_filename, data, data_to_doc)
+    except Exception:
+        if mapped is not None:
+            mapped.close()
+        log.exception("Error loading libspec cache from: %s", cache_filename)
+        return None
+
+
+def store_library_doc(
+    spec_filename: str,
+    spec_stat,
+    robot_version: str,
+    libdoc: LibraryDoc,
+    cache_filename: Optional[str] = None,
+) -> None:
+    """
+    :param spec_stat:
+        The os.stat() of the spec filename (obtained before loading the libdoc).
+
+    :param cache_filename:
+        If given, the cache is written to this file (otherwise it's beside the
+        spec).
+    """
+    from robocorp_ls_core.basic import create_tmp_filename
+    from robotframework_ls.impl.robot_specbuilder import library_doc_to_data
+
+    if cache_filename is None:
+        cache_filename = get_binary_cache_filename(spec_filename)
+    try:
+        docs_blob = []
+        docs_blob_len = [0]
+
+        def doc_to_data(doc):
+            encoded = doc.encode("utf-8")
+            offset = docs_blob_len[0]
+            docs_blob.append(encoded)
+            docs_blob_len[0] += len(encoded)
+            return offset, len(encoded)
+
+        data = library_doc_to_data(libdoc, doc_to_data)
+
+        key_bytes = marshal.dumps(
+            _create_cache_key(spec_stat, robot_version), _MARSHAL_VERSION
+        )
+        data_bytes = marshal.dumps(data, _MARSHAL_VERSION)
+
+        # Write to a temporary file and then rename so that readers in other
+        # processes never see a partially written file.
+        tmp_filename = create_tmp_filename(cache_filename)
+        with open(tmp_filename, "wb") as stream:
+            stream.write(_HEADER.pack(len(key_bytes), len(data_bytes)))
+            stream.write(key_bytes)
+            stream.write(data_bytes)
+            for doc in docs_blob:
+                stream.write(doc)
+        os.replace(tmp_filename, cache_filename)
+    except Exception:
+        log.exception("Error writing libspec cache to: %s", cache_filename)
+
+
+def remove_library_doc_cache(spec_filename: str) -> None:
+    cache_filename = get_binary_cache_filename(spec_filename)
+    if os.path.exists(cache_filename):
+        os.remove(cache_filename)
@@ -0,0 +1,212 @@
+"""
+Content-addressed storage for the generated .libspec files.
+
+Libraries imported with different arguments (or the same library generated
+for different interpreters) usually generate the same spec. To avoid keeping
+(and loading) many copies of the same spec, the generated spec is normalized
+(sources are made absolute and the generation timestamp is removed) and
+stored once by the sha256 of its contents:
+
+    ${content_dir}/${sha256}.libspec
+
+The spec generated in the user/builtins dir (which is the one tracked by the
+LibspecManager) is then replaced by a hard-link to the stored content (or by
+a copy of it if hard-links aren't available) and the `.m` additional info of
+that spec keeps the content hash.
+
+When loaded, specs with the same content hash share the same LibraryDoc.
+"""
+import hashlib
+import os
+import re
+import sys
+import threading
+import weakref
+from typing import Optional
+
+from robocorp_ls_core.robotframework_log import get_logger
+from robotframework_ls.impl.robot_specbuilder import LibraryDoc
+
+
+log = get_logger(__name__)
+
+_TAG_RE = re.compile(r"<[^!?/][^>]*>")
+_SOURCE_ATTR_RE = re.compile(r'(\ssource=")([^"]*)(")')
+_GENERATED_ATTR_RE = re.compile(r'\sgenerated="[^"]*"')
+
+
+def normalize_libspec_contents(contents: str, spec_dir: str) -> str:
+    """
+    :param spec_dir:
+        The directory where the spec was generated (relative sources are
+        relative to it).
+
+    :return:
+        The spec contents with the `generated` attribute removed and with all
+        the `source` attributes made absolute (so that the contents don't
+        depend on where the spec was generated).
+    """
+    from xml.sax.saxutils import escape, unescape
+
+    def fix_source(match):
+        source = unescape(match.group(2), {"&quot;": '"'})
+        if source and not os.path.isabs(source):
+            source = os.path.normpath(os.path.join(spec_dir, source))
+        return match.group(1) + escape(source, {'"': "&quot;"}) + match.group(3)
+
+    def fix_tag(match):
+        tag = match.group(0)
+        if "generated=" in tag:
+            tag = _GENERATED_ATTR_RE.sub("", tag, count=1)
+        if "source=" in tag:
+            tag = _SOURCE_ATTR_RE.sub(fix_source, tag, count=1)
+        return tag
+
+    # Note: '<' and '>' are always escaped in the text/attributes, so, a
+    # regexp is enough to find the tags.
+    return _TAG_RE.sub(fix_tag, contents)
+
+
+# A file created in the content dir when some spec is a copy of the contents
+# (instead of a hard-link), in which case the number of links of a content
+# file doesn't say whether it's still in use.
+_COPY_MODE_MARKER = ".copy_mode"
+
+
+def is_copy_mode(content_dir: str) -> bool:
+    return os.path.exists(os.path.join(content_dir, _COPY_MODE_MARKER))
+
+
+class LibspecContentStore(object):
+    def __init__(self, content_dir: str, robot_version: str):
+        self._content_dir = content_dir
+        self._robot_version = robot_version
+        self._lock = threading.Lock()
+        self._content_hash_to_library_doc: "weakref.WeakValueDictionary[str, LibraryDoc]" = (
+            weakref.WeakValueDictionary()
+        )
+        try:
+            os.makedirs(content_dir)
+        except BaseException:
+            # Ignore exception if it's already created.
+            pass
+
+    @property
+    def content_dir(self) -> str:
+        return self._content_dir
+
+    def get_content_filename(self, content_hash: str) -> str:
+        return os.path.join(self._content_dir, content_hash + ".libspec")
+
+    def get_binary_cache_filename(self, content_hash: str) -> str:
+        # The content is shared among interpreters, so, the binary cache must
+        # be specific to the python/robot version which loads it.
+        return os.path.join(
+            self._content_dir,
+            "%s.libspec.py%s%s_rf%s.cache"
+            % ((content_hash,) + tuple(sys.version_info[:2]) + (self._robot_version,)),
+        )
+
+    def add(self, spec_filename: str) -> Optional[str]:
+        """
+        Stores the contents of the given (just generated) spec and replaces it
+        with a link to the stored contents.
+
+        :note: must be called with the mutex for the spec filename acquired.
+
+        :return:
+            The content hash or None if it wasn't possible to store it.
+        """
+        from robocorp_ls_core.basic import create_tmp_filename
+
+        try:
+            with open(spec_filename, "r", encoding="utf-8") as stream:
+                contents = stream.read()
+
+            contents = normalize_libspec_contents(
+                contents, os.path.dirname(os.path.abspath(spec_filename))
+            )
+            encoded = contents.encode("utf-8")
+            content_hash = hashlib.sha256(encoded).hexdigest()
+            content_filename = self.get_content_filename(content_hash)
+
+            if not os.path.exists(content_filename):
+                # Write to a temporary file and then rename so that readers
+                # in other processes never see a partially written file.
+                tmp_filename = create_tmp_filename(content_filename)
+                with open(tmp_filename, "wb") as stream:
+                    stream.write(encoded)
+                os.replace(tmp_filename, content_filename)
+
+            tmp_filename = create_tmp_filename(spec_filename)
+            try:
+                # Note: the link can only be created if the file doesn't exist.
+                os.unlink(tmp_filename)
+                os.link(content_filename, tmp_filename)
+            except OSError:
+                # Hard-links not available (i.e.: different devices): use a
+                # copy (which shares the in-memory LibraryDoc but not the disk).
+                self._mark_copy_mode()
+                with open(tmp_filename, "wb") as stream:
+                    stream.write(encoded)
+            os.replace(tmp_filename, spec_filename)
+            return content_hash
+        except Exception:
+            log.exception("Error adding libspec to content store: %s", spec_filename)
+            return None
+
+    def _mark_copy_mode(self) -> None:
+        marker_filename = os.path.join(self._content_dir, _COPY_MODE_MARKER)
+        if not os.path.exists(marker_filename):
+            try:
+                with open(marker_filename, "w"):
+                    pass
+            except OSError:
+                log.exception("Error creating: %s", marker_filename)
+
+    def load_library_doc(self, content_hash: str) -> Optional[LibraryDoc]:
+        """
+        :return:
+            The LibraryDoc for the given content (shared by all the specs with
+            the same content) or None if it's not available.
+        """
+        from robotframework_ls.impl import robot_specbuilder
+        from robotframework_ls.impl import libspec_cache
+
+        with self._lock:
+            libdoc = self._content_hash_to_library_doc.get(content_hash)
+            if libdoc is not None:
+                return libdoc
+
+            content_filename = self.get_content_filename(content_hash)
+            cache_filename = self.get_binary_cache_filename(content_hash)
+            try:
+                # Note: the contents are never changed after being written, so,
+                # no mutex is needed to read it.
+                stat = os.stat(content_filename)
+                libdoc = libspec_cache.load_library_doc(
+                    content_filename,
+                    stat,
+                    self._robot_version,
+                    lazy_docs=True,
+                    cache_filename=cache_filename,
+                )
+                if libdoc is None:
+                    libdoc = robot_specbuilder.SpecDocBuilder().build(
+                        content_filename
+                    )
+                    libspec_cache.store_library_doc(
+                        content_filename,
+                        stat,
+                        self._robot_version,
+                        libdoc,
+                        cache_filename=cache_filename,
+                    )
+            except FileNotFoundError:
+                return None
+            except Exception:
+                log.exception("Error when loading content: %s", content_filename)
+                return None
+
+            self._content_hash_to_library_doc[content_hash] = libdoc
+            return libdoc
@@ -0,0 +1,171 @@
+"""
+Helpers to find the .libspec files inside a folder.
+
+The folder is traversed with `os.scandir`, skipping the directories which
+match the exclude globs (by default things as `.git`, `node_modules`, caches)
+as well as virtual environments (directories with a `pyvenv.cfg`).
+
+The scan is incremental: the contents of each directory are kept along with
+the directory mtime and only the directories whose mtime changed are listed
+again (note that the mtime of a directory changes when an entry is
+added/removed/renamed directly inside it).
+"""
+from fnmatch import fnmatch
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from robocorp_ls_core.robotframework_log import get_logger
+
+
+log = get_logger(__name__)
+
+DEFAULT_EXCLUDES = (
+    ".git",
+    ".hg",
+    ".svn",
+    "node_modules",
+    "__pycache__",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".tox",
+    ".nox",
+    ".eggs",
+    "*.egg-info",
+    ".venv",
+    "venv",
+    ".idea",
+)
+
+# If the mtime of a directory is too close to the time of the scan, another
+# change in that same directory may not change its mtime (depending on the
+# filesystem granularity), so, it's not trusted for the next scan.
+_RACY_MTIME_NS = 2 * 1000000000
+
+
+class _DirInfo(object):
+
+    __slots__ = ["mtime_ns", "filenames", "subdirs"]
+
+    def __init__(self, mtime_ns, filenames, subdirs):
+        self.mtime_ns = mtime_ns
+        self.filenames = filenames
+        self.subdirs = subdirs
+
+
+class LibspecDirScanner(object):
+    def __init__(
+        self,
+        root: str,
+        recursive: bool,
+        excludes: Optional[Iterable[str]] = None,
+        extensions: Tuple[str, ...] = (".libspec",),
+    ):
+        """
+        :param excludes:
+            Globs matched against the name and against the path (relative to
+            the root, with '/' as the separator) of the directories to be
+            skipped (used in addition to the `DEFAULT_EXCLUDES`).
+
+        :param extensions:
+            The (lowercase) extensions of the files to be found.
+        """
+        self.root = root
+        self.recursive = recursive
+        self._extensions = extensions
+        self._excludes: Tuple[str, ...] = ()
+        self._dir_to_info: Dict[str, _DirInfo] = {}
+        self.set_excludes(excludes)
+
+    @property
+    def excludes(self) -> Tuple[str, ...]:
+        return self._excludes
+
+    def set_excludes(self, excludes: Optional[Iterable[str]]) -> None:
+        excludes = DEFAULT_EXCLUDES + tuple(excludes or ())
+        if excludes != self._excludes:
+            self._excludes = excludes
+            # The cached subdirs were filtered with the old excludes.
+            self._dir_to_info = {}
+
+    def _is_excluded(self, name: str, relative_path: str) -> bool:
+        for exclude in self._excludes:
+            if fnmatch(name, exclude) or fnmatch(relative_path, exclude):
+                return True
+        return False
+
+    def scan(self) -> Set[str]:
+        """
+        :return:
+            The files found (with one of the extensions given).
+        """
+        root = self.root
+        if not os.path.isdir(root):
+            self._dir_to_info = {}
+            return set()
+
+        old_dir_to_info = self._dir_to_info
+        new_dir_to_info: Dict[str, _DirInfo] = {}
+        racy_mtime_ns = time.time_ns() - _RACY_MTIME_NS
+
+        found: Set[str] = set()
+        stack: List[Tuple[str, str]] = [(root, "")]
+        while stack:
+            dirpath, relative_path = stack.pop()
+            try:
+                mtime_ns = os.stat(dirpath).st_mtime_ns
+            except OSError:
+                continue  # Removed in the meanwhile.
+
+            info = old_dir_to_info.get(dirpath)
+            if info is None or info.mtime_ns != mtime_ns:
+                info = self._list_dir(dirpath, relative_path)
+                if info is None:
+                    continue
+                if mtime_ns < racy_mtime_ns:
+                    info.mtime_ns = mtime_ns
+
+            new_dir_to_info[dirpath] = info
+            found.update(info.filenames)
+            for subdir_name in info.subdirs:
+                stack.append(
+                    (
+                        os.path.join(dirpath, subdir_name),
+                        relative_path + "/" + subdir_name
+                        if relative_path
+                        else subdir_name,
+                    )
+                )
+
+        # Always set as a whole (to avoid racing conditions).
+        self._dir_to_info = new_dir_to_info
+        return found
+
+    def _list_dir(self, dirpath: str, relative_path: str) -> Optional[_DirInfo]:
+        filenames = []
+        subdirs = []
+        try:
+            with os.scandir(dirpath) as dir_entries:
+                for dir_entry in dir_entries:
+                    name = dir_entry.name
+                    try:
+                        if self.recursive and dir_entry.is_dir(follow_symlinks=False):
+                            subdir_relative_path = (
+                                relative_path + "/" + name if relative_path else name
+                            )
+                            if not self._is_excluded(name, subdir_relative_path):
+                                subdirs.append(name)
+
+                        elif name.lower().endswith(self._extensions):
+                            filenames.append(dir_entry.path)
+
+                        elif name == "pyvenv.cfg" and relative_path:
+                            # Don't traverse virtual environments.
+                            return _DirInfo(None, (), ())
+                    except OSError:
+                        continue
+        except OSError:
+            log.debug("Unable to list: %s", dirpath)
+            return None
+
+        return _DirInfo(None, tuple(filenames), tuple(subdirs))
@@ -0,0 +1,366 @@
+"""
+Garbage collection of the libspecs generated in the user libspec dir.
+
+The user libspec dir would otherwise only grow (each argument variant or
+renamed library leaves its spec behind), so, a garbage collection pass which
+removes specs not used for longer than a given age and then the least recently
+used specs while the dir is bigger than a given size is done in the background.
+
+The last time each spec was used is kept in memory and merged (taking the
+newest time) in a `.last_use.json` index in the user libspec dir when the
+collection is done (so that the information from different processes using
+the same dir is kept). Specs which aren't in the index use the spec mtime.
+
+Note: the builtins are never collected (only the user libspec dir is handled).
+"""
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from robocorp_ls_core.robotframework_log import get_logger
+
+
+log = get_logger(__name__)
+
+LAST_USE_INDEX_BASENAME = ".last_use.json"
+
+DEFAULT_MAX_SIZE_MB = 200
+DEFAULT_MAX_AGE_DAYS = 30
+
+# Interval between garbage collection passes.
+DEFAULT_INTERVAL = 60 * 60
+
+# Contents in the content store which aren't referenced by any spec are only
+# removed after this time (so that a content which was just stored and is
+# still not linked isn't removed).
+_UNREFERENCED_CONTENT_GRACE_TIME = 10 * 60
+
+# Files which are related to a spec (and are removed along with it).
+_SPEC_RELATED_SUFFIXES = (".m", ".cache")
+
+
+def _get_size(filename) -> int:
+    try:
+        return os.stat(filename).st_size
+    except OSError:
+        return 0
+
+
+class _SpecEntry(object):
+
+    __slots__ = ["spec_filename", "size", "last_use"]
+
+    def __init__(self, spec_filename, size, last_use):
+        self.spec_filename = spec_filename
+        self.size = size
+        self.last_use = last_use
+
+
+class LibspecGarbageCollector(object):
+    """
+    Usage:
+
+        gc = LibspecGarbageCollector(user_libspec_dir, content_dir)
+        gc.on_spec_used(spec_filename)
+        ...
+        gc.schedule(max_size_mb, max_age_days)  # Collect in a thread.
+        ...
+        gc.dispose()
+    """
+
+    def __init__(self, user_libspec_dir: str, content_dir: Optional[str] = None):
+        self._user_libspec_dir = user_libspec_dir
+        self._norm_user_libspec_dir = os.path.normcase(
+            os.path.realpath(os.path.abspath(user_libspec_dir))
+        )
+        self._content_dir = content_dir
+        self._last_use_index_filename = os.path.join(
+            user_libspec_dir, LAST_USE_INDEX_BASENAME
+        )
+
+        # spec basename -> last use time
+        self._last_use: Dict[str, float] = {}
+
+        self._condition = threading.Condition()
+        self._max_size_mb: float = DEFAULT_MAX_SIZE_MB
+        self._max_age_days: float = DEFAULT_MAX_AGE_DAYS
+        self._interval: float = DEFAULT_INTERVAL
+        self._collect_requested = False
+        self._disposed = False
+        self._thread: Optional[threading.Thread] = None
+
+    def on_spec_used(self, spec_filename: str) -> None:
+        """
+        Records that the given spec was used (should be cheap as it's called
+        whenever a library is requested).
+
+        :param spec_filename:
+            The canonical spec filename (see: `_norm_filename`).
+        """
+        if os.path.dirname(spec_filename) == self._norm_user_libspec_dir:
+            self._last_use[os.path.basename(spec_filename)] = time.time()
+
+    def schedule(
+        self, max_size_mb: float, max_age_days: float, interval: float = None
+    ) -> None:
+        """
+        Requests a garbage collection in the background thread (which is then
+        repeated at each interval).
+
+        :param max_size_mb:
+            The maximum size for the specs in the user libspec dir (0 means
+            no limit).
+        :param max_age_days:
+            Specs not used for longer than this are removed (0 means no limit).
+        """
+        with self._condition:
+            if self._disposed:
+                return
+            self._max_size_mb = max_size_mb
+            self._max_age_days = max_age_days
+            if interval is not None:
+                self._interval = interval
+            self._collect_requested = True
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="LibspecGarbageCollector", daemon=True
+                )
+                self._thread.start()
+            self._condition.notify_all()
+
+    def dispose(self) -> None:
+        with self._condition:
+            self._disposed = True
+            self._condition.notify_all()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if not self._collect_requested and not self._disposed:
+                    self._condition.wait(self._interval)
+                if self._disposed:
+                    return
+                self._collect_requested = False
+                max_size_mb = self._max_size_mb
+                max_age_days = self._max_age_days
+
+            try:
+                self.collect(max_size_mb, max_age_days)
+            except Exception:
+                log.exception("Error collecting libspecs garbage.")
+
+    def collect(
+        self, max_size_mb: float, max_age_days: float, now: float = None
+    ) -> List[str]:
+        """
+        :return:
+            The spec filenames which were removed.
+        """
+        if now is None:
+            now = time.time()
+
+        removed = []
+        if max_size_mb or max_age_days:
+            last_use = self._update_last_use_index()
+            entries = self._list_spec_entries(last_use)
+
+            # Least recently used first.
+            entries.sort(key=lambda entry: entry.last_use)
+            total_size = sum(entry.size for entry in entries)
+            max_size = max_size_mb * 1024 * 1024
+            max_age = max_age_days * 24 * 60 * 60
+
+            for entry in entries:
+                too_old = bool(max_age) and now - entry.last_use > max_age
+                too_big = bool(max_size) and total_size > max_size
+                if not too_old and not too_big:
+                    # Entries are sorted, so, the others are newer.
+                    break
+
+                if self._remove_spec(entry.spec_filename):
+                    removed.append(entry.spec_filename)
+                    total_size -= entry.size
+
+            if removed:
+                log.info("Removed %s unused libspecs.", len(removed))
+
+            removed_set = set(removed)
+            existing_names = set(
+                os.path.basename(entry.spec_filename)
+                for entry in entries
+                if entry.spec_filename not in removed_set
+            )
+            if set(last_use).difference(existing_names):
+                self._prune_last_use_index(existing_names)
+
+        self._remove_unreferenced_contents(now)
+        return removed
+
+    def _list_spec_entries(self, last_use: Dict[str, float]) -> List[_SpecEntry]:
+        entries = []
+        try:
+            dir_entries = list(os.scandir(self._user_libspec_dir))
+        except OSError:
+            return entries
+
+        for dir_entry in dir_entries:
+            name = dir_entry.name
+            if not name.lower().endswith(".libspec"):
+                continue
+            try:
+                stat = dir_entry.stat()
+            except OSError:
+                continue  # Removed in the meanwhile.
+
+            spec_filename = dir_entry.path
+            size = stat.st_size
+            for suffix in _SPEC_RELATED_SUFFIXES:
+                size += _get_size(spec_filename + suffix)
+            entries.append(
+                _SpecEntry(spec_filename, size, last_use.get(name, stat.st_mtime))
+            )
+        return entries
+
+    def _remove_spec(self, spec_filename: str) -> bool:
+        """
+        Removes the spec if its mutex can be obtained right away (if it's in
+        use it's kept for the next collection).
+        """
+        from robocorp_ls_core.system_mutex import SystemMutex
+        from robotframework_ls.impl.libspec_manager import _get_libspec_mutex_name
+        from robotframework_ls.impl.libspec_manager import _get_libspec_rw_mutex_name
+
+        mutex = SystemMutex(_get_libspec_mutex_name(spec_filename))
+        if not mutex.get_mutex_aquired():
+            return False
+
+        # The write lock is also needed (the spec may be being read or
+        # replaced by another process).
+        rw_mutex = SystemMutex(_get_libspec_rw_mutex_name(spec_filename))
+        if not rw_mutex.get_mutex_aquired():
+            mutex.release_mutex()
+            return False
+        try:
+            # Remove the related files first (the spec is the one tracked).
+            for filename in [
+                spec_filename + suffix for suffix in _SPEC_RELATED_SUFFIXES
+            ] + [spec_filename]:
+                try:
+                    os.remove(filename)
+                except FileNotFoundError:
+                    pass
+            return True
+        except OSError:
+            log.exception("Error removing libspec: %s", spec_filename)
+            return False
+        finally:
+            rw_mutex.release_mutex()
+            mutex.release_mutex()
+
+    def _remove_unreferenced_contents(self, now: float) -> None:
+        """
+        Removes the contents in the content store which aren't hard-linked
+        from any spec anymore.
+
+        Note: if the content store had to copy the contents to some spec
+        (because hard-links weren't available) the references can't be known
+        from the number of links, so, nothing is removed.
+        """
+        from robotframework_ls.impl.libspec_content_store import is_copy_mode
+
+        content_dir = self._content_dir
+        if not content_dir:
+            return
+        if is_copy_mode(content_dir):
+            return
+        try:
+            dir_entries = list(os.scandir(content_dir))
+        except OSError:
+            return
+
+        for dir_entry in dir_entries:
+            name = dir_entry.name
+            if not name.endswith(".libspec"):
+                continue
+            try:
+                stat = dir_entry.stat()
+                if stat.st_nlink > 1:
+                    continue
+                if now - stat.st_mtime < _UNREFERENCED_CONTENT_GRACE_TIME:
+                    continue
+                os.remove(dir_entry.path)
+            except OSError:
+                continue
+
+            # Remove the binary caches for any python/robot version.
+            for cache_entry in dir_entries:
+                if cache_entry.name.startswith(name) and cache_entry.name.endswith(
+                    ".cache"
+                ):
+                    try:
+                        os.remove(cache_entry.path)
+                    except OSError:
+                        pass
+
+    def _get_last_use_index_mutex_name(self):
+        from robocorp_ls_core.system_mutex import generate_mutex_name
+
+        return generate_mutex_name(self._last_use_index_filename, prefix="last_use_")
+
+    def _update_last_use_index(self) -> Dict[str, float]:
+        """
+        Merges the last use times in memory with the ones in the index.
+        """
+        from robocorp_ls_core.system_mutex import timed_acquire_mutex
+
+        last_use = self._last_use
+        self._last_use = {}
+        with timed_acquire_mutex(self._get_last_use_index_mutex_name()):
+            merged = self._load_last_use_index()
+            for name, use_time in last_use.items():
+                if use_time > merged.get(name, 0):
+                    merged[name] = use_time
+            if last_use:
+                self._write_last_use_index(merged)
+        return merged
+
+    def _prune_last_use_index(self, existing_names) -> None:
+        """
+        Removes the entries for specs which don't exist anymore from the index.
+        """
+        from robocorp_ls_core.system_mutex import timed_acquire_mutex
+
+        with timed_acquire_mutex(self._get_last_use_index_mutex_name()):
+            last_use = self._load_last_use_index()
+            self._write_last_use_index(
+                dict(
+                    (name, use_time)
+                    for name, use_time in last_use.items()
+                    if name in existing_names
+                )
+            )
+
+    def _load_last_use_index(self) -> Dict[str, float]:
+        import json
+
+        try:
+            with open(self._last_use_index_filename, "r") as stream:
+                return json.load(stream)
+        except FileNotFoundError:
+            return {}
+        except Exception:
+            log.exception("Error loading: %s", self._last_use_index_filename)
+            return {}
+
+    def _write_last_use_index(self, last_use: Dict[str, float]) -> None:
+        import json
+        from robocorp_ls_core.basic import create_tmp_filename
+
+        tmp_filename = create_tmp_filename(self._last_use_index_filename)
+        try:
+            with open(tmp_filename, "w") as stream:
+                json.dump(last_use, stream)
+            os.replace(tmp_filename, self._last_use_index_filename)
+        except Exception:
+            log.exception("Error writing: %s", self._last_use_index_filename)
@@ -4,13 +4,14 @@ import os
 import sys
 import tempfile
 import threading
-from typing import Dict, Generator, Optional
+from typing import Dict, Generator, Optional, Tuple
 import hashlib
-from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import Future
 
 from robotframework_ls.constants import NULL
 from robocorp_ls_core.robotframework_log import get_logger
 
+from robotframework_ls.impl.libdoc_worker_pool import LibdocWorkerPool
 from robotframework_ls.impl.protocols import ILibspecManager
 from robotframework_ls.impl.robot_specbuilder import LibraryDoc
 
@@ -20,6 +21,9 @@ log = get_logger(__name__)
 
 LibspecErrorEntry = namedtuple("LibspecError", "libname arguments alias uri")
 
+# Timeout to generate all the builtin libraries in a single worker call.
+_BUILTINS_GENERATION_TIMEOUT = 300
+
 
 def _normfile(filename):
     return os.path.abspath(os.path.normpath(os.path.normcase(filename)))
@@ -34,43 +38,146 @@ def _get_libspec_mutex_name(libspec_filename):
     return generate_mutex_name(libspec_filename, prefix="%s_" % (name,))
 
 
+def _get_libspec_rw_mutex_name(libspec_filename):
+    """
+    The mutex used to read a libspec (shared) or to write it (exclusive).
+
+    Note: this isn't the same mutex used while the libspec is generated: the
+    libspec is generated in a temporary file and the write lock is only held
+    while it's renamed to the final place (so, readers don't have to wait
+    for the generation).
+    """
+    from robocorp_ls_core.system_mutex import generate_mutex_name
+
+    libspec_filename = _norm_filename(libspec_filename)
+    basename = os.path.basename(libspec_filename)
+    name = os.path.splitext(basename)[0]
+    return generate_mutex_name(libspec_filename, prefix="%s_rw_" % (name,))
+
+
+def _get_tmp_libspec_filename(libspec_filename):
+    """
+    :return:
+        A new (unique) temporary filename in the same directory of the given
+        libspec (the file itself doesn't exist when this function returns).
+
+    Note: the name must be unique for each write: after it's added to the
+    content store the temporary file may be a hard link to a shared content
+    file (so, writing to a leftover temporary file would change the contents
+    of other specs).
+    """
+    from robocorp_ls_core.basic import create_tmp_filename
+
+    # Note: doesn't end with .libspec so that it's not tracked.
+    tmp_libspec_filename = create_tmp_filename(libspec_filename)
+    # libdoc always writes a new file (never through an existing link).
+    os.unlink(tmp_libspec_filename)
+    return tmp_libspec_filename
+
+
 def _get_additional_info_filename(spec_filename):
     additional_info_filename = os.path.join(spec_filename + ".m")
     return additional_info_filename
 
 
-def _load_library_doc_and_mtime(spec_filename, obtain_mutex=True):
+def _load_library_doc_and_mtime(
+    spec_filename, obtain_mutex=True, use_binary_cache=False
+):
     """
     :param obtain_mutex:
         Should be False if this is part of a bigger operation that already
-        has the spec_filename mutex.
+        has the spec_filename write lock (otherwise a read lock is obtained,
+        which may be held by any number of readers in parallel).
+
+    :param use_binary_cache:
+        If True, the LibraryDoc is loaded from the binary cache beside the spec
+        (if available and in sync) and the cache is written after the spec
+        is parsed. Should only be used for specs in the internal directories.
+        When loaded from the binary cache, the documentation of the keywords
+        is only read when it's first requested.
     """
     from robotframework_ls.impl import robot_specbuilder
+    from robotframework_ls.impl import libspec_cache
     from robocorp_ls_core.system_mutex import timed_acquire_mutex
 
     if obtain_mutex:
-        ctx = timed_acquire_mutex(_get_libspec_mutex_name(spec_filename))
+        ctx = timed_acquire_mutex(
+            _get_libspec_rw_mutex_name(spec_filename), shared=True
+        )
     else:
         ctx = NULL
     with ctx:
-        # We must load it with a mutex to avoid conflicts between generating/reading.
-        builder = robot_specbuilder.SpecDocBuilder()
+        # We must load it with a read lock to avoid conflicts with writers.
         try:
-            mtime = os.path.getmtime(spec_filename)
-            libdoc = builder.build(spec_filename)
-            return libdoc, mtime
+            stat = os.stat(spec_filename)
+            libdoc = None
+            if use_binary_cache:
+                robot_version = LibspecManager.get_robot_version()
+                libdoc = libspec_cache.load_library_doc(
+                    spec_filename, stat, robot_version, lazy_docs=True
+                )
+
+            if libdoc is None:
+                builder = robot_specbuilder.SpecDocBuilder()
+                libdoc = builder.build(spec_filename)
+                if use_binary_cache:
+                    libspec_cache.store_library_doc(
+                        spec_filename, stat, robot_version, libdoc
+                    )
+
+            return libdoc, stat.st_mtime
         except Exception:
             log.exception(
                 "Error when loading spec info from: %s", spec_filename)
             return None
 
 
-def _load_lib_info(canonical_spec_filename, can_regenerate):
-    libdoc_and_mtime = _load_library_doc_and_mtime(canonical_spec_filename)
+def _load_lib_info(
+    canonical_spec_filename, can_regenerate, additional_info=None, content_store=None
+):
+    if can_regenerate and content_store is not None:
+        # If the spec is in the content store, share the LibraryDoc with other
+        # specs with the same content.
+        if additional_info is None:
+            additional_info = _load_spec_filename_additional_info(
+                canonical_spec_filename
+            )
+        content_hash = additional_info.get(_CONTENT_HASH)
+        if content_hash:
+            libdoc = content_store.load_library_doc(content_hash)
+            mtime = _get_mtime_seconds(canonical_spec_filename)
+            if libdoc is not None and mtime is not None:
+                return _LibInfo(
+                    libdoc,
+                    mtime,
+                    canonical_spec_filename,
+                    can_regenerate,
+                    additional_info,
+                )
+
+    libdoc_and_mtime = _load_library_doc_and_mtime(
+        canonical_spec_filename, use_binary_cache=can_regenerate
+    )
     if libdoc_and_mtime is None:
         return None
     libdoc, mtime = libdoc_and_mtime
-    return _LibInfo(libdoc, mtime, canonical_spec_filename, can_regenerate)
+    return _LibInfo(
+        libdoc, mtime, canonical_spec_filename, can_regenerate, additional_info
+    )
+
+
+def _read_libspec_name(spec_filename) -> Optional[str]:
+    """
+    Provides the library name from the `keywordspec` element of the given spec
+    without parsing the remainder of the file.
+    """
+    from robotframework_ls.impl.robot_specbuilder import SpecDocBuilder
+
+    try:
+        return SpecDocBuilder().build(spec_filename, header_only=True).name
+    except Exception:
+        log.exception("Error when reading library name from: %s", spec_filename)
+    return None
 
 
 _IS_BUILTIN = "is_builtin"
@@ -78,9 +185,10 @@ _ARGUMENTS = "arguments"
 _ALIAS = "alias"
 _SOURCE_TO_MTIME = "source_to_mtime"
 _UNABLE_TO_LOAD = "unable_to_load"
+_CONTENT_HASH = "content_hash"
 
 
-def _create_updated_source_to_mtime(library_doc):
+def _get_library_doc_sources(library_doc):
     sources = set()
 
     source = library_doc.source
@@ -91,9 +199,33 @@ def _create_updated_source_to_mtime(library_doc):
         source = keyword.source
         if source is not None:
             sources.add(source)
+    return sources
+
+
+def _create_updated_source_to_mtime(
+    library_doc, source_mtime_cache=None, sources=None, refresh=False
+):
+    """
+    :param _SourceMtimeCache source_mtime_cache:
+        If given, the mtimes are gotten from the cache (or the cache is
+        updated if `refresh` is True).
+
+    :param sources:
+        The sources of the library doc (if already computed).
+    """
+    if sources is None:
+        sources = _get_library_doc_sources(library_doc)
 
     source_to_mtime = {}
     for source in sources:
+        if source_mtime_cache is not None:
+            normfile, mtime = source_mtime_cache.get_normfile_and_mtime(
+                source, refresh=refresh
+            )
+            if mtime is not None:
+                source_to_mtime[normfile] = mtime
+            continue
+
         try:
             # i.e.: get it before normalizing (but leave the cache key normalized).
             # This is because even on windows the file-system may end up being
@@ -106,26 +238,151 @@ def _create_updated_source_to_mtime(library_doc):
     return source_to_mtime
 
 
-def _create_additional_info(spec_filename, is_builtin, obtain_mutex=True, arguments=None, alias=None):
+class _SourceMtimeCache(object):
+    """
+    Caches the mtime of the sources of libraries (used to check whether a
+    libspec is still in sync with its sources without hitting the
+    filesystem).
+
+    The directory of each source is watched for changes and a change
+    invalidates the related entries. When the directory can't be watched,
+    the entry is re-checked if it's older than `UNWATCHED_TIMEOUT` seconds.
+    """
+
+    UNWATCHED_TIMEOUT = 2.0
+
+    def __init__(self, observer):
+        self._observer = observer
+        self._lock = threading.Lock()
+
+        # source -> (normfile, mtime, checked_at, watched)
+        self._source_to_info: Dict[str, tuple] = {}
+        # normfile -> set(source)
+        self._normfile_to_sources: Dict[str, set] = {}
+        # normalized dir -> watch (None if it couldn't be watched)
+        self._dir_to_watch: Dict[str, object] = {}
+        # normalized dir -> set(normfile)
+        self._dir_to_normfiles: Dict[str, set] = {}
+        self._disposed = False
+
+    def get_normfile_and_mtime(self, source, refresh=False):
+        """
+        :return tuple(str, Optional[float]):
+            The normalized source and its mtime (None if it couldn't be
+            obtained).
+        """
+        import time
+
+        if not refresh:
+            info = self._source_to_info.get(source)
+            if info is not None:
+                normfile, mtime, checked_at, watched = info
+                if watched or time.time() - checked_at < self.UNWATCHED_TIMEOUT:
+                    return normfile, mtime
+
+        normfile = _normfile(source)
+        # Watch before getting the mtime (so that we don't miss a change
+        # between the stat and the watch).
+        watched = self._watch_dir(os.path.dirname(normfile))
+        checked_at = time.time()
+        try:
+            # i.e.: get it before normalizing (but leave the cache key normalized).
+            # This is because even on windows the file-system may end up being
+            # case-dependent on some cases.
+            mtime = os.path.getmtime(source)
+        except Exception:
+            log.exception("Unable to load source for file: %s", source)
+            mtime = None
+
+        with self._lock:
+            self._source_to_info[source] = (normfile, mtime, checked_at, watched)
+            self._normfile_to_sources.setdefault(normfile, set()).add(source)
+            self._dir_to_normfiles.setdefault(os.path.dirname(normfile), set()).add(
+                normfile
+            )
+        return normfile, mtime
+
+    def _watch_dir(self, normdir):
+        with self._lock:
+            if normdir in self._dir_to_watch:
+                return self._dir_to_watch[normdir] is not None
+
+            watch = None
+            if not self._disposed:
+                from robocorp_ls_core.watchdog_wrapper import PathInfo
+
+                try:
+                    watch = self._observer.notify_on_any_change(
+                        [PathInfo(normdir, recursive=False)], self._on_change
+                    )
+                except Exception:
+                    log.info("Unable to track changes in: %s", normdir)
+            self._dir_to_watch[normdir] = watch
+            return watch is not None
+
+    def _on_change(self, path):
+        # Note: called directly from the observer thread (so that the cache is
+        # invalidated as soon as possible).
+        normpath = _normfile(path)
+        with self._lock:
+            normfiles = [normpath]
+            # If a watched directory is removed/moved, invalidate its contents.
+            normfiles.extend(self._dir_to_normfiles.pop(normpath, ()))
+            for normfile in normfiles:
+                for source in self._normfile_to_sources.pop(normfile, ()):
+                    self._source_to_info.pop(source, None)
+
+    def dispose(self):
+        with self._lock:
+            self._disposed = True
+            watches = list(self._dir_to_watch.values())
+            self._dir_to_watch.clear()
+            self._dir_to_normfiles.clear()
+            self._source_to_info.clear()
+            self._normfile_to_sources.clear()
+
+        for watch in watches:
+            if watch is not None:
+                watch.stop_tracking()
+
+
+def _create_additional_info(
+    spec_filename,
+    is_builtin,
+    obtain_mutex=True,
+    arguments=None,
+    alias=None,
+    source_mtime_cache=None,
+    content_hash=None,
+    content_store=None,
+):
     try:
         additional_info = {_IS_BUILTIN: is_builtin,
                            _ARGUMENTS: arguments, _ALIAS: alias}
+        if content_hash:
+            additional_info[_CONTENT_HASH] = content_hash
+
         if is_builtin:
             # For builtins we don't have to check the mtime
             # (on a new version we update the folder).
             return additional_info
 
-        library_doc_and_mtime = _load_library_doc_and_mtime(
-            spec_filename, obtain_mutex=obtain_mutex
-        )
-        if library_doc_and_mtime is None:
-            additional_info[_UNABLE_TO_LOAD] = True
-            return additional_info
+        library_doc = None
+        if content_hash and content_store is not None:
+            library_doc = content_store.load_library_doc(content_hash)
+
+        if library_doc is None:
+            library_doc_and_mtime = _load_library_doc_and_mtime(
+                spec_filename, obtain_mutex=obtain_mutex, use_binary_cache=True
+            )
+            if library_doc_and_mtime is None:
+                additional_info[_UNABLE_TO_LOAD] = True
+                return additional_info
 
-        library_doc = library_doc_and_mtime[0]
+            library_doc = library_doc_and_mtime[0]
 
         additional_info[_SOURCE_TO_MTIME] = _create_updated_source_to_mtime(
-            library_doc)
+            library_doc, source_mtime_cache, refresh=True)
         return additional_info
 
     except BaseException as e:
@@ -134,6 +391,20 @@ def _create_additional_info(spec_filename, is_builtin, obtain_mutex=True, argume
         return {}
 
 
+def _get_mtime(filename):
+    try:
+        return os.stat(filename).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _get_mtime_seconds(filename):
+    try:
+        return os.stat(filename).st_mtime
+    except OSError:
+        return None
+
+
 def _load_spec_filename_additional_info(spec_filename):
     """
     Loads additional information given a spec filename.
@@ -151,19 +422,85 @@ def _load_spec_filename_additional_info(spec_filename):
         return {}
 
 
-def _dump_spec_filename_additional_info(spec_filename, is_builtin, obtain_mutex=True, arguments=None, alias=None):
+def _dump_spec_filename_additional_info(
+    spec_filename,
+    is_builtin,
+    obtain_mutex=True,
+    arguments=None,
+    alias=None,
+    source_mtime_cache=None,
+    content_hash=None,
+    content_store=None,
+):
     """
     Creates a filename with additional information not directly available in the
     spec.
     """
     import json
+    from robocorp_ls_core.basic import create_tmp_filename
 
     source_to_mtime = _create_additional_info(
-        spec_filename, is_builtin, obtain_mutex=obtain_mutex, arguments=arguments, alias=alias
+        spec_filename,
+        is_builtin,
+        obtain_mutex=obtain_mutex,
+        arguments=arguments,
+        alias=alias,
+        source_mtime_cache=source_mtime_cache,
+        content_hash=content_hash,
+        content_store=content_store,
     )
     additional_info_filename = _get_additional_info_filename(spec_filename)
-    with open(additional_info_filename, "w") as stream:
+    tmp_filename = create_tmp_filename(additional_info_filename)
+    with open(tmp_filename, "w") as stream:
         json.dump(source_to_mtime, stream, indent=2, sort_keys=True)
+    os.replace(tmp_filename, additional_info_filename)
+
+
+def _commit_libspec(tmp_libspec_filename, libspec_filename, is_builtin, **kwargs):
+    """
+    Moves a libspec generated in a temporary file to its final place and
+    updates its additional info.
+
+    The write lock is held only during this operation (readers don't need to
+    wait while the libspec is generated and never see a partially written
+    libspec or a libspec without the related additional info).
+
+    :param kwargs:
+        Passed on to `_dump_spec_filename_additional_info`.
+    """
+    from robocorp_ls_core.system_mutex import timed_acquire_mutex
+    from robotframework_ls.impl import libspec_cache
+
+    with timed_acquire_mutex(_get_libspec_rw_mutex_name(libspec_filename)):
+        if os.path.exists(libspec_filename) and os.path.samefile(
+            tmp_libspec_filename, libspec_filename
+        ):
+            # i.e.: an identical spec was regenerated and both are links to the
+            # same content file (in which case rename() is a no-op and the
+            # temporary file would be kept).
+            os.unlink(tmp_libspec_filename)
+        else:
+            os.replace(tmp_libspec_filename, libspec_filename)
+        libspec_cache.remove_library_doc_cache(libspec_filename)
+        _dump_spec_filename_additional_info(
+            libspec_filename, is_builtin=is_builtin, obtain_mutex=False, **kwargs
+        )
+
+
+def _remove_libspec(libspec_filename):
+    """
+    Removes the libspec and its related files (holding its write lock).
+    """
+    from robocorp_ls_core.system_mutex import timed_acquire_mutex
+    from robotframework_ls.impl import libspec_cache
+
+    with timed_acquire_mutex(_get_libspec_rw_mutex_name(libspec_filename)):
+        for filename in (libspec_filename, _get_additional_info_filename(libspec_filename)):
+            try:
+                os.remove(filename)
+            except FileNotFoundError:
+                pass
+        libspec_cache.remove_library_doc_cache(libspec_filename)
 
 
 class _LibInfo(object):
@@ -174,9 +511,12 @@ class _LibInfo(object):
         "_additional_info",
         "_invalid",
         "_can_regenerate",
+        "_sources",
     ]
 
-    def __init__(self, library_doc, mtime, spec_filename, can_regenerate):
+    def __init__(
+        self, library_doc, mtime, spec_filename, can_regenerate, additional_info=None
+    ):
         """
         :param library_doc:
         :param mtime:
@@ -185,6 +525,8 @@ class _LibInfo(object):
             False means that the information from this file can't really be
             regenerated (i.e.: this is a spec file from a library or created
             by the user).
+        :param dict additional_info:
+            The additional info for the spec (if it was already loaded).
         """
         assert library_doc
         assert mtime
@@ -195,8 +537,9 @@ class _LibInfo(object):
 
         self._can_regenerate = can_regenerate
         self._canonical_spec_filename = spec_filename
-        self._additional_info = None
+        self._additional_info = additional_info
         self._invalid = False
+        self._sources = None
 
     @property
     def additional_info(self):
@@ -205,6 +548,10 @@ class _LibInfo(object):
                 self._canonical_spec_filename)
         return self._additional_info
 
+    @property
+    def canonical_spec_filename(self):
+        return self._canonical_spec_filename
+
     @property
     def alias(self):
         return self.additional_info.get(_ALIAS, None)
@@ -213,8 +560,11 @@ class _LibInfo(object):
     def arguments(self):
         return tuple(self.additional_info.get(_ARGUMENTS, None) or [])
 
-    def verify_sources_sync(self, arguments, alias):
+    def verify_sources_sync(self, arguments, alias, source_mtime_cache=None):
         """
+        :param _SourceMtimeCache source_mtime_cache:
+            If given, used to get the mtime of the sources.
+
         :return bool:
             True if everything is ok and this library info can be used. Otherwise,
             the spec file and the _LibInfo must be recreated.
@@ -237,8 +587,13 @@ class _LibInfo(object):
                 # Nothing to validate...
                 return True
 
+            sources = self._sources
+            if sources is None:
+                sources = self._sources = _get_library_doc_sources(self.library_doc)
+
             updated_source_to_mtime = _create_updated_source_to_mtime(
-                self.library_doc)
+                self.library_doc, source_mtime_cache, sources=sources
+            )
             if source_to_mtime != updated_source_to_mtime:
                 log.info(
                     "Library %s is invalid. Current source to mtime:\n%s\nChanged from:\n%s"
@@ -259,15 +614,223 @@ class _LibInfo(object):
         return True
 
 
+def _get_libname_lower(libname):
+    """
+    :return:
+        The lowercase library name (without the extension/directory if it's
+        a path to the library).
+    """
+    libname_lower = libname.lower()
+    if libname_lower.endswith((".py", ".class", ".java")):
+        libname_lower = os.path.splitext(libname_lower)[0]
+
+    if "/" in libname_lower or "\\" in libname_lower:
+        libname_lower = os.path.basename(libname_lower)
+    return libname_lower
+
+
 def _norm_filename(path):
     return os.path.normcase(os.path.realpath(os.path.abspath(path)))
 
 
+# Extensions of the files whose changes are tracked in the folders with specs.
+_WATCHED_EXTENSIONS = (".libspec", ".py", ".class", ".java")
+
+
+# Backoff for retrying the creation of libraries which failed (doubled at
+# each consecutive failure).
+_FAILURE_BASE_TTL = 30.0
+_FAILURE_MAX_TTL = 60.0 * 60.0
+
+
+def _get_import_candidates(libname, search_paths):
+    """
+    :return tuple(set(str), set(str)):
+        The files and the directories (normalized) whose creation/change may
+        change the result of importing the given library from the given search
+        paths.
+    """
+    files = set()
+    dirs = set()
+    parts = [part for part in libname.split(".") if part]
+    for search_path in search_paths:
+        if not search_path:
+            continue
+        base = _normfile(search_path)
+        for i in range(1, len(parts) + 1):
+            module_path = os.path.join(base, *parts[:i])
+            files.add(module_path + ".py")
+            files.add(os.path.join(module_path, "__init__.py"))
+        if parts:
+            # Any change inside the (top-level) package may fix it.
+            dirs.add(os.path.join(base, parts[0]))
+    return files, dirs
+
+
+class _FailureEntry(object):
+
+    __slots__ = ["reason", "timestamp", "failures", "ttl", "files", "dirs"]
+
+    def __init__(self, reason, timestamp, failures, ttl, files, dirs):
+        self.reason = reason
+        self.timestamp = timestamp
+        self.failures = failures
+        self.ttl = ttl
+        self.files = files
+        self.dirs = dirs
+
+    def is_expired(self, now):
+        return now - self.timestamp >= self.ttl
+
+
+class _LibspecFailuresCache(object):
+    """
+    Keeps the libraries which couldn't be created so that the creation isn't
+    retried on each request.
+
+    Each entry keeps the failure reason, when it failed and the paths which
+    the import could have used. An entry is removed when one of those paths
+    changes and expires after a ttl (which is doubled at each consecutive
+    failure, so, transient errors are retried without retrying libraries which
+    always fail too often).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key_to_entry: Dict[tuple, _FailureEntry] = {}
+
+        # Consecutive failures for keys whose entry expired (kept to compute
+        # the backoff if it fails again).
+        self._key_to_failures: Dict[tuple, int] = {}
+
+        # normalized path -> set(cache keys)
+        self._file_to_keys: Dict[str, set] = {}
+        self._dir_to_keys: Dict[str, set] = {}
+
+    def __contains__(self, cache_key) -> bool:
+        return self.get(cache_key) is not None
+
+    def __len__(self) -> int:
+        return len(self._key_to_entry)
+
+    def get(self, cache_key, now=None) -> Optional[_FailureEntry]:
+        """
+        :return:
+            The failure entry or None if there's no entry or it expired (in
+            which case the creation should be retried).
+        """
+        entry = self._key_to_entry.get(cache_key)
+        if entry is None:
+            return None
+
+        if now is None:
+            import time
+
+            now = time.time()
+        if entry.is_expired(now):
+            with self._lock:
+                if self._key_to_entry.get(cache_key) is entry:
+                    self._discard(cache_key)
+                    self._key_to_failures[cache_key] = entry.failures
+            return None
+        return entry
+
+    def add(self, cache_key, reason=None, files=(), dirs=(), now=None) -> _FailureEntry:
+        """
+        :param cache_key:
+            A tuple where the first item is the library name.
+        :param files:
+            The (normalized) files which may change the result of the import.
+        :param dirs:
+            The (normalized) dirs in which any change may change the result of
+            the import.
+        """
+        if now is None:
+            import time
+
+            now = time.time()
+        with self._lock:
+            failures = self._key_to_failures.pop(cache_key, 0) + 1
+            ttl = min(_FAILURE_BASE_TTL * (2 ** (failures - 1)), _FAILURE_MAX_TTL)
+
+            self._discard(cache_key)
+            entry = self._key_to_entry[cache_key] = _FailureEntry(
+                reason, now, failures, ttl, frozenset(files), frozenset(dirs)
+            )
+            for filename in entry.files:
+                self._file_to_keys.setdefault(filename, set()).add(cache_key)
+            for dirname in entry.dirs:
+                self._dir_to_keys.setdefault(dirname, set()).add(cache_key)
+            return entry
+
+    def on_path_changed(self, path) -> bool:
+        """
+        Removes the entries whose import could be affected by a change in the
+        given path.
+
+        :return:
+            Whether some entry was removed.
+        """
+        if not self._key_to_entry:
+            return False
+
+        path = _normfile(path)
+        with self._lock:
+            keys = set(self._file_to_keys.get(path, ()))
+            if self._dir_to_keys:
+                dirname = os.path.dirname(path)
+                while True:
+                    keys.update(self._dir_to_keys.get(dirname, ()))
+                    parent = os.path.dirname(dirname)
+                    if parent == dirname:
+                        break
+                    dirname = parent
+
+            for cache_key in keys:
+                # The change may fix it: retry without backoff.
+                self._discard(cache_key)
+                self._key_to_failures.pop(cache_key, None)
+        return bool(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._key_to_entry = {}
+            self._key_to_failures = {}
+            self._file_to_keys = {}
+            self._dir_to_keys = {}
+
+    def _discard(self, cache_key) -> None:
+        entry = self._key_to_entry.pop(cache_key, None)
+        if entry is None:
+            return
+        for path_to_keys, paths in (
+            (self._file_to_keys, entry.files),
+            (self._dir_to_keys, entry.dirs),
+        ):
+            for path in paths:
+                keys = path_to_keys.get(path)
+                if keys is not None:
+                    keys.discard(cache_key)
+                    if not keys:
+                        del path_to_keys[path]
+
+
 class _FolderInfo(object):
-    def __init__(self, folder_path, recursive):
+    def __init__(self, folder_path, recursive, excludes=None):
+        from robotframework_ls.impl.libspec_discovery import LibspecDirScanner
+
         self.folder_path = folder_path
         self.recursive = recursive
+        self._scanner = LibspecDirScanner(folder_path, recursive, excludes)
         self.libspec_canonical_filename_to_info = {}
+
+        # canonical filename -> (mtime, library name) (the name is read from the
+        # spec header without loading the whole spec).
+        self._libspec_canonical_filename_to_name_info = {}
+
+        # lowercase library name -> tuple(canonical filenames)
+        self.libname_lower_to_canonical_filenames = {}
+
         self._watch = NULL
         self._lock = threading.Lock()
 
@@ -291,10 +854,14 @@ class _FolderInfo(object):
                 from robocorp_ls_core.watchdog_wrapper import PathInfo
 
                 folder_path = self.folder_path
-                self._watch = observer.notify_on_any_change(
+                # Only changes in specs and in library sources (which may fix
+                # a library which failed to be created) are relevant.
+                self._watch = observer.notify_on_extensions_change(
                     [PathInfo(folder_path, recursive=self.recursive)],
+                    _WATCHED_EXTENSIONS,
                     notifier.on_change,
                     (self._on_change_spec,),
+                    exclude_dirs=self._scanner.excludes,
                 )
 
     def _on_change_spec(self, spec_file):
@@ -310,15 +877,35 @@ class _FolderInfo(object):
                 libspec_canonical_filename_to_info.pop(spec_file_key, None)
 
             self.libspec_canonical_filename_to_info = libspec_canonical_filename_to_info
+            self._update_libname_index(changed=(spec_file_key,))
+
+    def on_spec_committed(self, spec_file):
+        """
+        Drops the info loaded for the given spec (if tracked) so that it's
+        loaded again.
+
+        Note: when an identical spec is regenerated it's still a link to the
+        same content file, so, its mtime doesn't change (and the loaded info,
+        which may be marked as invalid, would be kept otherwise).
+        """
+        with self._lock:
+            spec_file_key = _norm_filename(spec_file)
+            if spec_file_key in self.libspec_canonical_filename_to_info:
+                libspec_canonical_filename_to_info = (
+                    self.libspec_canonical_filename_to_info.copy()
+                )
+                libspec_canonical_filename_to_info[spec_file_key] = None
+                self.libspec_canonical_filename_to_info = (
+                    libspec_canonical_filename_to_info
+                )
 
     def synchronize(self):
         with self._lock:
             try:
                 self.libspec_canonical_filename_to_info = self._collect_libspec_info(
-                    [self.folder_path],
-                    self.libspec_canonical_filename_to_info,
-                    recursive=self.recursive,
+                    self.libspec_canonical_filename_to_info
                 )
+                self._update_libname_index()
             except Exception:
                 log.exception("Error when synchronizing: %s", self.folder_path)
 
@@ -328,24 +915,66 @@ class _FolderInfo(object):
             self._watch = NULL
             watch.stop_tracking()
             self.libspec_canonical_filename_to_info = {}
+            self._libspec_canonical_filename_to_name_info = {}
+            self.libname_lower_to_canonical_filenames = {}
 
-    def _collect_libspec_info(self, folders, old_libspec_filename_to_info, recursive):
-        seen_libspec_files = set()
-        if recursive:
-            for folder in folders:
-                if os.path.isdir(folder):
-                    for root, _dirs, files in os.walk(folder):
-                        for filename in files:
-                            if filename.lower().endswith(".libspec"):
-                                seen_libspec_files.add(
-                                    os.path.join(root, filename))
-        else:
-            for folder in folders:
-                if os.path.isdir(folder):
-                    for filename in os.listdir(folder):
-                        if filename.lower().endswith(".libspec"):
-                            seen_libspec_files.add(
-                                os.path.join(folder, filename))
+    def _update_libname_index(self, changed=None):
+        """
+        Updates the index from the library name to the spec files providing it.
+
+        :param changed:
+            If given, only the name of those files is re-read (otherwise the
+            mtime of all the tracked files is checked to know whether the name
+            needs to be re-read).
+        """
+        old_name_info = self._libspec_canonical_filename_to_name_info
+        new_name_info = {}
+        for filename in self.libspec_canonical_filename_to_info:
+            name_info = old_name_info.get(filename)
+            if changed is not None and filename not in changed:
+                if name_info is not None:
+                    new_name_info[filename] = name_info
+                    continue
+
+            try:
+                mtime = os.path.getmtime(filename)
+            except Exception:
+                # It was deleted in the meanwhile...
+                continue
+
+            if name_info is None or name_info[0] != mtime:
+                name_info = (mtime, _read_libspec_name(filename))
+            new_name_info[filename] = name_info
+
+        libname_lower_to_canonical_filenames = {}
+        for filename, (_mtime, name) in new_name_info.items():
+            if name:
+                key = name.lower()
+                libname_lower_to_canonical_filenames[key] = (
+                    libname_lower_to_canonical_filenames.get(key, ()) + (filename,)
+                )
+
+        # Always set as a whole (to avoid racing conditions).
+        self._libspec_canonical_filename_to_name_info = new_name_info
+        self.libname_lower_to_canonical_filenames = libname_lower_to_canonical_filenames
+
+    def iter_library_names(self):
+        for _mtime, name in self._libspec_canonical_filename_to_name_info.values():
+            if name:
+                yield name
+
+    def set_excludes(self, excludes):
+        with self._lock:
+            self._scanner.set_excludes(excludes)
+
+            # The watch must be restarted to use the new excludes.
+            watch = self._watch
+            self._watch = NULL
+            watch.stop_tracking()
+
+    def _collect_libspec_info(self, old_libspec_filename_to_info):
+        # Note: only the directories changed since the last scan are listed.
+        seen_libspec_files = self._scanner.scan()
 
         new_libspec_filename_to_info = {}
 
@@ -368,10 +997,6 @@ class _FolderInfo(object):
         return new_libspec_filename_to_info
 
 
-def dummy_process():
-    pass
-
-
 class LibspecManager(ILibspecManager):
     """
     Used to manage the libspec files.
@@ -386,8 +1011,13 @@ class LibspecManager(ILibspecManager):
     keywords that are available from those (properly caching data as needed).
     """
 
+    _robot_version: Optional[str] = None
+
     @classmethod
     def get_robot_version(cls):
+        v = LibspecManager._robot_version
+        if v is not None:
+            return v
         try:
             import robot
 
@@ -395,6 +1025,7 @@ class LibspecManager(ILibspecManager):
         except BaseException:
             log.exception("Unable to get robot version.")
             v = "unknown"
+        LibspecManager._robot_version = v
         return v
 
     @classmethod
@@ -433,15 +1064,28 @@ class LibspecManager(ILibspecManager):
             internal_libspec_dir or cls.get_internal_libspec_dir(), "builtins"
         )
 
-    def __init__(self, builtin_libspec_dir=None, user_libspec_dir=None):
+    def __init__(
+        self, builtin_libspec_dir=None, user_libspec_dir=None, content_libspec_dir=None
+    ):
         """
         :param __internal_libspec_dir__:
             Only to be used in tests (to regenerate the builtins)!
+
+        :param content_libspec_dir:
+            The directory where the contents of the generated specs are
+            stored (shared among interpreters by default).
         """
+        from robotframework_ls.impl.libspec_content_store import LibspecContentStore
+        from robotframework_ls.impl.libspec_gc import LibspecGarbageCollector
 
         from robocorp_ls_core import watchdog_wrapper
 
-        self._libspec_failures_cache: Dict[tuple, bool] = {}
+        self._libspec_failures_cache = _LibspecFailuresCache()
+
+        # Libspecs currently being generated in this process:
+        # (libname, arguments, additional_path) -> Future(bool)
+        self._libspec_generation_lock = threading.Lock()
+        self._libspec_generation_futures: Dict[tuple, Future] = {}
 
         self._main_thread = threading.current_thread()
 
@@ -451,6 +1095,12 @@ class LibspecManager(ILibspecManager):
             self._on_file_changed, timeout=0.5
         )
 
+        self._source_mtime_cache = _SourceMtimeCache(self._observer)
+
+        # normfile -> mtime of the sources which already caused a libspec to
+        # be generated in a fresh worker (see: `_get_changed_sources`).
+        self._fresh_worker_source_to_mtime: Dict[str, float] = {}
+
         self._root_uri = None
 
         self._libspec_dir = self.get_internal_libspec_dir()
@@ -465,6 +1115,17 @@ class LibspecManager(ILibspecManager):
         log.debug("User libspec dir: %s", self._user_libspec_dir)
         log.debug("Builtins libspec dir: %s", self._builtins_libspec_dir)
 
+        self._content_store = LibspecContentStore(
+            content_libspec_dir
+            or os.path.join(os.path.dirname(self._libspec_dir), "content"),
+            self.get_robot_version(),
+        )
+        log.debug("Content libspec dir: %s", self._content_store.content_dir)
+
+        self._libspec_gc = LibspecGarbageCollector(
+            self._user_libspec_dir, self._content_store.content_dir
+        )
+
         try:
             os.makedirs(self._user_libspec_dir)
         except BaseException:
@@ -479,6 +1140,10 @@ class LibspecManager(ILibspecManager):
         self.libspec_errors: Dict[LibspecErrorEntry, str] = {}
         self.libspec_warnings: Dict[LibspecErrorEntry, str] = {}
 
+        # Globs for directories skipped when searching for specs in the
+        # workspace/additional pythonpath folders.
+        self._libspec_discovery_excludes = ()
+
         # Spec info found in the workspace
         self._workspace_folder_uri_to_folder_info = {}
         self._additional_pythonpath_folder_to_folder_info = {}
@@ -505,14 +1170,9 @@ class LibspecManager(ILibspecManager):
         # Must be set from the outside world when needed.
         self.config = None
 
-        self.process_pool = ProcessPoolExecutor()
-
-        # we have to submit a dummy process to start the process pool,
-        # because it does not start correctly if we do it from another
-        # thread
-        self.process_pool.submit(dummy_process).result()
-
-        self.thread_pool = ThreadPoolExecutor(thread_name_prefix="libspec_manager_")
+        # The worker processes are only started when a libspec must be
+        # generated (and are recycled/shut down when not needed).
+        self.libdoc_worker_pool = LibdocWorkerPool()
 
         log.debug("Generating builtin libraries.")
         self._gen_builtin_libraries()
@@ -521,8 +1181,10 @@ class LibspecManager(ILibspecManager):
         log.debug("Finished initializing LibspecManager.")
 
     def __del__(self):
-        self.thread_pool.shutdown(False, cancel_futures=True)
-        self.process_pool.shutdown(False, cancel_futures=True)
+        # Note: may not be there if the initialization failed.
+        libdoc_worker_pool = getattr(self, "libdoc_worker_pool", None)
+        if libdoc_worker_pool is not None:
+            libdoc_worker_pool.dispose()
 
     def _check_in_main_thread(self):
         curr_thread = threading.current_thread()
@@ -547,11 +1209,61 @@ class LibspecManager(ILibspecManager):
     def config(self, config):
         self._check_in_main_thread()
         from robotframework_ls.impl.robot_lsp_constants import OPTION_ROBOT_PYTHONPATH
+        from robotframework_ls.impl.robot_lsp_constants import (
+            OPTION_ROBOT_LIBSPEC_WORKERS_MAX,
+            OPTION_ROBOT_LIBSPEC_WORKERS_MAX_TASKS_PER_CHILD,
+            OPTION_ROBOT_LIBSPEC_WORKERS_IDLE_TIMEOUT,
+            OPTION_ROBOT_LIBSPEC_CACHE_MAX_SIZE_MB,
+            OPTION_ROBOT_LIBSPEC_CACHE_MAX_AGE_DAYS,
+            OPTION_ROBOT_LIBSPEC_DISCOVERY_EXCLUDE,
+        )
+        from robotframework_ls.impl import libdoc_worker_pool
+        from robotframework_ls.impl import libspec_gc
 
         self._config = config
         existing_entries = set(
             self._additional_pythonpath_folder_to_folder_info.keys())
         if config is not None:
+            pool = self.libdoc_worker_pool
+            pool.max_workers = config.get_setting(
+                OPTION_ROBOT_LIBSPEC_WORKERS_MAX, int, 0
+            )
+            pool.max_tasks_per_child = config.get_setting(
+                OPTION_ROBOT_LIBSPEC_WORKERS_MAX_TASKS_PER_CHILD,
+                int,
+                libdoc_worker_pool.DEFAULT_MAX_TASKS_PER_CHILD,
+            )
+            pool.idle_timeout = config.get_setting(
+                OPTION_ROBOT_LIBSPEC_WORKERS_IDLE_TIMEOUT,
+                float,
+                libdoc_worker_pool.DEFAULT_IDLE_TIMEOUT,
+            )
+
+            # Unused specs are removed in a background thread.
+            self._libspec_gc.schedule(
+                config.get_setting(
+                    OPTION_ROBOT_LIBSPEC_CACHE_MAX_SIZE_MB,
+                    float,
+                    libspec_gc.DEFAULT_MAX_SIZE_MB,
+                ),
+                config.get_setting(
+                    OPTION_ROBOT_LIBSPEC_CACHE_MAX_AGE_DAYS,
+                    float,
+                    libspec_gc.DEFAULT_MAX_AGE_DAYS,
+                ),
+            )
+
+            excludes = tuple(
+                config.get_setting(OPTION_ROBOT_LIBSPEC_DISCOVERY_EXCLUDE, list, [])
+            )
+            if excludes != self._libspec_discovery_excludes:
+                self._libspec_discovery_excludes = excludes
+                for folder_info in self._additional_pythonpath_folder_to_folder_info.values():
+                    folder_info.set_excludes(excludes)
+                for folder_info in self._workspace_folder_uri_to_folder_info.values():
+                    folder_info.set_excludes(excludes)
+                self.synchronize_workspace_folders()
+
             pythonpath_entries = set(
                 config.get_setting(OPTION_ROBOT_PYTHONPATH, list, [])
             )
@@ -568,25 +1280,20 @@ class LibspecManager(ILibspecManager):
     def user_libspec_dir(self):
         return self._user_libspec_dir
 
+    @property
+    def libspec_discovery_excludes(self) -> Tuple[str, ...]:
+        """
+        The globs (from the settings) for the directories skipped when
+        searching the workspace folders.
+        """
+        return self._libspec_discovery_excludes
+
     def _on_file_changed(self, spec_file, folder_info_on_change_spec):
         log.debug("File change detected: %s", spec_file)
 
         # Check if the cache related to libspec generation failure must be
         # cleared.
-        fix = False
-        for cache_key in self._libspec_failures_cache:
-            libname = cache_key[0]
-            if libname in spec_file:
-                fix = True
-                break
-        if fix:
-            new = {}
-            for cache_key, value in self._libspec_failures_cache.items():
-                libname = cache_key[0]
-                if libname not in spec_file:
-                    new[cache_key] = value
-            # Always set as a whole (to avoid racing conditions).
-            self._libspec_failures_cache = new
+        self._libspec_failures_cache.on_path_changed(spec_file)
 
         # Notify _FolderInfo._on_change_spec
         if spec_file.lower().endswith(".libspec"):
@@ -600,7 +1307,9 @@ class LibspecManager(ILibspecManager):
             log.debug("Added workspace folder: %s", folder_uri)
             cp = self._workspace_folder_uri_to_folder_info.copy()
             folder_info = cp[folder_uri] = _FolderInfo(
-                uris.to_fs_path(folder_uri), recursive=True
+                uris.to_fs_path(folder_uri),
+                recursive=True,
+                excludes=self._libspec_discovery_excludes,
             )
             self._workspace_folder_uri_to_folder_info = cp
             folder_info.start_watch(
@@ -633,8 +1342,11 @@ class LibspecManager(ILibspecManager):
                 self.root_uri)), folder_path)) if self.root_uri is not None and not os.path.isabs(folder_path) else folder_path
 
             folder_info = cp[folder_path] = _FolderInfo(
-                real_path, recursive=True)
+                real_path, recursive=True, excludes=self._libspec_discovery_excludes)
             self._additional_pythonpath_folder_to_folder_info = cp
+
+            # Libraries which failed may be importable now.
+            self._libspec_failures_cache.clear()
             folder_info.start_watch(
                 self._observer, self._file_changes_notifier)
             folder_info.synchronize()
@@ -650,6 +1362,7 @@ class LibspecManager(ILibspecManager):
             folder_info = cp.pop(folder_path, NULL)
             folder_info.dispose()
             self._additional_pythonpath_folder_to_folder_info = cp
+            self._libspec_failures_cache.clear()
         else:
             log.debug(
                 "Additional pythonpath folder already removed: %s", folder_path)
@@ -666,7 +1379,7 @@ class LibspecManager(ILibspecManager):
             from robocorp_ls_core.system_mutex import generate_mutex_name
 
             initial_time = time.time()
-            wait_for = []
+            missing = []
 
             log.debug("Waiting for mutex to generate builtins.")
             with timed_acquire_mutex(
@@ -687,22 +1400,18 @@ class LibspecManager(ILibspecManager):
 
                     return robot_constants.STDLIBS
 
+                builtins_libspec_dir = self._builtins_libspec_dir
                 for libname in get_builtins():
-                    builtins_libspec_dir = self._builtins_libspec_dir
                     if not os.path.exists(
                         os.path.join(builtins_libspec_dir,
                                      f"{libname}.libspec")
                     ):
-                        wait_for.append(
-                            self.thread_pool.submit(
-                                self._create_libspec, libname, is_builtin=True
-                            )
-                        )
+                        missing.append(libname)
 
-                for future in wait_for:
-                    future.result()
+                if missing:
+                    self._create_builtin_libspecs(missing)
 
-            if wait_for:
+            if missing:
                 log.debug(
                     "Total time to generate builtins: %.2fs"
                     % (time.time() - initial_time)
@@ -714,6 +1423,80 @@ class LibspecManager(ILibspecManager):
         finally:
             log.info("Finished creating builtin libraries.")
 
+    def _create_builtin_libspecs(self, libnames):
+        """
+        Creates the .libspec for the given builtin libraries (extracting them
+        from the prebuilt archive for the current robot version if available
+        or generating the missing ones in a single worker call).
+
+        :note: must be called with the mutex to generate builtins acquired.
+        """
+        from robotframework_ls.impl import prebuilt_libspecs
+        from robotframework_ls.impl.generate_libdoc import run_docs
+
+        builtins_libspec_dir = self._builtins_libspec_dir
+
+        extracted = prebuilt_libspecs.extract_prebuilt_libspecs(
+            builtins_libspec_dir, self.get_robot_version(), libnames
+        )
+        if extracted:
+            log.debug("Extracted prebuilt libspecs for: %s", extracted)
+        for libname in extracted:
+            _dump_spec_filename_additional_info(
+                os.path.join(builtins_libspec_dir, f"{libname}.libspec"),
+                is_builtin=True,
+            )
+
+        extracted = set(extracted)
+        to_generate = [libname for libname in libnames if libname not in extracted]
+        if not to_generate:
+            return
+
+        libname_to_tmp_libspec_filename = dict(
+            (
+                libname,
+                _get_tmp_libspec_filename(
+                    os.path.join(builtins_libspec_dir, f"{libname}.libspec")
+                ),
+            )
+            for libname in to_generate
+        )
+        try:
+            future = self.libdoc_worker_pool.submit(
+                run_docs,
+                list(libname_to_tmp_libspec_filename.items()),
+                [],
+                {},
+            )
+            results = future.result(_BUILTINS_GENERATION_TIMEOUT)
+            for libname, error, warning in results:
+                libspec_filename = os.path.join(
+                    builtins_libspec_dir, f"{libname}.libspec"
+                )
+                tmp_libspec_filename = libname_to_tmp_libspec_filename[libname]
+                libspec_error_entry = LibspecErrorEntry(libname, None, None, None)
+                if warning is not None:
+                    self.libspec_warnings[libspec_error_entry] = warning
+                if error is not None:
+                    log.debug(
+                        "Error generating builtin libspec for %s: %s", libname, error
+                    )
+                    self.libspec_errors[libspec_error_entry] = error
+                else:
+                    _commit_libspec(
+                        tmp_libspec_filename, libspec_filename, is_builtin=True
+                    )
+                    self._on_spec_committed(libspec_filename)
+        finally:
+            # Remove the temporary files which weren't committed (i.e.: errors
+            # or the batch failed/timed out).
+            for tmp_libspec_filename in libname_to_tmp_libspec_filename.values():
+                if os.path.exists(tmp_libspec_filename):
+                    try:
+                        os.remove(tmp_libspec_filename)
+                    except OSError:
+                        log.exception("Error removing: %s", tmp_libspec_filename)
+
     def synchronize_workspace_folders(self):
         for folder_info in self._workspace_folder_uri_to_folder_info.values():
             folder_info.start_watch(
@@ -751,38 +1534,114 @@ class LibspecManager(ILibspecManager):
         self.synchronize_additional_pythonpath_folders()
         self.synchronize_internal_libspec_folders()
 
-    def _iter_lib_info(self) -> Generator[_LibInfo, None, None]:
-        # Note: the iteration order is important (first ones are visited earlier
-        # and have higher priority).
-        iter_in = []
-        for (_uri, info) in self._workspace_folder_uri_to_folder_info.items():
-            if info.libspec_canonical_filename_to_info:
-                iter_in.append(
-                    (info.libspec_canonical_filename_to_info, False))
-
-        for (_uri, info) in self._pythonpath_folder_to_folder_info.items():
-            if info.libspec_canonical_filename_to_info:
-                iter_in.append(
-                    (info.libspec_canonical_filename_to_info, False))
-
-        for (_uri, info) in self._additional_pythonpath_folder_to_folder_info.items():
-            if info.libspec_canonical_filename_to_info:
-                iter_in.append(
-                    (info.libspec_canonical_filename_to_info, False))
-
-        for (_uri, info) in self._internal_folder_to_folder_info.items():
-            if info.libspec_canonical_filename_to_info:
-                iter_in.append((info.libspec_canonical_filename_to_info, True))
-
-        for canonical_filename_to_info, can_regenerate in iter_in:
-            for canonical_spec_filename, info in list(
-                canonical_filename_to_info.items()
-            ):
+    def _iter_folder_infos(self) -> Generator[Tuple[_FolderInfo, bool], None, None]:
+        """
+        Provides the folder infos along with whether their specs can be
+        regenerated.
+
+        Note: the iteration order is important (first ones are visited earlier
+        and have higher priority).
+        """
+        for info in self._workspace_folder_uri_to_folder_info.values():
+            yield info, False
+
+        for info in self._pythonpath_folder_to_folder_info.values():
+            yield info, False
+
+        for info in self._additional_pythonpath_folder_to_folder_info.values():
+            yield info, False
+
+        for info in self._internal_folder_to_folder_info.values():
+            yield info, True
+
+    def _get_changed_sources(self, libname) -> Dict[str, float]:
+        """
+        Provides the sources of the given library which changed since a spec
+        was generated for it (with any arguments/alias), in which case the
+        library may still be imported with the old contents in a worker of
+        the pool (unless a spec was already generated in a fresh worker after
+        the change).
+
+        :return:
+            normfile -> current mtime of the changed sources.
+        """
+        changed: Dict[str, float] = {}
+        libname_lower = _get_libname_lower(libname)
+        for folder_info, can_regenerate in self._iter_folder_infos():
+            if not can_regenerate:
+                continue
+            canonical_spec_filenames = folder_info.libname_lower_to_canonical_filenames.get(
+                libname_lower
+            )
+            for canonical_spec_filename in canonical_spec_filenames or ():
+                additional_info = _load_spec_filename_additional_info(
+                    canonical_spec_filename
+                )
+                source_to_mtime = additional_info.get(_SOURCE_TO_MTIME) or {}
+                for normfile, mtime in source_to_mtime.items():
+                    _, current_mtime = self._source_mtime_cache.get_normfile_and_mtime(
+                        normfile
+                    )
+                    if (
+                        current_mtime != mtime
+                        and self._fresh_worker_source_to_mtime.get(normfile)
+                        != current_mtime
+                    ):
+                        changed[normfile] = current_mtime
+        return changed
+
+    def _on_spec_committed(self, libspec_filename):
+        for folder_info, _can_regenerate in self._iter_folder_infos():
+            folder_info.on_spec_committed(libspec_filename)
+
+    def _iter_lib_info(
+        self, libname_lower, arguments=None
+    ) -> Generator[_LibInfo, None, None]:
+        """
+        :param libname_lower:
+            The (lowercase) name of the library to be found.
+
+        :param arguments:
+            If given, specs which are yet not loaded and which were generated
+            with other arguments are skipped (without loading the spec).
+        """
+        for folder_info, can_regenerate in self._iter_folder_infos():
+            canonical_spec_filenames = folder_info.libname_lower_to_canonical_filenames.get(
+                libname_lower
+            )
+            if not canonical_spec_filenames:
+                continue
+
+            canonical_filename_to_info = folder_info.libspec_canonical_filename_to_info
+            for canonical_spec_filename in canonical_spec_filenames:
+                info = canonical_filename_to_info.get(
+                    canonical_spec_filename, Sentinel.SENTINEL
+                )
+                if info is Sentinel.SENTINEL:
+                    # Removed in the meanwhile.
+                    continue
 
                 if info is None:
+                    additional_info = None
+                    if can_regenerate and arguments is not None:
+                        # Check the arguments (which are in the additional
+                        # info) before loading the spec.
+                        additional_info = _load_spec_filename_additional_info(
+                            canonical_spec_filename
+                        )
+                        if tuple(additional_info.get(_ARGUMENTS, None) or []) != tuple(
+                            arguments
+                        ):
+                            continue
+
                     info = canonical_filename_to_info[
                         canonical_spec_filename
-                    ] = _load_lib_info(canonical_spec_filename, can_regenerate)
+                    ] = _load_lib_info(
+                        canonical_spec_filename,
+                        can_regenerate,
+                        additional_info,
+                        self._content_store,
+                    )
 
                 # Note: we could end up yielding a library with the same name
                 # multiple times due to its scope. It's up to the caller to
@@ -792,11 +1651,14 @@ class LibspecManager(ILibspecManager):
                 # some cases we may create libraries for namespace packages
                 # (i.e.: empty folders) which don't really have anything -- in
                 # this case, this isn't a valid library.
-                if (info is not None and info.library_doc is not None):
+                if info is not None and info.library_doc is not None:
                     yield info
 
     def get_library_names(self):
-        return sorted(set(lib_info.library_doc.name for lib_info in self._iter_lib_info()))
+        names = set()
+        for folder_info, _can_regenerate in self._iter_folder_infos():
+            names.update(folder_info.iter_library_names())
+        return sorted(names)
 
     def _create_libspec(
         self,
@@ -810,20 +1672,45 @@ class LibspecManager(ILibspecManager):
         alias=None,
         current_doc_uri=None
     ):
-        cache_key = (libname, is_builtin, arguments)
+        cache_key = (libname, is_builtin, tuple(arguments or ()), additional_path)
 
-        not_created = self._libspec_failures_cache.get(
-            cache_key, Sentinel.SENTINEL)
-        if not_created is Sentinel.SENTINEL:
-            created = self._cached_create_libspec(
-                libname, env, log_time, cwd, additional_path, is_builtin, arguments, alias, current_doc_uri)
-            if not created:
-                # Always set as a whole (to avoid racing conditions).
-                cp = self._libspec_failures_cache.copy()
-                cp[cache_key] = False
-                self._libspec_failures_cache = cp
+        if cache_key in self._libspec_failures_cache:
+            return False
 
-        return not_created
+        created = self._cached_create_libspec(
+            libname,
+            env,
+            log_time,
+            cwd,
+            additional_path,
+            is_builtin,
+            arguments,
+            alias,
+            current_doc_uri,
+        )
+        if not created:
+            search_paths = [additional_path]
+            search_paths.extend(
+                x.folder_path
+                for x in self._additional_pythonpath_folder_to_folder_info.values()
+            )
+            search_paths.extend(sys.path)
+            files, dirs = _get_import_candidates(libname, search_paths)
+            entry = self._libspec_failures_cache.add(
+                cache_key,
+                reason=self.libspec_errors.get(
+                    LibspecErrorEntry(libname, arguments, alias, current_doc_uri)
+                ),
+                files=files,
+                dirs=dirs,
+            )
+            log.debug(
+                "Unable to create libspec for: %s (retry in %.0fs). Reason: %s",
+                libname,
+                entry.ttl,
+                entry.reason,
+            )
+        return created
 
     def _subprocess_check_output(self, *args, **kwargs):
         # Only done for mocking.
@@ -840,6 +1727,54 @@ class LibspecManager(ILibspecManager):
         additional_path,
         is_builtin,
         arguments, alias, current_doc_uri
+    ):
+        """
+        Creates the libspec making sure that only one generation for the same
+        library is done at a time in this process (concurrent callers wait
+        for the generation which is already in progress).
+
+        :return bool:
+            Whether the libspec was created.
+        """
+        key = (libname, tuple(arguments or ()), additional_path)
+        with self._libspec_generation_lock:
+            future = self._libspec_generation_futures.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = self._libspec_generation_futures[key] = Future()
+
+        if not is_owner:
+            log.debug("Waiting for libspec generation in progress: %s", libname)
+            return future.result()
+
+        created = False
+        try:
+            created = self._do_cached_create_libspec(
+                libname,
+                env,
+                log_time,
+                cwd,
+                additional_path,
+                is_builtin,
+                arguments,
+                alias,
+                current_doc_uri,
+            )
+        finally:
+            with self._libspec_generation_lock:
+                del self._libspec_generation_futures[key]
+            future.set_result(created)
+        return created
+
+    def _do_cached_create_libspec(
+        self,
+        libname,
+        env,
+        log_time,
+        cwd,
+        additional_path,
+        is_builtin,
+        arguments, alias, current_doc_uri
     ):
         """
         :param str libname:
@@ -926,20 +1861,43 @@ class LibspecManager(ILibspecManager):
                     "${OUTPUT DIR}": None,
                 }
 
+                initial_mtime = _get_mtime(libspec_filename)
                 with timed_acquire_mutex(_get_libspec_mutex_name(libspec_filename)):
+                    if self._was_created_by_other_process(
+                        libspec_filename, initial_mtime, arguments
+                    ):
+                        log.debug(
+                            "Libspec generated by another process while "
+                            "waiting for mutex: %s",
+                            libspec_filename,
+                        )
+                        return True
+
+                    regenerating = os.path.exists(libspec_filename)
+
+                    # If the sources of the library changed (even if it's a
+                    # new arguments/alias variant), a worker which didn't
+                    # import the library yet must be used.
+                    changed_sources = (
+                        {} if is_builtin else self._get_changed_sources(libname)
+                    )
+
+                    # The old spec is kept (for readers) until the new one is
+                    # generated in a temporary file.
+                    tmp_libspec_filename = _get_tmp_libspec_filename(
+                        libspec_filename)
+                    committed = False
                     try:
-                        # remove old
-                        if os.path.exists(libspec_filename):
-                            log.info("remove old spec file %s",
-                                     libspec_filename)
-                            os.remove(libspec_filename)
-                            additional_libspec_filename = _get_additional_info_filename(
-                                libspec_filename)
-                            if os.path.exists(additional_libspec_filename):
-                                os.remove(additional_libspec_filename)
-
-                        future = self.process_pool.submit(
-                            run_doc, f"{libname}{f'::{libargs}' if libargs else ''}", libspec_filename, additional_path, additional_pythonpath_entries, variables)
+                        future = self.libdoc_worker_pool.submit(
+                            run_doc,
+                            f"{libname}{f'::{libargs}' if libargs else ''}",
+                            tmp_libspec_filename,
+                            additional_path,
+                            additional_pythonpath_entries,
+                            variables,
+                            fresh_worker=bool(changed_sources),
+                        )
+                        self._fresh_worker_source_to_mtime.update(changed_sources)
 
                         _, error, warning = future.result(100)
 
@@ -947,12 +1905,36 @@ class LibspecManager(ILibspecManager):
                             self.libspec_warnings[libspec_error_entry] = warning
                         if error is not None:
                             self.libspec_errors[libspec_error_entry] = error
+                            return False
                         else:
-                            _dump_spec_filename_additional_info(
-                                libspec_filename, is_builtin=is_builtin, obtain_mutex=False, arguments=arguments, alias=alias)
+                            # Identical specs (i.e.: same library with other
+                            # arguments) share the contents on disk and the
+                            # LibraryDoc loaded.
+                            content_hash = self._content_store.add(
+                                tmp_libspec_filename)
+                            _commit_libspec(
+                                tmp_libspec_filename,
+                                libspec_filename,
+                                is_builtin=is_builtin,
+                                arguments=arguments,
+                                alias=alias,
+                                source_mtime_cache=self._source_mtime_cache,
+                                content_hash=content_hash,
+                                content_store=self._content_store,
+                            )
+                            committed = True
+                            self._on_spec_committed(libspec_filename)
                     except BaseException as e:
                         self.libspec_errors[libspec_error_entry] = str(e)
                         raise
+                    finally:
+                        if not committed:
+                            if os.path.exists(tmp_libspec_filename):
+                                os.remove(tmp_libspec_filename)
+                            if regenerating:
+                                log.info("remove old spec file %s",
+                                         libspec_filename)
+                                _remove_libspec(libspec_filename)
 
                     return True
             except Exception as e:
@@ -966,9 +1948,33 @@ class LibspecManager(ILibspecManager):
                 log.debug("Took: %.2fs to generate info for: %s" %
                           (delta, libname))
 
+    def _was_created_by_other_process(self, libspec_filename, initial_mtime, arguments):
+        """
+        :param initial_mtime:
+            The mtime of the libspec before waiting for its mutex (None if
+            it didn't exist).
+
+        :note: must be called with the libspec mutex acquired.
+        """
+        mtime = _get_mtime(libspec_filename)
+        if mtime is None or mtime == initial_mtime:
+            return False
+
+        if not os.path.exists(_get_additional_info_filename(libspec_filename)):
+            return False
+
+        additional_info = _load_spec_filename_additional_info(libspec_filename)
+        if not additional_info:
+            return False
+
+        return tuple(additional_info.get("arguments") or ()) == tuple(arguments or ())
+
     def dispose(self):
+        self._libspec_gc.dispose()
+        self._source_mtime_cache.dispose()
         self._observer.dispose()
         self._file_changes_notifier.dispose()
+        self.libdoc_worker_pool.dispose()
 
     def _do_create_libspec_on_get(self, libname, current_doc_uri, arguments, alias):
         from robocorp_ls_core import uris
@@ -1000,6 +2006,39 @@ class LibspecManager(ILibspecManager):
             return True
         return False
 
+    def get_library_target_filename(
+        self, libname: str, current_doc_uri: Optional[str]
+    ) -> Optional[str]:
+        """
+        :return:
+            The file the given library import maps to if it's a path to a file
+            (absolute or relative to the given document) or None if it should
+            be resolved as a module name.
+        """
+        from robocorp_ls_core import uris
+
+        if os.path.isabs(libname):
+            return libname
+
+        if current_doc_uri is None:
+            return None
+
+        cwd = os.path.dirname(uris.to_fs_path(current_doc_uri))
+        if not cwd or not os.path.isdir(cwd):
+            return None
+
+        target = os.path.join(cwd, libname)
+        if os.path.isdir(target):
+            target = os.path.join(target, "__init__.py")
+        if os.path.isfile(target):
+            return target
+
+        if not libname.lower().endswith((".py", ".class", ".java")):
+            target += ".py"
+            if os.path.isfile(target):
+                return target
+        return None
+
     def get_library_info(self, libname, create=True, current_doc_uri=None, arguments=(), alias=None) -> Optional[LibraryDoc]:
         """
         :param libname:
@@ -1012,17 +2051,18 @@ class LibspecManager(ILibspecManager):
         if libname is None:
             return None
 
-        libname_lower = libname.lower()
-        if libname_lower.endswith((".py", ".class", ".java")):
-            libname_lower = os.path.splitext(libname_lower)[0]
+        libname_lower = _get_libname_lower(libname)
 
-        if "/" in libname_lower or "\\" in libname_lower:
-            libname_lower = os.path.basename(libname_lower)
-
-        for lib_info in self._iter_lib_info():
+        for lib_info in self._iter_lib_info(libname_lower, arguments):
             library_doc = lib_info.library_doc
-            if library_doc.name and library_doc.name.lower() == libname_lower and lib_info.arguments == arguments or ():
-                if not lib_info.verify_sources_sync(arguments, alias):
+            if (
+                library_doc.name
+                and library_doc.name.lower() == libname_lower
+                and lib_info.arguments == tuple(arguments or ())
+            ):
+                if not lib_info.verify_sources_sync(
+                    arguments, alias, self._source_mtime_cache
+                ):
                     if create:
                         # Found but it's not in sync. Try to regenerate (don't proceed
                         # because we don't want to match a lower priority item, so,
@@ -1040,6 +2080,7 @@ class LibspecManager(ILibspecManager):
                         # Not in sync and it should not be created, just skip it.
                         continue
                 else:
+                    self._libspec_gc.on_spec_used(lib_info.canonical_spec_filename)
                     return library_doc
 
         if create:
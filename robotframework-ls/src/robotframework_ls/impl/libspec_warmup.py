@@ -0,0 +1,352 @@
+"""
+Generates the libspecs for the libraries imported in the workspace in the
+background (so that the first completion/lint which needs a library doesn't
+have to wait for libdoc).
+
+Libraries imported in opened documents are generated before the ones which
+are only imported in other documents of the workspace.
+"""
+from collections import deque
+import heapq
+import itertools
+import os
+import threading
+from typing import Dict, Optional, Set
+
+from robocorp_ls_core.robotframework_log import get_logger
+
+
+log = get_logger(__name__)
+
+PRIORITY_OPEN_DOC = 0
+PRIORITY_WORKSPACE = 1
+
+ROBOT_FILE_EXTENSIONS = (".robot", ".resource", ".txt")
+
+
+class _WarmupEntry(object):
+
+    __slots__ = ["libname", "arguments", "alias", "doc_uri", "priority", "seq"]
+
+    def __init__(self, libname, arguments, alias, doc_uri):
+        self.libname = libname
+        self.arguments = arguments
+        self.alias = alias
+        self.doc_uri = doc_uri
+        self.priority = PRIORITY_WORKSPACE
+        self.seq = -1
+
+
+class LibspecWarmup(object):
+    """
+    Usage:
+
+        warmup = LibspecWarmup(libspec_manager, endpoint, dir_cache)
+        warmup.workspace = workspace
+        warmup.add_folder(folder_path)
+        warmup.on_doc_opened(doc_uri)
+        warmup.on_doc_closed(doc_uri)
+        ...
+        warmup.dispose()
+    """
+
+    def __init__(self, libspec_manager, endpoint=None, dir_cache=None):
+        self._libspec_manager = libspec_manager
+        self._endpoint = endpoint
+        self._dir_cache = dir_cache
+        self.workspace = None
+
+        self._condition = threading.Condition()
+        self._disposed = False
+        self._thread: Optional[threading.Thread] = None
+
+        # Folders to be scanned and documents to be parsed (opened documents
+        # are parsed before the documents found when scanning).
+        self._pending_folders: deque = deque()
+        self._pending_open_docs: deque = deque()
+        self._pending_docs: deque = deque()
+
+        self._open_doc_uris: Set[str] = set()
+        self._doc_uri_to_keys: Dict[str, Set[tuple]] = {}
+        self._key_to_doc_uris: Dict[tuple, Set[str]] = {}
+
+        # Libraries pending generation (heap with (priority, seq, key)).
+        self._heap: list = []
+        self._key_to_entry: Dict[tuple, _WarmupEntry] = {}
+        self._next_seq = itertools.count().__next__
+
+    # --- API (may be called from any thread).
+
+    def add_folder(self, folder_path: str) -> None:
+        with self._condition:
+            self._pending_folders.append(folder_path)
+            self._notify()
+
+    def remove_folder(self, folder_path: str) -> None:
+        """
+        Cancels the generation for libraries only imported by documents in the
+        given folder (which aren't opened).
+        """
+        from robocorp_ls_core import uris
+
+        prefix = os.path.normcase(os.path.join(os.path.abspath(folder_path), ""))
+        with self._condition:
+            try:
+                self._pending_folders.remove(folder_path)
+            except ValueError:
+                pass
+
+            for doc_uri in list(self._doc_uri_to_keys):
+                if doc_uri in self._open_doc_uris:
+                    continue
+                path = os.path.normcase(os.path.abspath(uris.to_fs_path(doc_uri)))
+                if path.startswith(prefix):
+                    self._set_doc_keys(doc_uri, set())
+
+    def on_doc_opened(self, doc_uri: str) -> None:
+        with self._condition:
+            self._open_doc_uris.add(doc_uri)
+            self._pending_open_docs.append(doc_uri)
+            # If the doc was already parsed, prioritize its libraries right away.
+            for key in self._doc_uri_to_keys.get(doc_uri, ()):
+                self._update_priority(key)
+            self._notify()
+
+    def on_doc_closed(self, doc_uri: str) -> None:
+        with self._condition:
+            self._open_doc_uris.discard(doc_uri)
+            for key in self._doc_uri_to_keys.get(doc_uri, ()):
+                self._update_priority(key)
+
+    def get_pending_libraries(self):
+        """
+        :return list(str):
+            The names of the libraries pending generation in the order in
+            which they'll be generated (for testing).
+        """
+        with self._condition:
+            return [
+                self._key_to_entry[key].libname
+                for (priority, seq, key) in sorted(self._heap)
+                if self._is_current(priority, seq, key)
+            ]
+
+    def dispose(self) -> None:
+        with self._condition:
+            self._disposed = True
+            self._pending_folders.clear()
+            self._pending_open_docs.clear()
+            self._pending_docs.clear()
+            self._heap = []
+            self._key_to_entry.clear()
+            self._condition.notify_all()
+
+    # --- Internal (must be called with the lock held).
+
+    def _notify(self):
+        if self._disposed:
+            return
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="LibspecWarmup", daemon=True
+            )
+            self._thread.start()
+        self._condition.notify_all()
+
+    def _set_doc_keys(self, doc_uri, keys: Set[tuple]) -> None:
+        old_keys = self._doc_uri_to_keys.pop(doc_uri, set())
+        if keys:
+            self._doc_uri_to_keys[doc_uri] = keys
+
+        for key in old_keys - keys:
+            doc_uris = self._key_to_doc_uris.get(key)
+            if doc_uris is not None:
+                doc_uris.discard(doc_uri)
+                if not doc_uris:
+                    del self._key_to_doc_uris[key]
+            self._update_priority(key)
+
+        for key in keys:
+            self._key_to_doc_uris.setdefault(key, set()).add(doc_uri)
+            self._update_priority(key)
+
+    def _update_priority(self, key) -> None:
+        entry = self._key_to_entry.get(key)
+        if entry is None:
+            return
+
+        doc_uris = self._key_to_doc_uris.get(key)
+        if not doc_uris:
+            # No longer imported: cancel it.
+            del self._key_to_entry[key]
+            return
+
+        if doc_uris.intersection(self._open_doc_uris):
+            priority = PRIORITY_OPEN_DOC
+        else:
+            priority = PRIORITY_WORKSPACE
+
+        if priority != entry.priority or entry.seq == -1:
+            entry.priority = priority
+            entry.seq = self._next_seq()
+            heapq.heappush(self._heap, (priority, entry.seq, key))
+
+    def _is_current(self, priority, seq, key) -> bool:
+        entry = self._key_to_entry.get(key)
+        return entry is not None and entry.priority == priority and entry.seq == seq
+
+    def _pop_library(self) -> Optional[_WarmupEntry]:
+        heap = self._heap
+        while heap:
+            priority, seq, key = heapq.heappop(heap)
+            if self._is_current(priority, seq, key):
+                return self._key_to_entry.pop(key)
+        return None
+
+    # --- Worker thread.
+
+    def _run(self):
+        from robocorp_ls_core.progress_report import progress_context
+        from robotframework_ls.constants import NULL
+
+        while True:
+            with self._condition:
+                while not self._disposed and not self._has_pending_work():
+                    self._condition.wait()
+                if self._disposed:
+                    return
+
+            self._process_pending_docs()
+            with self._condition:
+                if not self._key_to_entry:
+                    continue
+
+            endpoint = self._endpoint
+            if endpoint is not None:
+                ctx = progress_context(
+                    endpoint, "Generating libspecs", self._dir_cache
+                )
+            else:
+                ctx = NULL
+
+            with ctx:
+                while True:
+                    # Always parse documents (which may change priorities)
+                    # before generating the next library.
+                    self._process_pending_docs()
+
+                    with self._condition:
+                        if self._disposed:
+                            return
+                        entry = self._pop_library()
+                    if entry is None:
+                        break
+                    self._generate(entry)
+
+    def _has_pending_work(self) -> bool:
+        return bool(
+            self._pending_folders
+            or self._pending_open_docs
+            or self._pending_docs
+            or self._key_to_entry
+        )
+
+    def _process_pending_docs(self) -> None:
+        while True:
+            with self._condition:
+                if self._disposed:
+                    return
+                if self._pending_open_docs:
+                    doc_uri = self._pending_open_docs.popleft()
+                elif self._pending_folders:
+                    folder_path = self._pending_folders.popleft()
+                    doc_uri = None
+                elif self._pending_docs:
+                    doc_uri = self._pending_docs.popleft()
+                else:
+                    return
+
+            if doc_uri is None:
+                self._scan_folder(folder_path)
+            else:
+                self._add_doc_imports(doc_uri)
+
+    def _scan_folder(self, folder_path: str) -> None:
+        from robocorp_ls_core import uris
+        from robotframework_ls.impl.libspec_discovery import LibspecDirScanner
+
+        # Skip the same directories skipped when searching for libspecs.
+        scanner = LibspecDirScanner(
+            folder_path,
+            recursive=True,
+            excludes=self._libspec_manager.libspec_discovery_excludes,
+            extensions=ROBOT_FILE_EXTENSIONS,
+        )
+        doc_uris = []
+        try:
+            for filename in sorted(scanner.scan()):
+                doc_uris.append(uris.from_fs_path(filename))
+        except Exception:
+            log.exception("Error scanning folder: %s", folder_path)
+
+        with self._condition:
+            self._pending_docs.extend(doc_uris)
+
+    def _add_doc_imports(self, doc_uri: str) -> None:
+        from robotframework_ls.impl import ast_utils
+
+        workspace = self.workspace
+        if workspace is None:
+            return
+
+        libspec_manager = self._libspec_manager
+        new_entries = []
+        keys = set()
+        try:
+            doc = workspace.get_document(doc_uri, accept_from_file=True)
+            if doc is None:
+                return
+            ast = doc.get_ast()
+            if ast is None:
+                return
+
+            for node_info in ast_utils.iter_library_imports(ast):
+                node = node_info.node
+                libname = node.name
+                if not libname:
+                    continue
+
+                # The doc is only needed to resolve relative imports.
+                current_doc_uri = None
+                if libspec_manager.get_library_target_filename(libname, doc_uri):
+                    current_doc_uri = doc_uri
+
+                arguments = tuple(node.args)
+                key = (libname, arguments, current_doc_uri)
+                keys.add(key)
+                new_entries.append(
+                    (key, _WarmupEntry(libname, arguments, node.alias, current_doc_uri))
+                )
+        except Exception:
+            log.exception("Error collecting library imports from: %s", doc_uri)
+            return
+
+        with self._condition:
+            if self._disposed:
+                return
+            for key, entry in new_entries:
+                if key not in self._key_to_entry:
+                    self._key_to_entry[key] = entry
+            self._set_doc_keys(doc_uri, keys)
+
+    def _generate(self, entry: _WarmupEntry) -> None:
+        try:
+            self._libspec_manager.get_library_info(
+                entry.libname,
+                create=True,
+                current_doc_uri=entry.doc_uri,
+                arguments=entry.arguments,
+                alias=entry.alias,
+            )
+        except Exception:
+            log.exception("Error pre-generating libspec for: %s", entry.libname)
@@ -0,0 +1,102 @@
+"""
+Support for prebuilt .libspec files for the builtin libraries.
+
+The prebuilt specs are shipped as a zip (one for each robot version) at
+`robotframework_ls/impl/prebuilt_libspecs/builtins_<robot_version>.zip`
+and contain one `<libname>.libspec` for each builtin library.
+
+They may be created with `python -m dev create-builtin-libspecs-archive`.
+
+Note: no archive is shipped by default (the specs reference the sources of the
+robot installation where they were created), so, when an archive isn't
+available the builtin specs are generated as usual.
+"""
+import os
+from typing import Iterable, List, Optional
+
+from robocorp_ls_core.robotframework_log import get_logger
+
+
+log = get_logger(__name__)
+
+
+def get_prebuilt_libspecs_dir() -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "prebuilt_libspecs")
+
+
+def get_prebuilt_archive_filename(
+    robot_version: str, prebuilt_libspecs_dir: Optional[str] = None
+) -> str:
+    return os.path.join(
+        prebuilt_libspecs_dir or get_prebuilt_libspecs_dir(),
+        "builtins_%s.zip" % (robot_version,),
+    )
+
+
+def extract_prebuilt_libspecs(
+    target_dir: str,
+    robot_version: str,
+    libnames: Iterable[str],
+    prebuilt_libspecs_dir: Optional[str] = None,
+) -> List[str]:
+    """
+    Extracts the prebuilt .libspec files for the given libraries to the
+    target dir (only available if there's an archive for the given
+    robot version).
+
+    :return:
+        The names of the libraries extracted.
+    """
+    import zipfile
+    from robocorp_ls_core.basic import create_tmp_filename
+
+    archive_filename = get_prebuilt_archive_filename(
+        robot_version, prebuilt_libspecs_dir
+    )
+    if not os.path.exists(archive_filename):
+        return []
+
+    extracted = []
+    try:
+        with zipfile.ZipFile(archive_filename, "r") as zip_file:
+            available = set(zip_file.namelist())
+            for libname in libnames:
+                name = "%s.libspec" % (libname,)
+                if name not in available:
+                    continue
+
+                target = os.path.join(target_dir, name)
+                tmp_target = create_tmp_filename(target)
+                with open(tmp_target, "wb") as stream:
+                    stream.write(zip_file.read(name))
+                os.replace(tmp_target, target)
+                extracted.append(libname)
+    except Exception:
+        log.exception("Error extracting prebuilt libspecs from: %s", archive_filename)
+    return extracted
+
+
+def create_prebuilt_archive(
+    builtins_libspec_dir: str,
+    robot_version: str,
+    libnames: Iterable[str],
+    prebuilt_libspecs_dir: Optional[str] = None,
+) -> str:
+    """
+    Creates the archive with the .libspec files of the given builtin libraries
+    (which must already be available in the builtins_libspec_dir).
+
+    :return:
+        The archive filename.
+    """
+    import zipfile
+
+    archive_filename = get_prebuilt_archive_filename(
+        robot_version, prebuilt_libspecs_dir
+    )
+    os.makedirs(os.path.dirname(archive_filename), exist_ok=True)
+    with zipfile.ZipFile(archive_filename, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        for libname in libnames:
+            name = "%s.libspec" % (libname,)
+            zip_file.write(os.path.join(builtins_libspec_dir, name), name)
+    return archive_filename
@@ -38,6 +38,9 @@ class IRobotDocument(IDocument, Protocol):
 
     symbols_cache: Optional[list] = None
 
+    # See: keyword_symbol_table.get_document_symbols
+    document_symbols_cache: Any = None
+
 
 class ILibspecManager(Protocol):
     def get_library_info(self, libname, create=True, current_doc_uri=None, arguments=None, alias=None):
@@ -49,6 +52,11 @@ class ILibspecManager(Protocol):
     def get_library_warning(self, libname,  current_doc_uri=None, arguments=None, alias=None):
         ...
 
+    def get_library_target_filename(
+        self, libname: str, current_doc_uri: Optional[str]
+    ) -> Optional[str]:
+        ...
+
     def add_workspace_folder(self, folder_uri: str):
         ...
 
@@ -74,6 +82,12 @@ class IRobotWorkspace(IWorkspace, Protocol):
     def libspec_manager(self, value: ILibspecManager):
         ...
 
+    # See: keyword_symbol_table.WorkspaceSymbolTable
+    keyword_symbol_table: Any
+
+    def on_file_changed(self, uri: str) -> None:
+        ...
+
 
 class IKeywordFound(Protocol):
     """
@@ -91,6 +105,11 @@ class IKeywordFound(Protocol):
     def keyword_name(self) -> str:
         pass
 
+    @property
+    def normalized_keyword_name(self) -> str:
+        # The keyword name normalized with `normalize_robot_name`.
+        pass
+
     @property
     def keyword_args(self) -> Sequence[KeywordArg]:
         pass
@@ -139,10 +158,12 @@ class IKeywordFound(Protocol):
 
 
 class IKeywordCollector(Protocol):
-    def accepts(self, keyword_name: str) -> bool:
+    def accepts(self, keyword_name: str, normalized_keyword_name: str) -> bool:
         """
         :param keyword_name:
             The name of the keyword to be accepted or not.
+        :param normalized_keyword_name:
+            The (precomputed) normalized name of the keyword.
         :return bool:
             If the return is True, on_keyword(...) is called (otherwise it's not
             called).
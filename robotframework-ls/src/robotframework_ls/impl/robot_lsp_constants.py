@@ -13,6 +13,17 @@ OPTION_ROBOT_COMPLETION_SECTION_HEADERS_FORM = "robot.completions.section_header
 OPTION_ROBOT_COMPLETION_SECTION_HEADERS_FORM_PLURAL = "plural"
 OPTION_ROBOT_COMPLETION_SECTION_HEADERS_FORM_SINGULAR = "singular"
 OPTION_ROBOT_COMPLETION_SECTION_HEADERS_FORM_BOTH = "both"
+OPTION_ROBOT_COMPLETION_KEYWORDS_MAX_RESULTS = "robot.completions.keywords.max-results"
+
+OPTION_ROBOT_LIBSPEC_WORKERS_MAX = "robot.libspec.workers.max"
+OPTION_ROBOT_LIBSPEC_WORKERS_MAX_TASKS_PER_CHILD = (
+    "robot.libspec.workers.max-tasks-per-child"
+)
+OPTION_ROBOT_LIBSPEC_WORKERS_IDLE_TIMEOUT = "robot.libspec.workers.idle-timeout"
+OPTION_ROBOT_LIBSPEC_PREWARM = "robot.libspec.prewarm"
+OPTION_ROBOT_LIBSPEC_CACHE_MAX_SIZE_MB = "robot.libspec.cache.max-size-mb"
+OPTION_ROBOT_LIBSPEC_CACHE_MAX_AGE_DAYS = "robot.libspec.cache.max-age-days"
+OPTION_ROBOT_LIBSPEC_DISCOVERY_EXCLUDE = "robot.libspec.discovery.exclude"
 
 # Options which must be set as environment variables.
 ENV_OPTION_ROBOT_DAP_TIMEOUT = "ROBOT_DAP_TIMEOUT"
@@ -27,5 +38,13 @@ ALL_ROBOT_OPTIONS = frozenset(
         OPTION_ROBOT_VARIABLES,
         OPTION_ROBOT_PYTHONPATH,
         OPTION_ROBOT_COMPLETION_SECTION_HEADERS_FORM,
+        OPTION_ROBOT_COMPLETION_KEYWORDS_MAX_RESULTS,
+        OPTION_ROBOT_LIBSPEC_WORKERS_MAX,
+        OPTION_ROBOT_LIBSPEC_WORKERS_MAX_TASKS_PER_CHILD,
+        OPTION_ROBOT_LIBSPEC_WORKERS_IDLE_TIMEOUT,
+        OPTION_ROBOT_LIBSPEC_PREWARM,
+        OPTION_ROBOT_LIBSPEC_CACHE_MAX_SIZE_MB,
+        OPTION_ROBOT_LIBSPEC_CACHE_MAX_AGE_DAYS,
+        OPTION_ROBOT_LIBSPEC_DISCOVERY_EXCLUDE,
     )
 )
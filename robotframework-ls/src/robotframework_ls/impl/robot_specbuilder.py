@@ -15,11 +15,22 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from bisect import bisect_left
 import os
+import sys
 import weakref
 from robocorp_ls_core.cache import instance_cache
-from typing import Optional
+from typing import Iterator, List, Optional
 from robocorp_ls_core.protocols import Sentinel
+from robotframework_ls.impl.text_utilities import normalize_robot_name
+
+
+def _intern(s):
+    # Strings such as sources, types, tags and argument names are repeated
+    # across keywords (and libraries), so, keep a single instance of each.
+    if s.__class__ is str:
+        return sys.intern(s)
+    return s
 
 
 def markdown_doc(obj):
@@ -30,17 +41,25 @@ def markdown_doc(obj):
     if obj is None:
         return ""
 
-    if not obj.doc:
-        return ""
-
     if obj.doc_format.lower() == "html":
         try:
-            return obj.__md_doc__
+            md_doc = obj.__md_doc__
         except AttributeError:
+            doc = obj.doc
+            if not doc:
+                return ""
             from robotframework_ls import html_to_markdown
 
-            obj.__md_doc__ = html_to_markdown.convert(obj.doc)
-        return obj.__md_doc__
+            md_doc = obj.__md_doc__ = html_to_markdown.convert(doc)
+        else:
+            if not isinstance(md_doc, str):
+                # Precomputed markdown to be read on demand (i.e.: from the
+                # binary cache).
+                md_doc = obj.__md_doc__ = md_doc()
+        return md_doc
+
+    if not obj.doc:
+        return ""
     return obj.doc
 
 
@@ -52,6 +71,30 @@ def docs_and_format(obj):
 
 
 class LibraryDoc(object):
+
+    __slots__ = [
+        "filename",
+        "name",
+        "doc",
+        "version",
+        "specversion",
+        "type",
+        "scope",
+        "named_args",
+        "_doc_format",
+        "_source",
+        "lineno",
+        "inits",
+        "_keywords",
+        "_sorted_normalized_names",
+        "_sorted_normalized_name_positions",
+        "symbols_cache",
+        "keyword_entries_cache",
+        "__instance_cache__",
+        "__md_doc__",
+        "__weakref__",
+    ]
+
     def __init__(
         self,
         filename,
@@ -78,13 +121,17 @@ class LibraryDoc(object):
         self.scope = scope
         self.named_args = named_args
         self.doc_format = doc_format or "ROBOT"
-        self._source = source
+        self._source = _intern(source)
         self.lineno = lineno
-        self.inits = []
-        self.keywords = []
+        self.inits = ()
+        self.keywords = ()
 
         self.symbols_cache: Optional[list] = None
 
+        # The keywords prepared for the keyword collection (see:
+        # collect_keywords.get_library_keyword_entries).
+        self.keyword_entries_cache: Optional[tuple] = None
+
     @property
     @instance_cache
     def source(self):
@@ -114,7 +161,46 @@ class LibraryDoc(object):
 
     @keywords.setter
     def keywords(self, kws):
-        self._keywords = sorted(kws, key=lambda kw: kw.name)
+        self._keywords = tuple(sorted(kws, key=lambda kw: kw.name))
+
+        # Index to search keywords by the normalized name (exact or prefix).
+        index = sorted(
+            (kw.normalized_name, i) for i, kw in enumerate(self._keywords)
+        )
+        self._sorted_normalized_names = tuple(name for name, _i in index)
+        self._sorted_normalized_name_positions = tuple(i for _name, i in index)
+
+    def get_keywords_by_normalized_name(self, normalized_name) -> List["KeywordDoc"]:
+        """
+        :param normalized_name:
+            A name normalized with `normalize_robot_name`.
+        """
+        return list(self.iter_keywords_by_normalized_name(normalized_name, prefix=False))
+
+    def iter_keywords_by_normalized_name(
+        self, normalized_name, prefix=True
+    ) -> Iterator["KeywordDoc"]:
+        """
+        :param normalized_name:
+            A name normalized with `normalize_robot_name`.
+
+        :param prefix:
+            If True, provides the keywords whose normalized name starts with the
+            given name, otherwise only the keywords with the same normalized name.
+        """
+        names = self._sorted_normalized_names
+        positions = self._sorted_normalized_name_positions
+        keywords = self._keywords
+        i = bisect_left(names, normalized_name)
+        while i < len(names):
+            name = names[i]
+            if prefix:
+                if not name.startswith(normalized_name):
+                    break
+            elif name != normalized_name:
+                break
+            yield keywords[positions[i]]
+            i += 1
 
     @property
     def all_tags(self):
@@ -134,10 +220,14 @@ class LibraryDoc(object):
 
 class KeywordArg(object):
 
-    _is_keyword_arg = False
-    _is_star_arg = False
-    _default_value = None
-    _arg_type = None
+    __slots__ = [
+        "original_arg",
+        "_arg_name",
+        "_is_keyword_arg",
+        "_is_star_arg",
+        "_default_value",
+        "_arg_type",
+    ]
 
     def __init__(
         self, arg: str, name=Sentinel, arg_type=Sentinel, default_value=Sentinel
@@ -147,7 +237,11 @@ class KeywordArg(object):
         the arg is expected to be something as 'arg:int=10' and thus the arg_type
         and default_value are computed.
         """
-        self.original_arg = arg
+        self.original_arg = _intern(arg)
+        self._is_keyword_arg = False
+        self._is_star_arg = False
+        self._default_value = None
+        self._arg_type = None
         if arg.startswith("**"):
             self._is_keyword_arg = True
             arg = "&" + arg[2:]
@@ -174,9 +268,11 @@ class KeywordArg(object):
                     arg = arg[:colon_i]
 
         if name is not Sentinel:
-            self._arg_name = name
+            self._arg_name = _intern(name)
         else:
-            self._arg_name = arg
+            self._arg_name = _intern(arg)
+        self._arg_type = _intern(self._arg_type)
+        self._default_value = _intern(self._default_value)
 
     @property
     def arg_name(self) -> str:
@@ -200,40 +296,101 @@ class KeywordArg(object):
 
 
 class KeywordDoc(object):
+
+    __slots__ = [
+        "_weak_libdoc",
+        "name",
+        "normalized_name",
+        "_args",
+        "_doc",
+        "tags",
+        "_source",
+        "_source_resolved",
+        "lineno",
+        "__md_doc__",
+    ]
+
     def __init__(
-        self, weak_libdoc, name="", args=(), doc="", tags=(), source=None, lineno=-1
+        self,
+        weak_libdoc,
+        name="",
+        args=(),
+        doc="",
+        tags=(),
+        source=None,
+        lineno=-1,
+        normalized_name=None,
+        md_doc=None,
     ):
+        """
+        :param doc:
+            The documentation for the keyword or a callable which provides it
+            (in which case it's only called when the documentation is first
+            requested).
+
+        :param md_doc:
+            If given, the documentation already converted to markdown (or a
+            callable which provides it), used when the doc format is html
+            (see: `markdown_doc`).
+
+        :param normalized_name:
+            The name normalized with `normalize_robot_name` (computed from the
+            name if not given).
+        """
         self._weak_libdoc = weak_libdoc
         self.name = name
-        self._args = args
-        self.doc = doc
-        self.tags = tags
-        self._source = source
+        if normalized_name is None:
+            normalized_name = normalize_robot_name(name)
+        self.normalized_name = normalized_name
+        self._args = tuple(args)
+        self._doc = doc
+        self.tags = tuple(_intern(tag) for tag in tags)
+        self._source = _intern(source)
+        self._source_resolved = None
         self.lineno = lineno
+        if md_doc is not None:
+            self.__md_doc__ = md_doc
+
+    @property
+    def doc(self) -> str:
+        doc = self._doc
+        if not isinstance(doc, str):
+            doc = self._doc = doc()
+        return doc
+
+    @doc.setter
+    def doc(self, doc):
+        self._doc = doc
 
     @property
     def deprecated(self):
         return self.doc.startswith("*DEPRECATED") and "*" in self.doc[1:]
 
     @property
-    @instance_cache
     def args(self):
-        if self._args:
-            if isinstance(self._args[0], KeywordArg):
-                return self._args
-
-        return tuple(KeywordArg(arg) for arg in self._args)
+        args = self._args
+        if args and not isinstance(args[0], KeywordArg):
+            # Note: no lock needed (at worst it's computed more than once).
+            args = self._args = tuple(KeywordArg(arg) for arg in args)
+        return args
 
     @property
-    @instance_cache
     def source(self):
-        # When asked for, make sure that the path is absolute.
+        # When asked for, make sure that the path is absolute (cached as it's
+        # requested for each keyword found).
+        source = self._source_resolved
+        if source is not None:
+            return source
+
         source = self._source
         if source:
             if not os.path.isabs(source):
                 libdoc = self._weak_libdoc()
-                if libdoc is not None:
-                    source = libdoc._make_absolute(source)
+                if libdoc is None:
+                    return source
+                source = libdoc._make_absolute(source)
+            # Note: no lock needed (at worst it's computed more than once).
+            self._source_resolved = source
         return source
 
     @property
@@ -250,93 +407,279 @@ class KeywordDoc(object):
     __str__ = __repr__
 
 
+def _keyword_arg_to_data(arg: KeywordArg) -> tuple:
+    return (
+        arg.original_arg,
+        arg.arg_name,
+        arg.is_keyword_arg,
+        arg.is_star_arg,
+        arg.arg_type,
+        arg.default_value,
+    )
+
+
+def _keyword_arg_from_data(data: tuple) -> KeywordArg:
+    # Note: don't go through __init__ (all the info is already computed).
+    arg = KeywordArg.__new__(KeywordArg)
+    original_arg, arg_name, is_keyword_arg, is_star_arg, arg_type, default_value = data
+    arg.original_arg = _intern(original_arg)
+    arg._arg_name = _intern(arg_name)
+    arg._is_keyword_arg = is_keyword_arg
+    arg._is_star_arg = is_star_arg
+    arg._arg_type = _intern(arg_type)
+    arg._default_value = _intern(default_value)
+    return arg
+
+
+def _keyword_doc_to_data(keyword: KeywordDoc, doc_to_data) -> tuple:
+    md_doc = None
+    if keyword.doc_format.lower() == "html":
+        # The conversion to markdown is done only once (when saved).
+        md_doc = doc_to_data(markdown_doc(keyword))
+    return (
+        keyword.name,
+        tuple(_keyword_arg_to_data(arg) for arg in keyword.args),
+        doc_to_data(keyword.doc),
+        tuple(keyword.tags),
+        keyword._source,
+        keyword.lineno,
+        keyword.normalized_name,
+        md_doc,
+    )
+
+
+def _keyword_doc_from_data(weak_libdoc, data: tuple, data_to_doc) -> KeywordDoc:
+    name, args, doc, tags, source, lineno, normalized_name, md_doc = data
+    return KeywordDoc(
+        weak_libdoc,
+        name=name,
+        args=tuple(_keyword_arg_from_data(arg) for arg in args),
+        doc=data_to_doc(doc, name),
+        tags=tags,
+        source=source,
+        lineno=lineno,
+        normalized_name=normalized_name,
+        md_doc=data_to_doc(md_doc, name, markdown=True)
+        if md_doc is not None
+        else None,
+    )
+
+
+def _doc_to_data(doc):
+    return doc
+
+
+def _data_to_doc(data, keyword_name, markdown=False):
+    return data
+
+
+def library_doc_to_data(libdoc: LibraryDoc, doc_to_data=_doc_to_data) -> tuple:
+    """
+    Provides the contents of the given LibraryDoc only with builtin types
+    (i.e.: tuple, str, int, bool, None) so that it can be marshalled.
+
+    :param doc_to_data:
+        Used to convert the documentation of each keyword to the data to be
+        saved (by default the documentation itself is saved). For html docs,
+        the documentation converted to markdown is also saved (so that the
+        conversion isn't redone when loaded).
+    """
+    return (
+        libdoc.name,
+        libdoc.doc,
+        libdoc.version,
+        libdoc.specversion,
+        libdoc.type,
+        libdoc.scope,
+        libdoc.named_args,
+        libdoc.doc_format,
+        libdoc._source,
+        libdoc.lineno,
+        tuple(_keyword_doc_to_data(kw, doc_to_data) for kw in libdoc.inits),
+        tuple(_keyword_doc_to_data(kw, doc_to_data) for kw in libdoc.keywords),
+    )
+
+
+def library_doc_from_data(
+    filename, data: tuple, data_to_doc=_data_to_doc
+) -> LibraryDoc:
+    """
+    Creates a LibraryDoc from the data provided by `library_doc_to_data`.
+
+    :param data_to_doc:
+        The reverse of `doc_to_data` in `library_doc_to_data`: receives the
+        saved data, the keyword name and whether it's the documentation
+        converted to markdown (it may also return a callable to load the
+        documentation lazily).
+    """
+    (
+        name,
+        doc,
+        version,
+        specversion,
+        libdoc_type,
+        scope,
+        named_args,
+        doc_format,
+        source,
+        lineno,
+        inits,
+        keywords,
+    ) = data
+    libdoc = LibraryDoc(
+        filename,
+        name=name,
+        doc=doc,
+        version=version,
+        specversion=specversion,
+        type=libdoc_type,
+        scope=scope,
+        named_args=named_args,
+        doc_format=doc_format,
+        source=source,
+        lineno=lineno,
+    )
+    weak_libdoc = weakref.ref(libdoc)
+    libdoc.inits = tuple(
+        _keyword_doc_from_data(weak_libdoc, kw, data_to_doc) for kw in inits
+    )
+    libdoc.keywords = [
+        _keyword_doc_from_data(weak_libdoc, kw, data_to_doc) for kw in keywords
+    ]
+    return libdoc
+
+
+# RF < 3.2 has a "scope" element. Maps its old values to the new ones.
+_OLD_SCOPE_TO_SCOPE = {
+    "": "GLOBAL",  # Was used with resource files.
+    "global": "GLOBAL",
+    "test suite": "SUITE",
+    "test case": "TEST",
+}
+
+# The elements which may appear before the documentation and keywords (the
+# others are only read when the full spec is built).
+_HEADER_TAGS = ("version", "scope", "namedargs")
+
+
 class SpecDocBuilder(object):
-    def build(self, path):
-        spec = self._parse_spec(path)
-
-        version = spec.find("version")
-        specversion = spec.get("specversion")
-
-        libdoc = LibraryDoc(
-            path,
-            name=spec.get("name"),
-            type=spec.get("type"),
-            version=version.text if version is not None else "",
-            specversion=specversion if specversion is not None else "",
-            doc=spec.find("doc").text or "",
-            scope=self._get_scope(spec),
-            named_args=self._get_named_args(spec),
-            doc_format=spec.get("format", "ROBOT"),
-            source=spec.get("source"),
-            lineno=int(spec.get("lineno", -1)),
-        )
-        if specversion == "3":
-            libdoc.inits = self._create_keywords_v3(
-                weakref.ref(libdoc), spec, "inits/init"
-            )
-            libdoc.keywords = self._create_keywords_v3(
-                weakref.ref(libdoc), spec, "keywords/kw"
-            )
-        else:
-            libdoc.inits = self._create_keywords_v2(weakref.ref(libdoc), spec, "init")
-            libdoc.keywords = self._create_keywords_v2(weakref.ref(libdoc), spec, "kw")
-        return libdoc
+    """
+    Builds a LibraryDoc from a .libspec.
 
-    def _get_scope(self, spec):
-        # RF >= 3.2 has "scope" attribute w/ value 'GLOBAL', 'SUITE, or 'TEST'.
-        if "scope" in spec.attrib:
-            return spec.get("scope")
-        # RF < 3.2 has "scope" element. Need to map old values to new.
-        scope = spec.find("scope").text
-        return {
-            "": "GLOBAL",  # Was used with resource files.
-            "global": "GLOBAL",
-            "test suite": "SUITE",
-            "test case": "TEST",
-        }[scope]
-
-    def _parse_spec(self, path):
-        try:
-            from xml.etree import cElementTree as ET
-        except ImportError:
-            from xml.etree import ElementTree as ET
+    The spec is read with `iterparse` and the elements of each keyword are
+    discarded right after the related KeywordDoc is created (so, the full
+    element tree is never kept in memory).
+    """
+
+    def build(self, path, header_only=False):
+        """
+        :param header_only:
+            If True, only the library information before the documentation
+            and keywords is read (name, type, version, specversion, scope,
+            source, lineno), which is enough to index the spec. The returned
+            LibraryDoc has no keywords in this case.
+        """
+        from xml.etree import ElementTree as ET
 
         if not os.path.isfile(path):
             raise IOError("Spec file '%s' does not exist." % path)
-        root = ET.parse(path).getroot()
-        if root.tag != "keywordspec":
+
+        libdoc = None
+        weak_libdoc = None
+        specversion = None
+        inits = []
+        keywords = []
+
+        # The elements currently open (the first one is the keywordspec).
+        stack = []
+        with open(path, "rb") as stream:
+            for event, elem in ET.iterparse(stream, events=("start", "end")):
+                if event == "start":
+                    depth = len(stack)
+                    stack.append(elem)
+                    if depth == 0:
+                        if elem.tag != "keywordspec":
+                            raise RuntimeError("Invalid spec file '%s'." % path)
+                        specversion = elem.get("specversion")
+                        libdoc = LibraryDoc(
+                            path,
+                            name=elem.get("name"),
+                            type=elem.get("type"),
+                            specversion=specversion if specversion is not None else "",
+                            # RF >= 3.2 has "scope" attribute w/ value 'GLOBAL',
+                            # 'SUITE, or 'TEST' (otherwise it's an element).
+                            scope=elem.get("scope"),
+                            # Backwards compatiblity with RF < 2.6.2 (no element).
+                            named_args=False,
+                            doc_format=elem.get("format", "ROBOT"),
+                            source=elem.get("source"),
+                            lineno=int(elem.get("lineno", -1)),
+                        )
+                        weak_libdoc = weakref.ref(libdoc)
+
+                    elif header_only and depth == 1 and elem.tag not in _HEADER_TAGS:
+                        break
+                    continue
+
+                stack.pop()
+                depth = len(stack)
+                tag = elem.tag
+                if depth == 1:
+                    if tag == "version":
+                        libdoc.version = elem.text
+                    elif tag == "scope":
+                        if libdoc.scope is None:
+                            libdoc.scope = _OLD_SCOPE_TO_SCOPE[elem.text or ""]
+                    elif tag == "namedargs":
+                        libdoc.named_args = elem.text == "yes"
+                    elif tag == "doc":
+                        libdoc.doc = elem.text or ""
+                    elif specversion != "3":
+                        if tag == "kw":
+                            keywords.append(self._create_keyword_v2(weak_libdoc, elem))
+                        elif tag == "init":
+                            inits.append(self._create_keyword_v2(weak_libdoc, elem))
+
+                    # Not needed anymore.
+                    stack[0].remove(elem)
+
+                elif depth == 2 and specversion == "3":
+                    parent_tag = stack[1].tag
+                    if tag == "kw" and parent_tag == "keywords":
+                        keywords.append(self._create_keyword_v3(weak_libdoc, elem))
+                        stack[1].remove(elem)
+                    elif tag == "init" and parent_tag == "inits":
+                        inits.append(self._create_keyword_v3(weak_libdoc, elem))
+                        stack[1].remove(elem)
+
+        if libdoc is None:
             raise RuntimeError("Invalid spec file '%s'." % path)
-        return root
 
-    def _get_named_args(self, spec):
-        elem = spec.find("namedargs")
-        if elem is None:
-            return False  # Backwards compatiblity with RF < 2.6.2
-        return elem.text == "yes"
+        if libdoc.scope is None:
+            libdoc.scope = ""
+        libdoc.inits = tuple(inits)
+        libdoc.keywords = keywords
+        return libdoc
 
     # ===========================================================================
     # V2 handling
     # ===========================================================================
-    def _create_keywords_v2(self, weak_libdoc, spec, path):
-        ret = []
-        for elem in spec.findall(path):
-            args = []
-            for a in elem.findall("arguments/arg"):
-                if a.text == "*":
-                    continue
-                args.append(a.text)
-            ret.append(
-                KeywordDoc(
-                    weak_libdoc,
-                    name=elem.get("name", ""),
-                    args=tuple(args),
-                    doc=elem.find("doc").text or "",
-                    tags=tuple(t.text for t in elem.findall("tags/tag")),
-                    source=elem.get("source"),
-                    lineno=int(elem.get("lineno", -1)),
-                )
-            )
-        return ret
+    def _create_keyword_v2(self, weak_libdoc, elem):
+        args = []
+        for a in elem.findall("arguments/arg"):
+            if a.text == "*":
+                continue
+            args.append(a.text)
+        doc = elem.find("doc")
+        return KeywordDoc(
+            weak_libdoc,
+            name=elem.get("name", ""),
+            args=tuple(args),
+            doc=(doc.text if doc is not None else None) or "",
+            tags=tuple(t.text for t in elem.findall("tags/tag")),
+            source=elem.get("source"),
+            lineno=int(elem.get("lineno", -1)),
+        )
 
     # ===========================================================================
     # V3 handling
@@ -372,18 +715,14 @@ class SpecDocBuilder(object):
 
         return ret
 
-    def _create_keywords_v3(self, weak_libdoc, spec, path):
-        ret = []
-        for elem in spec.findall(path):
-            ret.append(
-                KeywordDoc(
-                    weak_libdoc,
-                    name=elem.get("name", ""),
-                    args=tuple(self._create_arguments_v3(elem)),
-                    doc=elem.find("doc").text or "",
-                    tags=[t.text for t in elem.findall("tags/tag")],
-                    source=elem.get("source"),
-                    lineno=int(elem.get("lineno", -1)),
-                )
-            )
-        return ret
+    def _create_keyword_v3(self, weak_libdoc, elem):
+        doc = elem.find("doc")
+        return KeywordDoc(
+            weak_libdoc,
+            name=elem.get("name", ""),
+            args=tuple(self._create_arguments_v3(elem)),
+            doc=(doc.text if doc is not None else None) or "",
+            tags=tuple(t.text for t in elem.findall("tags/tag")),
+            source=elem.get("source"),
+            lineno=int(elem.get("lineno", -1)),
+        )
@@ -9,12 +9,19 @@ from robocorp_ls_core.protocols import check_implements
 
 log = get_logger(__name__)
 
+# The maximum number of changes applied to a document (without the AST being
+# requested) for which the AST is still created incrementally.
+MAX_PENDING_INCREMENTAL_CHANGES = 20
+
 
 class RobotWorkspace(Workspace):
     def __init__(
         self, root_uri, workspace_folders=None, libspec_manager: Optional[ILibspecManager] = None, generate_ast=True
     ):
+        from robotframework_ls.impl.keyword_symbol_table import WorkspaceSymbolTable
+
         self._libspec_manager = libspec_manager
+        self.keyword_symbol_table = WorkspaceSymbolTable(self)
 
         Workspace.__init__(self, root_uri, workspace_folders=workspace_folders)
         if self.libspec_manager is not None:
@@ -29,6 +36,35 @@ class RobotWorkspace(Workspace):
     def libspec_manager(self, value: Optional[ILibspecManager]):
         self._libspec_manager = value
 
+    @overrides(Workspace.put_document)
+    def put_document(self, text_document):
+        doc = Workspace.put_document(self, text_document)
+        self.keyword_symbol_table.on_document_changed(doc.uri)
+        return doc
+
+    @overrides(Workspace.update_document)
+    def update_document(self, text_doc, change):
+        doc_uri = text_doc["uri"]
+        previous_doc = self._docs.get(doc_uri)
+        Workspace.update_document(self, text_doc, change)
+        new_doc = self._docs.get(doc_uri)
+        if previous_doc is not None and new_doc is not None:
+            new_doc.set_previous_version(previous_doc, change)
+        self.keyword_symbol_table.on_document_changed(doc_uri)
+
+    @overrides(Workspace.remove_document)
+    def remove_document(self, uri: str) -> None:
+        Workspace.remove_document(self, uri)
+        self.keyword_symbol_table.on_document_changed(uri)
+
+    def on_file_changed(self, uri: str) -> None:
+        """
+        Called when a file changes in the filesystem (i.e.: a file-watch event).
+        """
+        self._check_in_mutate_thread()
+        self._filesystem_docs.pop(uri, None)
+        self.keyword_symbol_table.on_document_changed(uri)
+
     @overrides(Workspace.add_folder)
     def add_folder(self, folder):
         Workspace.add_folder(self, folder)
@@ -59,12 +95,17 @@ class RobotDocument(Document):
 
         self._generate_ast = generate_ast
         self._ast = None
+        self._previous_version = None
         self.symbols_cache = None
+        self.document_symbols_cache = None
 
     @overrides(Document._clear_caches)
     def _clear_caches(self):
         Document._clear_caches(self)
+        self._ast = None
+        self._previous_version = None
         self._symbols_cache = None
+        self.document_symbols_cache = None
         self.get_ast.cache_clear(self)  # noqa (clear the instance_cache).
 
     def get_type(self):
@@ -84,33 +125,98 @@ class RobotDocument(Document):
 
         return self.TYPE_TEST_CASE
 
-    @instance_cache
-    def get_ast(self):
-        if not self._generate_ast:
-            raise AssertionError(
-                "The AST can only be accessed in the RobotFrameworkServerApi, not in the RobotFrameworkLanguageServer."
-            )
+    def _get_model_func(self):
         from robot.api import get_model, get_resource_model, get_init_model  # noqa
 
-        try:
-            source = self.source
-        except:
-            log.exception("Error getting source for: %s" % (self.uri,))
-            source = ""
-
         t = self.get_type()
         if t == self.TYPE_TEST_CASE:
-            return get_model(source)
+            return get_model
 
         elif t == self.TYPE_RESOURCE:
-            return get_resource_model(source)
+            return get_resource_model
 
         elif t == self.TYPE_INIT:
-            return get_init_model(source)
+            return get_init_model
 
         else:
             log.critical("Unrecognized section: %s", t)
-            return get_model(source)
+            return get_model
+
+    def set_previous_version(self, previous_doc: "RobotDocument", change) -> None:
+        """
+        Sets the document from which this one was created by applying the
+        given change (so that the AST can be created incrementally from the
+        AST of the previous version).
+        """
+        change_range = change.get("range")
+        if not change_range or not self._generate_ast:
+            return
+
+        if previous_doc._ast is not None:
+            pending_changes = 1
+        else:
+            previous_version = previous_doc._previous_version
+            if previous_version is None:
+                return
+            pending_changes = previous_version[2] + 1
+            if pending_changes > MAX_PENDING_INCREMENTAL_CHANGES:
+                # Don't keep too many versions alive (just do a full parse).
+                return
+
+        self._previous_version = (previous_doc, change_range, pending_changes)
+
+    def _create_ast_incrementally(self):
+        from robotframework_ls.impl import incremental_parse
+
+        # Get the versions from the newest to the oldest (until one which
+        # already has an AST is found).
+        docs = []
+        doc = self
+        while doc._ast is None:
+            previous_version = doc._previous_version
+            if previous_version is None:
+                return None
+            docs.append((doc, previous_version))
+            doc = previous_version[0]
+
+        ast = doc._ast
+        get_model = self._get_model_func()
+        for doc, (previous_doc, change_range, _pending) in reversed(docs):
+            ast = incremental_parse.reparse(
+                ast,
+                previous_doc.get_internal_lines(),
+                doc.get_internal_lines(),
+                change_range,
+                get_model,
+            )
+            if ast is None:
+                return None
+        return ast
+
+    @instance_cache
+    def get_ast(self):
+        if not self._generate_ast:
+            raise AssertionError(
+                "The AST can only be accessed in the RobotFrameworkServerApi, not in the RobotFrameworkLanguageServer."
+            )
+
+        ast = None
+        if self._previous_version is not None:
+            ast = self._create_ast_incrementally()
+            # The previous versions are no longer needed.
+            self._previous_version = None
+
+        if ast is None:
+            try:
+                source = self.source
+            except:
+                log.exception("Error getting source for: %s" % (self.uri,))
+                source = ""
+
+            ast = self._get_model_func()(source)
+
+        self._ast = ast
+        return ast
 
     def find_line_with_contents(self, contents: str) -> int:
         """
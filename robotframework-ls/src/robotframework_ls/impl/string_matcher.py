@@ -3,6 +3,11 @@ from robotframework_ls.impl.text_utilities import (
     matches_robot_keyword,
 )
 
+_WORD_SEPARATORS = frozenset(" _.")
+
+# The chars removed by `normalize_robot_name`.
+_NORMALIZE_REMOVED_CHARS = frozenset(" _")
+
 
 class RobotStringMatcher(object):
     def __init__(self, filter_text):
@@ -18,16 +23,58 @@ class RobotStringMatcher(object):
             return True
         return self.filter_text in normalize_robot_name(word)
 
+    def accepts_normalized_keyword_name(self, normalized_keyword_name):
+        """
+        Same as `accepts_keyword_name` for an already normalized name (i.e.:
+        the precomputed `normalized_keyword_name` of an `IKeywordFound`).
+        """
+        if not self.filter_text:
+            return True
+        return self.filter_text in normalized_keyword_name
+
+    def get_normalized_keyword_name_score(self, keyword_name, normalized_keyword_name):
+        """
+        :return:
+            A score for an (accepted) keyword name (higher is better):
+            3 for an exact match, 2 for a prefix match, 1 if the filter text
+            matches the start of a word in the name and 0 otherwise.
+        """
+        filter_text = self.filter_text
+        if not filter_text:
+            return 0
+
+        if normalized_keyword_name == filter_text:
+            return 3
+
+        if normalized_keyword_name.startswith(filter_text):
+            return 2
+
+        # Check the start of each word in the normalized name (its offset in
+        # the normalized name is computed while iterating the name, so, no
+        # new string is created).
+        normalized_index = 0
+        previous_char = None
+        for c in keyword_name:
+            if previous_char in _WORD_SEPARATORS and c not in _WORD_SEPARATORS:
+                if normalized_keyword_name.startswith(filter_text, normalized_index):
+                    return 1
+            if c not in _NORMALIZE_REMOVED_CHARS:
+                normalized_index += len(c.lower())
+            previous_char = c
+        return 0
+
     def is_same_robot_name(self, word):
         return self.filter_text == normalize_robot_name(word)
 
     def is_keyword_name_match(self, keyword_name):
-        normalized = normalize_robot_name(keyword_name)
-        if self.filter_text == normalized:
+        return self.is_normalized_keyword_name_match(normalize_robot_name(keyword_name))
+
+    def is_normalized_keyword_name_match(self, normalized_keyword_name):
+        if self.filter_text == normalized_keyword_name:
             return True
 
-        if "{" in normalized:
-            return matches_robot_keyword(self.filter_text, normalized)
+        if "{" in normalized_keyword_name:
+            return matches_robot_keyword(self.filter_text, normalized_keyword_name)
 
         return False
 
@@ -52,7 +99,9 @@ class MatcherWithResourceOrLibraryName(RobotStringMatcher):
             name = keyword_found.resource_name or keyword_found.library_name
 
         if name == self.resource_or_library_name:
-            return self.accepts_keyword_name(keyword_found.keyword_name)
+            return self.accepts_normalized_keyword_name(
+                keyword_found.normalized_keyword_name
+            )
         return False
 
     def is_keyword_match(self, keyword_found):
@@ -61,7 +110,9 @@ class MatcherWithResourceOrLibraryName(RobotStringMatcher):
             name = keyword_found.resource_name or keyword_found.library_name
 
         if name == self.resource_or_library_name:
-            return self.is_keyword_name_match(keyword_found.keyword_name)
+            return self.is_normalized_keyword_name_match(
+                keyword_found.normalized_keyword_name
+            )
         return False
 
 
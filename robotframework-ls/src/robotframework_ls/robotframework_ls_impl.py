@@ -29,6 +29,13 @@ log = get_logger(__name__)
 
 LINT_DEBOUNCE_S = 0.4  # 400 ms
 
+# When the keywords provided by a document (i.e.: a resource) change, the
+# opened documents which import it are linted again (at most
+# LINT_DEPENDENTS_MAX_FAN_OUT documents after LINT_DEPENDENTS_DEBOUNCE_S
+# without new changes).
+LINT_DEPENDENTS_DEBOUNCE_S = 1.5
+LINT_DEPENDENTS_MAX_FAN_OUT = 10
+
 
 class _CurrLintInfo(object):
     def __init__(
@@ -80,9 +87,59 @@ class _CurrLintInfo(object):
         self._monitor.cancel()
 
 
+class _LintDependentsInfo(object):
+    def __init__(
+        self, lint_manager: "_LintManager", rf_lint_api_client: IRobotFrameworkApiClient, doc_uri
+    ) -> None:
+        self._lint_manager = lint_manager
+        self._rf_lint_api_client = rf_lint_api_client
+        self.doc_uri = doc_uri
+        self._monitor = Monitor()
+
+    def __call__(self) -> None:
+        from robocorp_ls_core.jsonrpc.exceptions import JsonRpcRequestCancelled
+        from robocorp_ls_core.client_base import wait_for_message_matcher
+        from robotframework_ls.server_api.client import SubprocessDiedError
+
+        try:
+            doc_uri = self.doc_uri
+            self._monitor.check_cancelled()
+            message_matcher = self._rf_lint_api_client.request_lint_dependents(
+                doc_uri, LINT_DEPENDENTS_MAX_FAN_OUT
+            )
+            if message_matcher is not None:
+                if wait_for_message_matcher(
+                    message_matcher,
+                    monitor=self._monitor,
+                    request_cancel=self._rf_lint_api_client.request_cancel,
+                    timeout=60 * 3,
+                ):
+                    msg = message_matcher.msg
+                    dependents = msg.get("result") if msg else None
+                    if dependents:
+                        self._monitor.check_cancelled()
+                        log.info(f"Linting dependents of {doc_uri}: {dependents}")
+                        for dependent_uri in dependents[:LINT_DEPENDENTS_MAX_FAN_OUT]:
+                            self._lint_manager.schedule_lint_with_client(
+                                self._rf_lint_api_client, dependent_uri, is_saved=False
+                            )
+        except JsonRpcRequestCancelled:
+            log.info(f"Cancelled linting dependents of: {self.doc_uri}.")
+
+        except SubprocessDiedError:
+            log.info(f"Subprocess exited while linting dependents of: {self.doc_uri}.")
+
+        except Exception:
+            log.exception("Error linting dependents.")
+
+    def cancel(self):
+        self._monitor.cancel()
+
+
 class _LintManager(object):
     def __init__(self, server_manager, lsp_messages) -> None:
         from concurrent.futures import ThreadPoolExecutor, Future
+        import threading
 
         from robotframework_ls.server_manager import ServerManager
 
@@ -90,8 +147,15 @@ class _LintManager(object):
         self._lsp_messages = lsp_messages
 
         self._next_id = partial(next, itertools.count())
+
+        # Note: the lints of dependents are scheduled from the linting threads
+        # (so, the structures below must be accessed with the lock held).
+        self._lock = threading.RLock()
         self._doc_id_to_info: Dict[str, _CurrLintInfo] = {}
         self._doc_id_to_future: Dict[str, Future] = {}
+        self._doc_id_to_dependents_info: Dict[str, _LintDependentsInfo] = {}
+        self._doc_id_to_dependents_timer: Dict[str, threading.Timer] = {}
+        self._doc_id_to_dependents_future: Dict[str, Future] = {}
 
         self.thread_executor = ThreadPoolExecutor(thread_name_prefix="linting")
 
@@ -108,27 +172,87 @@ class _LintManager(object):
             log.info(f"Unable to get lint api for: {doc_uri}")
             return
 
+        self.schedule_lint_with_client(rf_lint_api_client, doc_uri, is_saved)
+
+    def schedule_lint_with_client(
+        self, rf_lint_api_client: IRobotFrameworkApiClient, doc_uri: str, is_saved: bool
+    ) -> None:
+        """
+        Note: may be called from any thread.
+        """
         curr_info = _CurrLintInfo(
             rf_lint_api_client, self._lsp_messages, doc_uri, is_saved
         )
 
-        self._doc_id_to_info[doc_uri] = curr_info
-
         def run():
             time.sleep(LINT_DEBOUNCE_S)
             curr_info()
 
-        self._doc_id_to_future[doc_uri] = self.thread_executor.submit(run)
-        self._doc_id_to_future[doc_uri].add_done_callback(
-            lambda x: log.info(f"linting for {doc_uri} done"))
+        with self._lock:
+            self.cancel_lint(doc_uri)
+            self._doc_id_to_info[doc_uri] = curr_info
+            self._doc_id_to_future[doc_uri] = self.thread_executor.submit(run)
+            self._doc_id_to_future[doc_uri].add_done_callback(
+                lambda x: log.info(f"linting for {doc_uri} done"))
 
     def cancel_lint(self, doc_uri: str) -> None:
-        curr_info = self._doc_id_to_info.pop(doc_uri, None)
-        if curr_info is not None:
-            curr_info.cancel()
-        curr_future = self._doc_id_to_future.pop(doc_uri, None)
-        if curr_future is not None:
-            curr_future.cancel()
+        with self._lock:
+            curr_info = self._doc_id_to_info.pop(doc_uri, None)
+            if curr_info is not None:
+                curr_info.cancel()
+            curr_future = self._doc_id_to_future.pop(doc_uri, None)
+            if curr_future is not None:
+                curr_future.cancel()
+
+    def schedule_lint_dependents(self, doc_uri: str) -> None:
+        """
+        Lints the opened documents which import the given document if the
+        keywords it provides changed (any previous request for the same
+        document which is still pending is cancelled).
+
+        Note: the request is debounced in a timer (and only submitted to the
+        linting threads when the timer fires) so that a sequence of changes
+        doesn't keep linting threads busy waiting.
+        """
+        import threading
+
+        self.cancel_lint_dependents(doc_uri)
+        rf_lint_api_client = self._server_manager.get_lint_rf_api_client(
+            doc_uri)
+        if rf_lint_api_client is None:
+            return
+
+        dependents_info = _LintDependentsInfo(self, rf_lint_api_client, doc_uri)
+
+        def on_timer():
+            with self._lock:
+                if self._doc_id_to_dependents_info.get(doc_uri) is not dependents_info:
+                    return  # Cancelled in the meanwhile.
+                self._doc_id_to_dependents_timer.pop(doc_uri, None)
+                try:
+                    future = self.thread_executor.submit(dependents_info)
+                except RuntimeError:
+                    return  # Executor already shutdown.
+                self._doc_id_to_dependents_future[doc_uri] = future
+
+        timer = threading.Timer(LINT_DEPENDENTS_DEBOUNCE_S, on_timer)
+        timer.daemon = True
+        with self._lock:
+            self._doc_id_to_dependents_info[doc_uri] = dependents_info
+            self._doc_id_to_dependents_timer[doc_uri] = timer
+        timer.start()
+
+    def cancel_lint_dependents(self, doc_uri: str) -> None:
+        with self._lock:
+            dependents_info = self._doc_id_to_dependents_info.pop(doc_uri, None)
+            if dependents_info is not None:
+                dependents_info.cancel()
+            dependents_timer = self._doc_id_to_dependents_timer.pop(doc_uri, None)
+            if dependents_timer is not None:
+                dependents_timer.cancel()
+            dependents_future = self._doc_id_to_dependents_future.pop(doc_uri, None)
+            if dependents_future is not None:
+                dependents_future.cancel()
 
 
 class RobotFrameworkLanguageServer(PythonLanguageServer):
@@ -407,6 +531,9 @@ class RobotFrameworkLanguageServer(PythonLanguageServer):
         PythonLanguageServer.m_text_document__did_close(
             self, textDocument=textDocument, **_kwargs
         )
+        # When closed the contents in the filesystem are used again (which
+        # may provide different keywords to the documents which import it).
+        self._lint_manager.schedule_lint_dependents(textDocument["uri"])
 
     @overrides(PythonLanguageServer.m_text_document__did_open)
     def m_text_document__did_open(self, textDocument=None, **_kwargs):
@@ -440,11 +567,20 @@ class RobotFrameworkLanguageServer(PythonLanguageServer):
             self, event=event, **_kwargs
         )
 
+    @overrides(PythonLanguageServer.m_workspace__did_change_watched_files)
+    def m_workspace__did_change_watched_files(self, changes=None, **_kwargs):
+        self._server_manager.forward(
+            ("api", "lint"), "workspace/didChangeWatchedFiles", {"changes": changes}
+        )
+        for change in changes or ():
+            self._lint_manager.schedule_lint_dependents(change["uri"])
+
     # --- Customized implementation
 
     @overrides(PythonLanguageServer.lint)
     def lint(self, doc_uri, is_saved) -> None:
         self._lint_manager.schedule_lint(doc_uri, is_saved)
+        self._lint_manager.schedule_lint_dependents(doc_uri)
 
     @overrides(PythonLanguageServer.cancel_lint)
     def cancel_lint(self, doc_uri) -> None:
@@ -534,7 +670,12 @@ class RobotFrameworkLanguageServer(PythonLanguageServer):
         line: int,
         col: int,
         monitor: IMonitor,
-    ) -> list:
+    ) -> Any:
+        """
+        :return:
+            A list with the completions or a CompletionList (dict) if the
+            completions are incomplete.
+        """
         from robotframework_ls.impl.completion_context import CompletionContext
         from robotframework_ls.impl import section_completions
         from robotframework_ls.impl import snippets_completions
@@ -569,13 +710,24 @@ class RobotFrameworkLanguageServer(PythonLanguageServer):
             rf_api_client.request_cancel,
             DEFAULT_COMPLETIONS_TIMEOUT,
         )
+        is_incomplete = False
         for message_matcher in accepted_message_matchers:
             msg = message_matcher.msg
             if msg is not None:
                 result = msg.get("result")
                 if result:
+                    if isinstance(result, dict):
+                        # i.e.: CompletionList
+                        is_incomplete = is_incomplete or result.get(
+                            "isIncomplete", False
+                        )
+                        result = result.get("items", [])
                     completions.extend(result)
 
+        if is_incomplete:
+            from robocorp_ls_core.lsp import CompletionList
+
+            return CompletionList(completions, isIncomplete=True).to_dict()
         return completions
 
     def m_text_document__signature_help(self, **kwargs):
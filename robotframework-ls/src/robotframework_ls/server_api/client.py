@@ -27,7 +27,12 @@ class RobotFrameworkApiClient(LanguageServerClientBase):
         return True
 
     def initialize(
-        self, msg_id=None, process_id=None, root_uri=u"", workspace_folders=()
+        self,
+        msg_id=None,
+        process_id=None,
+        root_uri=u"",
+        workspace_folders=(),
+        initialization_options=None,
     ):
         from robocorp_ls_core.options import NO_TIMEOUT, USE_TIMEOUTS
 
@@ -42,6 +47,7 @@ class RobotFrameworkApiClient(LanguageServerClientBase):
                     "processId": process_id,
                     "rootUri": root_uri,
                     "workspaceFolders": workspace_folders,
+                    "initializationOptions": initialization_options,
                 },
             },
             timeout=30 if USE_TIMEOUTS else NO_TIMEOUT,
@@ -85,6 +91,16 @@ class RobotFrameworkApiClient(LanguageServerClientBase):
         """
         return self.request_async(self._build_msg("lint", doc_uri=doc_uri))
 
+    def request_lint_dependents(
+        self, doc_uri: str, max_fan_out: int
+    ) -> Optional[IIdMessageMatcher]:
+        """
+        :Note: async complete.
+        """
+        return self.request_async(
+            self._build_msg("lintDependents", doc_uri=doc_uri, max_fan_out=max_fan_out)
+        )
+
     def forward(self, method_name, params):
         self._check_process_alive()
         msg_id = self.next_id()
@@ -3,13 +3,13 @@ from robocorp_ls_core.jsonrpc.endpoint import require_monitor
 from functools import partial
 from robocorp_ls_core.protocols import IConfig, IMonitor
 from typing import Optional, List
-from typing import Dict, Optional, Union
+from typing import Dict, Optional, Union, cast
 from robocorp_ls_core.constants import Null
 from robocorp_ls_core.python_ls import PythonLanguageServer
 from robocorp_ls_core.basic import overrides
 from robocorp_ls_core.robotframework_log import get_logger
 
-from robotframework_ls.impl.protocols import ILibspecManager
+from robotframework_ls.impl.protocols import ILibspecManager, IRobotWorkspace
 
 
 log = get_logger(__name__)
@@ -37,6 +37,11 @@ class RobotFrameworkServerApi(PythonLanguageServer):
         PythonLanguageServer.__init__(self, read_from, write_to)
         self._version = None
 
+        # Only available if requested in the initialization options (and
+        # enabled in the settings).
+        self._prewarm_libspecs_requested = False
+        self._libspec_warmup = None
+
     @overrides(PythonLanguageServer._create_config)
     def _create_config(self) -> IConfig:
         from robotframework_ls.robot_config import RobotConfig
@@ -68,12 +73,102 @@ class RobotFrameworkServerApi(PythonLanguageServer):
         version = self.m_version()
         return check_min_version(version, min_version)
 
+    @overrides(PythonLanguageServer.m_initialize)
+    def m_initialize(self, initializationOptions=None, **kwargs):
+        ret = PythonLanguageServer.m_initialize(
+            self, initializationOptions=initializationOptions, **kwargs
+        )
+        if initializationOptions:
+            self._prewarm_libspecs_requested = bool(
+                initializationOptions.get("prewarmLibspecs")
+            )
+        return ret
+
     @overrides(PythonLanguageServer.m_workspace__did_change_configuration)
     def m_workspace__did_change_configuration(self, **kwargs):
         PythonLanguageServer.m_workspace__did_change_configuration(
             self, **kwargs)
         self.libspec_manager.config = self.config
 
+        workspace = self.workspace
+        if workspace is not None:
+            # The resolution of resource imports depends on the settings.
+            cast(IRobotWorkspace, workspace).keyword_symbol_table.clear()
+
+        # Note: only started after the configuration is received (because
+        # settings such as the pythonpath are needed to generate the libspecs).
+        self._update_libspec_warmup()
+
+    def _update_libspec_warmup(self):
+        from robotframework_ls.impl.robot_lsp_constants import (
+            OPTION_ROBOT_LIBSPEC_PREWARM,
+        )
+
+        enabled = self._prewarm_libspecs_requested and self.config.get_setting(
+            OPTION_ROBOT_LIBSPEC_PREWARM, bool, True
+        )
+
+        if not enabled:
+            self._dispose_libspec_warmup()
+            return
+
+        workspace = self.workspace
+        if self._libspec_warmup is not None or workspace is None:
+            return
+
+        from robotframework_ls.impl.libspec_warmup import LibspecWarmup
+        from robocorp_ls_core import uris
+
+        warmup = self._libspec_warmup = LibspecWarmup(
+            self.libspec_manager, self._endpoint
+        )
+        warmup.workspace = workspace
+        for document in workspace.iter_documents():
+            warmup.on_doc_opened(document.uri)
+        for folder in workspace.iter_folders():
+            warmup.add_folder(uris.to_fs_path(folder.uri))
+
+    @overrides(PythonLanguageServer.m_text_document__did_open)
+    def m_text_document__did_open(self, textDocument=None, **kwargs):
+        PythonLanguageServer.m_text_document__did_open(
+            self, textDocument=textDocument, **kwargs
+        )
+        warmup = self._libspec_warmup
+        if warmup is not None:
+            warmup.on_doc_opened(textDocument["uri"])
+
+    @overrides(PythonLanguageServer.m_text_document__did_close)
+    def m_text_document__did_close(self, textDocument=None, **kwargs):
+        PythonLanguageServer.m_text_document__did_close(
+            self, textDocument=textDocument, **kwargs
+        )
+        warmup = self._libspec_warmup
+        if warmup is not None:
+            warmup.on_doc_closed(textDocument["uri"])
+
+    @overrides(PythonLanguageServer.m_workspace__did_change_watched_files)
+    def m_workspace__did_change_watched_files(self, changes=None, **kwargs):
+        workspace = self.workspace
+        if workspace is None or not changes:
+            return
+        robot_workspace = cast(IRobotWorkspace, workspace)
+        for change in changes:
+            robot_workspace.on_file_changed(change["uri"])
+
+    @overrides(PythonLanguageServer.m_workspace__did_change_workspace_folders)
+    def m_workspace__did_change_workspace_folders(self, event=None, **kwargs):
+        from robocorp_ls_core import uris
+
+        PythonLanguageServer.m_workspace__did_change_workspace_folders(
+            self, event=event, **kwargs
+        )
+        warmup = self._libspec_warmup
+        if warmup is not None and event:
+            for folder in event.get("removed", []):
+                warmup.remove_folder(uris.to_fs_path(folder["uri"]))
+            for folder in event.get("added", []):
+                warmup.add_folder(uris.to_fs_path(folder["uri"]))
+
     @overrides(PythonLanguageServer.lint)
     def lint(self, *args, **kwargs):
         pass  # No-op for this server.
@@ -140,6 +235,37 @@ class RobotFrameworkServerApi(PythonLanguageServer):
             log.exception("Error collecting errors: %s", e)
             return []
 
+    def m_lint_dependents(self, doc_uri, max_fan_out):
+        func = partial(self._threaded_lint_dependents, doc_uri, max_fan_out)
+        func = require_monitor(func)
+        return func
+
+    def _threaded_lint_dependents(
+        self, doc_uri: str, max_fan_out: int, monitor: IMonitor
+    ) -> List[str]:
+        """
+        :return:
+            The uris of the opened documents which should be linted again
+            because the keywords provided by the given document changed.
+        """
+        workspace = self.workspace
+        if not workspace:
+            return []
+
+        document = workspace.get_document(doc_uri, accept_from_file=True)
+        if document is None:
+            return []
+
+        monitor.check_cancelled()
+        try:
+            robot_workspace = cast(IRobotWorkspace, workspace)
+            return robot_workspace.keyword_symbol_table.get_dependents_to_lint(
+                document, max_fan_out
+            )
+        except Exception:
+            log.exception("Error computing dependents of: %s", doc_uri)
+            return []
+
     def m_complete_all(self, doc_uri, line, col):
         func = partial(self._threaded_complete_all, doc_uri, line, col)
         func = require_monitor(func)
@@ -163,8 +289,12 @@ class RobotFrameworkServerApi(PythonLanguageServer):
             ret.extend(filesystem_section_completions.complete(
                 completion_context))
 
+        is_incomplete = False
         if not ret:
-            ret.extend(keyword_completions.complete(completion_context))
+            keyword_completions_found, is_incomplete = keyword_completions.complete_with_info(
+                completion_context
+            )
+            ret.extend(keyword_completions_found)
 
         if not ret:
             ret.extend(variable_completions.complete(completion_context))
@@ -173,6 +303,11 @@ class RobotFrameworkServerApi(PythonLanguageServer):
             ret.extend(keyword_parameter_completions.complete(
                 completion_context))
 
+        if is_incomplete:
+            from robocorp_ls_core.lsp import CompletionList
+
+            # i.e.: the client should ask for completions again as the user types.
+            return CompletionList(ret, isIncomplete=True).to_dict()
         return ret
 
     def m_section_name_complete(self, doc_uri, line, col):
@@ -395,10 +530,18 @@ class RobotFrameworkServerApi(PythonLanguageServer):
                         config=self.config, monitor=monitor),
         )
 
+    def _dispose_libspec_warmup(self):
+        warmup = self._libspec_warmup
+        if warmup is not None:
+            self._libspec_warmup = None
+            warmup.dispose()
+
     def m_shutdown(self, **_kwargs):
         PythonLanguageServer.m_shutdown(self, **_kwargs)
+        self._dispose_libspec_warmup()
         self.libspec_manager.dispose()
 
     def m_exit(self, **_kwargs):
         PythonLanguageServer.m_exit(self, **_kwargs)
+        self._dispose_libspec_warmup()
         self.libspec_manager.dispose()
@@ -40,7 +40,11 @@ class _ServerApi(object):
     The provided `IRobotFrameworkApiClient` may later be accessed from any thread.
     """
 
-    def __init__(self, log_extension, language_server_ref):
+    def __init__(self, log_extension, language_server_ref, initialization_options=None):
+        """
+        :param initialization_options:
+            The initializationOptions passed when initializing the api process.
+        """
         self._main_thread = threading.current_thread()
 
         from robotframework_ls.robot_config import RobotConfig
@@ -58,6 +62,7 @@ class _ServerApi(object):
         self._initializing = False
         self._log_extension = log_extension
         self._language_server_ref = language_server_ref
+        self._initialization_options = initialization_options
         self._interpreter_info: Optional[IInterpreterInfo] = None
 
     def _check_in_main_thread(self):
@@ -276,6 +281,7 @@ class _ServerApi(object):
                         {"uri": folder.uri, "name": folder.name}
                         for folder in workspace.iter_folders()
                     ),
+                    initialization_options=self._initialization_options,
                 )
 
                 config = self._config
@@ -468,7 +474,11 @@ class ServerManager(object):
     def _create_apis(self, api_id) -> _RegularAndLintApi:
         self._check_in_main_thread()
         assert api_id not in self._id_to_apis, f"{api_id} already created."
-        api = _ServerApi(".api", self._language_server_ref)
+        # Only the regular api pre-generates libspecs (the lint api would
+        # just duplicate the work).
+        api = _ServerApi(
+            ".api", self._language_server_ref, {"prewarmLibspecs": True}
+        )
         lint_api = _ServerApi(".lint.api", self._language_server_ref)
 
         config = self._config
@@ -34,6 +34,7 @@ setup(
     license="Apache-2.0",
     copyright="Robocorp Technologies, Inc.",
     packages=find_packages(),
+    package_data={"robotframework_ls.impl": ["prebuilt_libspecs/*.zip"]},
     zip_safe=False,
     long_description_content_type="text/markdown",
     python_requires=">=3.7",
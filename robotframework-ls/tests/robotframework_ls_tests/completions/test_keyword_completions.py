@@ -23,6 +23,43 @@ def test_keyword_completions_builtin(workspace, libspec_manager):
     ]
 
 
+def test_keyword_completions_library_entries_shared(workspace, libspec_manager):
+    from robotframework_ls.impl.collect_keywords import collect_keywords
+    from robotframework_ls.impl.collect_keywords import get_library_keyword_entries
+    from robotframework_ls.impl.completion_context import CompletionContext
+
+    workspace.set_root("case1", libspec_manager=libspec_manager)
+    doc = workspace.get_doc("case1.robot")
+
+    class _Collector(object):
+        def __init__(self):
+            self.keywords_found = []
+
+        def accepts(self, keyword_name, normalized_keyword_name):
+            return keyword_name == "Should Be Equal"
+
+        def on_keyword(self, keyword_found):
+            self.keywords_found.append(keyword_found)
+
+    def collect():
+        collector = _Collector()
+        collect_keywords(CompletionContext(doc, workspace=workspace.ws), collector)
+        assert len(collector.keywords_found) == 1
+        return collector.keywords_found[0]
+
+    keyword_found1 = collect()
+    keyword_found2 = collect()
+    assert keyword_found1.normalized_keyword_name == "shouldbeequal"
+    assert keyword_found1.docs == keyword_found2.docs
+
+    # The entries are created once for the LibraryDoc and shared among requests.
+    library_doc = libspec_manager.get_library_info("BuiltIn", create=False)
+    entries = get_library_keyword_entries(library_doc)
+    assert entries is get_library_keyword_entries(library_doc)
+    assert keyword_found1._entry is keyword_found2._entry
+    assert keyword_found1._entry in entries
+
+
 def test_keyword_completions_changes_user_library(
     data_regression, workspace, cases, libspec_manager, workspace_dir
 ):
@@ -193,6 +230,80 @@ def test_keyword_completions_from_recursively_included_resource_files(
     )
 
 
+def test_keyword_completions_symbol_table(workspace, cases, libspec_manager):
+    from robocorp_ls_core import uris
+    from robocorp_ls_core.lsp import TextDocumentItem
+    from robotframework_ls.impl.collect_keywords import collect_keywords
+    from robotframework_ls.impl.completion_context import CompletionContext
+    from robotframework_ls.impl.keyword_symbol_table import get_visible_keywords
+    import os.path
+
+    workspace.set_root(cases.get_path("case4"), libspec_manager=libspec_manager)
+    doc = workspace.get_doc("case4.robot")
+
+    class _Collector(object):
+        def __init__(self):
+            self.keyword_names = set()
+
+        def accepts(self, keyword_name, normalized_keyword_name):
+            return True
+
+        def on_keyword(self, keyword_found):
+            self.keyword_names.add(keyword_found.keyword_name)
+
+    def collect():
+        collector = _Collector()
+        collect_keywords(CompletionContext(doc, workspace=workspace.ws), collector)
+        return collector.keyword_names
+
+    visible_keywords = get_visible_keywords(
+        CompletionContext(doc, workspace=workspace.ws)
+    )
+    assert [os.path.basename(uris.to_fs_path(uri)) for uri in visible_keywords.iter_uris()] == [
+        "case4.robot",
+        "case4resource.txt",
+        "case4resource2.robot",
+        "case4resource3.robot",
+    ]
+
+    # Requests reuse the merged view while the documents don't change.
+    assert get_visible_keywords(
+        CompletionContext(doc, workspace=workspace.ws)
+    ) is visible_keywords
+    keyword_names = collect()
+    assert "Yet Another Equal Redefined" in keyword_names
+    assert "Should Be Equal" in keyword_names
+
+    # Opening (or changing) a resource invalidates the views which include it.
+    resource3_uri = uris.from_fs_path(cases.get_path("case4/case4resource3.robot"))
+    workspace.ws.put_document(
+        TextDocumentItem(
+            resource3_uri,
+            text="""*** Keywords ***
+Keyword From Opened Resource
+    No Operation""",
+        )
+    )
+    keyword_names = collect()
+    assert "Keyword From Opened Resource" in keyword_names
+    assert "Yet Another Equal Redefined" not in keyword_names
+
+    # Closing it makes the contents in the filesystem be used again.
+    workspace.ws.remove_document(resource3_uri)
+    keyword_names = collect()
+    assert "Keyword From Opened Resource" not in keyword_names
+    assert "Yet Another Equal Redefined" in keyword_names
+
+    # File-watch events also invalidate the views.
+    visible_keywords = get_visible_keywords(
+        CompletionContext(doc, workspace=workspace.ws)
+    )
+    workspace.ws.on_file_changed(resource3_uri)
+    assert get_visible_keywords(
+        CompletionContext(doc, workspace=workspace.ws)
+    ) is not visible_keywords
+
+
 def test_keyword_completions_builtin_duplicated(workspace, cases, libspec_manager):
     from robotframework_ls.impl import keyword_completions
     from robotframework_ls.impl.completion_context import CompletionContext
@@ -482,3 +593,121 @@ Can use resource keywords
     )
 
     data_regression.check(completions)
+
+
+def test_keyword_completions_max_completions(workspace, libspec_manager, monkeypatch):
+    from robotframework_ls.impl import keyword_completions
+    from robotframework_ls.impl.completion_context import CompletionContext
+
+    workspace.set_root("case1", libspec_manager=libspec_manager)
+    doc = workspace.get_doc("case1.robot")
+    doc.source = doc.source + "\n    should be"
+
+    completions, is_incomplete = keyword_completions.complete_with_info(
+        CompletionContext(doc, workspace=workspace.ws)
+    )
+    assert not is_incomplete
+    assert len(completions) == 7
+
+    # The best entries are provided first (and the client keeps that order).
+    assert [comp["sortText"] for comp in completions] == sorted(
+        comp["sortText"] for comp in completions
+    )
+    assert [comp["label"] for comp in completions][-1] == "Length Should Be"
+
+    monkeypatch.setattr(keyword_completions, "MAX_KEYWORD_COMPLETIONS", 3)
+    completions, is_incomplete = keyword_completions.complete_with_info(
+        CompletionContext(doc, workspace=workspace.ws)
+    )
+    assert is_incomplete
+
+    # The prefix matches (shorter names first) are preferred over the matches
+    # in the middle of the name.
+    assert [comp["label"] for comp in completions] == [
+        "Should Be True",
+        "Should Be Empty",
+        "Should Be Equal",
+    ]
+
+
+def test_keyword_completions_max_completions_setting(workspace, libspec_manager):
+    from robotframework_ls.impl import keyword_completions
+    from robotframework_ls.impl.completion_context import CompletionContext
+    from robotframework_ls.robot_config import RobotConfig
+
+    workspace.set_root("case1", libspec_manager=libspec_manager)
+    doc = workspace.get_doc("case1.robot")
+    doc.source = doc.source + "\n    should be"
+
+    def complete(max_results):
+        config = RobotConfig()
+        config.update(
+            {"robot": {"completions": {"keywords": {"max-results": max_results}}}}
+        )
+        return keyword_completions.complete_with_info(
+            CompletionContext(doc, workspace=workspace.ws, config=config)
+        )
+
+    completions, is_incomplete = complete(2)
+    assert is_incomplete
+    assert [comp["label"] for comp in completions] == [
+        "Should Be True",
+        "Should Be Empty",
+    ]
+
+    # 0 means no limit.
+    completions, is_incomplete = complete(0)
+    assert not is_incomplete
+    assert len(completions) == 7
+
+
+def test_keyword_completions_only_bind_accepted(
+    workspace, libspec_manager, monkeypatch
+):
+    from robotframework_ls.impl import collect_keywords
+    from robotframework_ls.impl import keyword_completions
+    from robotframework_ls.impl.completion_context import CompletionContext
+
+    created = []
+
+    class _KeywordFoundFromLibrary(collect_keywords._KeywordFoundFromLibrary):
+        def __init__(self, library_doc, entry, *args, **kwargs):
+            created.append(entry.keyword_name)
+            super().__init__(library_doc, entry, *args, **kwargs)
+
+    monkeypatch.setattr(
+        collect_keywords, "_KeywordFoundFromLibrary", _KeywordFoundFromLibrary
+    )
+
+    workspace.set_root("case1", libspec_manager=libspec_manager)
+    doc = workspace.get_doc("case1.robot")
+    doc.source = doc.source + "\n    should be"
+
+    completions = keyword_completions.complete(
+        CompletionContext(doc, workspace=workspace.ws)
+    )
+    assert len(completions) == 7
+
+    # The keywords which don't match aren't bound to the completion context.
+    assert sorted(created) == sorted(comp["label"] for comp in completions)
+
+
+def test_keyword_completions_score():
+    from robotframework_ls.impl.string_matcher import RobotStringMatcher
+    from robotframework_ls.impl.text_utilities import normalize_robot_name
+
+    def score(filter_text, keyword_name):
+        return RobotStringMatcher(filter_text).get_normalized_keyword_name_score(
+            keyword_name, normalize_robot_name(keyword_name)
+        )
+
+    assert score("should be", "Should Be") == 3
+    assert score("should be", "Should Be True") == 2
+    assert score("should be", "Length Should Be") == 1
+    assert score("hould be", "Length Should Be") == 0
+    assert score("", "Length Should Be") == 0
+    assert score("should be", "length_should_be") == 1
+    assert score("be", "Lib.Should Be") == 1
+    assert score("sh", "Lib.Should Be") == 1
+    assert score("ould", "Lib.Should Be") == 0
+
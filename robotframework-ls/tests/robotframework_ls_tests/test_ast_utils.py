@@ -62,3 +62,64 @@ def test_find_token(workspace):
 
     token_info = ast_utils.find_token(section, 50, 70)
     assert token_info is None
+
+
+def _find_token_linear(ast, line, col):
+    from robotframework_ls.impl import ast_utils
+
+    for stack, node in ast_utils._iter_nodes(ast):
+        for token in getattr(node, "tokens", ()):
+            if token.lineno - 1 == line and ast_utils._token_contains_col(token, col):
+                return (tuple(stack), node, token)
+    return None
+
+
+def test_find_token_line_index():
+    from robotframework_ls.impl import ast_utils
+    from robotframework_ls.impl.robot_workspace import RobotDocument
+
+    source = """*** Settings ***
+Library    Collections    WITH NAME    Col
+
+*** Variables ***
+${var}    ${some var}    @{list
+
+*** Test Cases ***
+Test case
+    [Documentation]    Some doc
+    ...    continues here
+    ${a}=    Log    ${var}    
+    Log    1
+
+*** Keywords ***
+My Keyword
+    [Arguments]    ${arg}
+    Log    ${arg}"""
+    doc = RobotDocument("unused", source=source)
+    ast = doc.get_ast()
+
+    lines = source.splitlines()
+    for line, line_contents in enumerate(lines + [""]):
+        section = ast_utils.find_section(ast, line)
+        for col in range(len(line_contents) + 3):
+            for node in (ast, section):
+                token_info = ast_utils.find_token(node, line, col)
+                expected = _find_token_linear(node, line, col)
+                if expected is None:
+                    assert token_info is None
+                else:
+                    assert (token_info.stack, token_info.node, token_info.token) == (
+                        expected
+                    )
+
+    assert ast_utils.find_section(ast, 0).header.name == "Settings"
+    assert ast_utils.find_section(ast, 3).header.name == "Variables"
+    assert ast_utils.find_section(ast, 7).header.name == "Test Cases"
+    assert ast_utils.find_section(ast, 100).header.name == "Keywords"
+
+    token_info = ast_utils.find_variable(ast_utils.find_section(ast, 16), 16, 14)
+    assert token_info.token.value == "${arg}"
+
+    # The index is cached in the node.
+    line_index = ast_utils._get_line_index(ast)
+    assert ast_utils._get_line_index(ast) is line_index
@@ -185,3 +185,112 @@ Test
     config = RobotConfig()
     # Note: we don't give errors if we can't resolve a resource.
     _collect_errors(workspace, doc, data_regression, basename="no_error", config=config)
+
+
+def test_code_analysis_lint_dependents(workspace, libspec_manager, cases):
+    from robocorp_ls_core import uris
+    from robocorp_ls_core.lsp import TextDocumentItem
+    from robotframework_ls.impl.completion_context import CompletionContext
+    from robotframework_ls.impl.code_analysis import collect_analysis_errors
+
+    workspace.set_root(cases.get_path("case4"), libspec_manager=libspec_manager)
+    ws = workspace.ws
+
+    def get_uri(basename):
+        return uris.from_fs_path(cases.get_path("case4/" + basename))
+
+    suite_uri = get_uri("case4.robot")
+    resource_uri = get_uri("case4resource3.robot")
+    suite_doc = ws.put_document(TextDocumentItem(suite_uri, text=None))
+
+    def collect_error_messages():
+        completion_context = CompletionContext(suite_doc, workspace=ws)
+        return [error.msg for error in collect_analysis_errors(completion_context)]
+
+    assert collect_error_messages() == []
+
+    # The imports are kept in the graph when resolved.
+    symbol_table = ws.keyword_symbol_table
+    import_graph = symbol_table.import_graph
+    assert import_graph.get_importers(resource_uri) == {get_uri("case4resource.txt")}
+    assert list(import_graph.iter_dependents(resource_uri)) == [
+        get_uri("case4resource.txt"),
+        suite_uri,
+    ]
+    assert "BuiltIn" in import_graph.get_library_imports(suite_uri)
+
+    resource_doc = ws.get_document(resource_uri, accept_from_file=True)
+    assert symbol_table.get_dependents_to_lint(resource_doc, 10) == []
+
+    # A change which doesn't change the keywords doesn't require a new lint.
+    resource_doc = ws.put_document(
+        TextDocumentItem(resource_uri, text=resource_doc.source + "\n    Log    foo")
+    )
+    assert symbol_table.get_dependents_to_lint(resource_doc, 10) == []
+
+    # Only the opened dependents are provided.
+    resource_doc = ws.put_document(
+        TextDocumentItem(
+            resource_uri,
+            text="""*** Keywords ***
+Keyword Renamed
+    No Operation""",
+        )
+    )
+    assert symbol_table.get_dependents_to_lint(resource_doc, 10) == [suite_uri]
+    assert symbol_table.get_dependents_to_lint(resource_doc, 10) == []
+    assert collect_error_messages() == [
+        "Undefined keyword: Yet Another Equal Redefined."
+    ]
+
+    # Closing it makes the contents in the filesystem be used again.
+    ws.remove_document(resource_uri)
+    resource_doc = ws.get_document(resource_uri, accept_from_file=True)
+    assert symbol_table.get_dependents_to_lint(resource_doc, 0) == []
+    assert collect_error_messages() == []
+
+
+def test_lint_dependents_debounced(monkeypatch):
+    import threading
+    import time
+    from robocorp_ls_core.basic import wait_for_condition
+    from robotframework_ls import robotframework_ls_impl
+    from robotframework_ls.robotframework_ls_impl import _LintManager
+
+    class _ApiClientStub(object):
+        def __init__(self):
+            self.requested = []
+
+        def request_lint_dependents(self, doc_uri, max_fan_out):
+            self.requested.append((doc_uri, threading.current_thread().name))
+            return None
+
+    class _ServerManagerStub(object):
+        def __init__(self):
+            self.api_client = _ApiClientStub()
+
+        def get_lint_rf_api_client(self, doc_uri):
+            return self.api_client
+
+    monkeypatch.setattr(robotframework_ls_impl, "LINT_DEPENDENTS_DEBOUNCE_S", 0.3)
+    server_manager = _ServerManagerStub()
+    lint_manager = _LintManager(server_manager, lsp_messages=None)
+    try:
+        # Many changes in a row only request the dependents once (and
+        # nothing is submitted to the linting threads while waiting).
+        for _i in range(20):
+            lint_manager.schedule_lint_dependents("uri")
+        assert lint_manager._doc_id_to_dependents_future == {}
+
+        wait_for_condition(lambda: len(server_manager.api_client.requested) == 1)
+        assert server_manager.api_client.requested[0][1].startswith("linting")
+
+        # Cancelling it before the timer fires doesn't request it.
+        lint_manager.schedule_lint_dependents("uri2")
+        lint_manager.cancel_lint_dependents("uri2")
+        time.sleep(0.5)
+        assert server_manager.api_client.requested == [
+            ("uri", server_manager.api_client.requested[0][1])
+        ]
+    finally:
+        lint_manager.thread_executor.shutdown(wait=True)
@@ -0,0 +1,54 @@
+import os
+
+
+def test_libdoc_worker_pool_recycle():
+    from robotframework_ls.impl.libdoc_worker_pool import LibdocWorkerPool
+
+    pool = LibdocWorkerPool(max_workers=1, max_tasks_per_child=2, idle_timeout=0)
+    try:
+        pid1 = pool.submit(os.getpid).result(10)
+        assert pool.submit(os.getpid).result(10) == pid1
+
+        # Max tasks per child reached: a new process is used.
+        pid2 = pool.submit(os.getpid).result(10)
+        assert pid2 != pid1
+
+        # Fresh worker requested: a new process is used.
+        pid3 = pool.submit(os.getpid, fresh_worker=True).result(10)
+        assert pid3 not in (pid1, pid2)
+
+        # The first task in a new pool is already fresh.
+        assert pool.submit(os.getpid).result(10) == pid3
+    finally:
+        pool.dispose()
+    assert not pool.is_running
+
+
+def test_libdoc_worker_pool_idle_timeout():
+    from robotframework_ls.impl.libdoc_worker_pool import LibdocWorkerPool
+    from robocorp_ls_core.unittest_tools.fixtures import wait_for_test_condition
+
+    pool = LibdocWorkerPool(max_workers=1, idle_timeout=0.1)
+    try:
+        assert not pool.is_running
+        pool.submit(os.getpid).result(10)
+        wait_for_test_condition(lambda: not pool.is_running)
+
+        # Recreated on demand.
+        pool.submit(os.getpid).result(10)
+        assert pool.is_running
+    finally:
+        pool.dispose()
+
+
+def test_libdoc_worker_pool_dispose_cancels_pending():
+    import time
+    from robotframework_ls.impl.libdoc_worker_pool import LibdocWorkerPool
+
+    pool = LibdocWorkerPool(max_workers=1, idle_timeout=0)
+    futures = [pool.submit(time.sleep, 0.5) for _i in range(5)]
+    pool.dispose()
+    assert not pool.is_running
+
+    # The ones not running yet are cancelled.
+    assert futures[-1].cancelled()
@@ -238,6 +238,338 @@ def test_libspec_manager_caches(libspec_manager, workspace_dir):
     wait_for_test_condition(check_spec_2_a, sleep=1 / 5.0)
 
 
+def test_libspec_manager_name_index(libspec_manager, workspace_dir):
+    from robocorp_ls_core import uris
+    from robotframework_ls_tests.fixtures import LIBSPEC_1
+    from robotframework_ls_tests.fixtures import LIBSPEC_2
+
+    os.makedirs(workspace_dir)
+    with open(os.path.join(workspace_dir, "my.libspec"), "w") as stream:
+        stream.write(LIBSPEC_1)
+    with open(os.path.join(workspace_dir, "my2.libspec"), "w") as stream:
+        stream.write(LIBSPEC_2)
+
+    folder_uri = uris.from_fs_path(workspace_dir)
+    libspec_manager.add_workspace_folder(folder_uri)
+    folder_info = libspec_manager._workspace_folder_uri_to_folder_info[folder_uri]
+    assert set(folder_info.libname_lower_to_canonical_filenames.keys()) == set(
+        ["case1_library", "case2_library"]
+    )
+    assert "case2_library" in libspec_manager.get_library_names()
+
+    library_info = libspec_manager.get_library_info("CASE1_LIBRARY", create=False)
+    assert library_info is not None
+    assert library_info.name == "case1_library"
+
+    # Only the spec with the requested name must be loaded.
+    loaded = [
+        filename
+        for filename, info in folder_info.libspec_canonical_filename_to_info.items()
+        if info is not None
+    ]
+    assert [os.path.basename(x) for x in loaded] == ["my.libspec"]
+
+
+def test_libspec_binary_cache(libspec_manager, workspace_dir):
+    from robotframework_ls.impl import libspec_manager as libspec_manager_module
+    from robotframework_ls.impl import libspec_cache
+    from robotframework_ls.impl.robot_specbuilder import SpecDocBuilder
+    from robotframework_ls_tests.fixtures import LIBSPEC_1
+
+    os.makedirs(workspace_dir)
+    spec_filename = os.path.join(workspace_dir, "my.libspec")
+    with open(spec_filename, "w") as stream:
+        stream.write(LIBSPEC_1)
+
+    libdoc, _mtime = libspec_manager_module._load_library_doc_and_mtime(
+        spec_filename, use_binary_cache=True
+    )
+    assert os.path.exists(libspec_cache.get_binary_cache_filename(spec_filename))
+
+    original_build = SpecDocBuilder.build
+
+    def build(*args, **kwargs):
+        raise AssertionError("The XML should not be parsed when cached.")
+
+    SpecDocBuilder.build = build
+    try:
+        cached, _mtime = libspec_manager_module._load_library_doc_and_mtime(
+            spec_filename, use_binary_cache=True
+        )
+    finally:
+        SpecDocBuilder.build = original_build
+
+    assert cached is not libdoc
+    assert [kw.name for kw in cached.keywords] == [kw.name for kw in libdoc.keywords]
+    assert [kw.doc for kw in cached.keywords] == [kw.doc for kw in libdoc.keywords]
+
+    # When the spec changes the cache is stale and the XML is used.
+    with open(spec_filename, "w") as stream:
+        stream.write(LIBSPEC_1.replace("New Verify Model", "Changed Verify Model"))
+    changed, _mtime = libspec_manager_module._load_library_doc_and_mtime(
+        spec_filename, use_binary_cache=True
+    )
+    assert "Changed Verify Model" in [kw.name for kw in changed.keywords]
+
+
+def test_libspec_binary_cache_lazy_docs(libspec_manager, workspace_dir):
+    from robotframework_ls.impl import libspec_manager as libspec_manager_module
+    from robotframework_ls.impl import libspec_cache
+    from robotframework_ls_tests.fixtures import LIBSPEC_1
+
+    os.makedirs(workspace_dir)
+    spec_filename = os.path.join(workspace_dir, "my.libspec")
+    with open(spec_filename, "w") as stream:
+        stream.write(LIBSPEC_1)
+
+    libdoc, _mtime = libspec_manager_module._load_library_doc_and_mtime(
+        spec_filename, use_binary_cache=True
+    )
+    expected_docs = [kw.doc for kw in libdoc.keywords]
+    assert any(expected_docs)
+
+    cached, _mtime = libspec_manager_module._load_library_doc_and_mtime(
+        spec_filename, use_binary_cache=True
+    )
+    # The docs are only loaded when requested.
+    assert not any(isinstance(kw._doc, str) for kw in cached.keywords if kw._doc)
+    assert cached.keywords[0].doc == expected_docs[0]
+    assert isinstance(cached.keywords[0]._doc, str)
+
+    # If the cache is removed the docs are still available (from the spec).
+    libspec_cache.remove_library_doc_cache(spec_filename)
+    assert [kw.doc for kw in cached.keywords] == expected_docs
+
+
+def test_libspec_binary_cache_markdown_docs(libspec_manager, workspace_dir, monkeypatch):
+    from robotframework_ls.impl import libspec_manager as libspec_manager_module
+    from robotframework_ls.impl.robot_specbuilder import markdown_doc
+    from robotframework_ls_tests.fixtures import LIBSPEC_1
+    from robotframework_ls import html_to_markdown
+
+    os.makedirs(workspace_dir)
+    spec_filename = os.path.join(workspace_dir, "my.libspec")
+    with open(spec_filename, "w") as stream:
+        stream.write(
+            LIBSPEC_1.replace('format="ROBOT"', 'format="HTML"').replace(
+                "<doc></doc>", "<doc>&lt;p&gt;Some &lt;b&gt;bold&lt;/b&gt; doc.&lt;/p&gt;</doc>"
+            )
+        )
+
+    # The markdown is computed when the cache is created.
+    libdoc, _mtime = libspec_manager_module._load_library_doc_and_mtime(
+        spec_filename, use_binary_cache=True
+    )
+    expected_md_docs = [markdown_doc(kw) for kw in libdoc.keywords]
+    assert any("**bold**" in md_doc for md_doc in expected_md_docs)
+
+    def convert(*args, **kwargs):
+        raise AssertionError("html_to_markdown.convert should not be called.")
+
+    monkeypatch.setattr(html_to_markdown, "convert", convert)
+
+    # When loaded from the cache, the markdown is read on demand (and the
+    # html isn't converted again).
+    cached, _mtime = libspec_manager_module._load_library_doc_and_mtime(
+        spec_filename, use_binary_cache=True
+    )
+    assert [markdown_doc(kw) for kw in cached.keywords] == expected_md_docs
+    # The raw doc is not needed for the markdown.
+    assert not any(isinstance(kw._doc, str) for kw in cached.keywords if kw._doc)
+
+
+def test_libspec_generation_single_flight(libspec_manager):
+    import threading
+
+    calls = []
+    release = threading.Event()
+
+    def _do_cached_create_libspec(libname, *args, **kwargs):
+        calls.append(libname)
+        assert release.wait(10)
+        return True
+
+    libspec_manager._do_cached_create_libspec = _do_cached_create_libspec
+
+    results = []
+
+    def create():
+        results.append(
+            libspec_manager._cached_create_libspec(
+                "my_lib", None, False, None, None, False, None, None, None
+            )
+        )
+
+    threads = [threading.Thread(target=create) for _i in range(3)]
+    for t in threads:
+        t.start()
+
+    def wait_for_call():
+        import time
+
+        timeout_at = time.time() + 5
+        while not calls and time.time() < timeout_at:
+            time.sleep(0.01)
+
+    wait_for_call()
+    release.set()
+    for t in threads:
+        t.join(10)
+
+    assert calls == ["my_lib"]
+    assert results == [True, True, True]
+    assert not libspec_manager._libspec_generation_futures
+
+
+def test_libspec_created_by_other_process(libspec_manager, workspace_dir):
+    from robotframework_ls.impl import libspec_manager as libspec_manager_module
+    from robotframework_ls_tests.fixtures import LIBSPEC_1
+
+    os.makedirs(workspace_dir)
+    spec_filename = os.path.join(workspace_dir, "my.libspec")
+    assert libspec_manager_module._get_mtime(spec_filename) is None
+    assert not libspec_manager._was_created_by_other_process(
+        spec_filename, None, None
+    )
+
+    with open(spec_filename, "w") as stream:
+        stream.write(LIBSPEC_1)
+    libspec_manager_module._dump_spec_filename_additional_info(
+        spec_filename, is_builtin=False, arguments=["a"]
+    )
+    assert libspec_manager._was_created_by_other_process(spec_filename, None, ["a"])
+    assert not libspec_manager._was_created_by_other_process(
+        spec_filename, None, ["b"]
+    )
+    mtime = libspec_manager_module._get_mtime(spec_filename)
+    assert not libspec_manager._was_created_by_other_process(
+        spec_filename, mtime, ["a"]
+    )
+
+
+def test_libspec_manager_prebuilt_builtins(tmpdir, cases, monkeypatch):
+    from robotframework_ls.impl import prebuilt_libspecs
+    from robotframework_ls.impl.libspec_manager import LibspecManager
+
+    builtin_libs = cases.get_path("builtin_libs")
+    libnames = sorted(
+        os.path.splitext(f)[0] for f in os.listdir(builtin_libs) if f.endswith(".libspec")
+    )
+    prebuilt_dir = str(tmpdir.join("prebuilt"))
+    prebuilt_libspecs.create_prebuilt_archive(
+        builtin_libs, LibspecManager.get_robot_version(), libnames, prebuilt_dir
+    )
+    monkeypatch.setattr(
+        prebuilt_libspecs, "get_prebuilt_libspecs_dir", lambda: prebuilt_dir
+    )
+
+    builtins_dir = str(tmpdir.join("builtins"))
+    libspec_manager = LibspecManager(
+        builtin_libspec_dir=builtins_dir,
+        user_libspec_dir=str(tmpdir.join("user_libspec")),
+    )
+    try:
+        for libname in libnames:
+            spec_filename = os.path.join(builtins_dir, libname + ".libspec")
+            with open(spec_filename, "rb") as stream:
+                contents = stream.read()
+            with open(os.path.join(builtin_libs, libname + ".libspec"), "rb") as stream:
+                assert contents == stream.read()
+            assert os.path.exists(spec_filename + ".m")
+        assert libspec_manager.get_library_info("Collections", create=False)
+
+        # Without the archive the missing ones are generated in a batch.
+        monkeypatch.setattr(
+            prebuilt_libspecs,
+            "get_prebuilt_libspecs_dir",
+            lambda: str(tmpdir.join("no_prebuilt")),
+        )
+        for libname in ("String", "XML"):
+            os.remove(os.path.join(builtins_dir, libname + ".libspec"))
+            os.remove(os.path.join(builtins_dir, libname + ".libspec.m"))
+
+        libspec_manager._create_builtin_libspecs(["String", "XML"])
+        for libname in ("String", "XML"):
+            spec_filename = os.path.join(builtins_dir, libname + ".libspec")
+            assert os.path.exists(spec_filename)
+            assert os.path.exists(spec_filename + ".m")
+
+        # If the batch fails (i.e.: times out), the temporary files it created
+        # are removed.
+        import pytest
+        from concurrent.futures import Future
+
+        def submit(fn, libraries, *args, **kwargs):
+            for _libname, output_filename in libraries:
+                with open(output_filename, "w") as stream:
+                    stream.write("<partial")
+            future = Future()
+            future.set_exception(TimeoutError())
+            return future
+
+        monkeypatch.setattr(libspec_manager.libdoc_worker_pool, "submit", submit)
+        with pytest.raises(TimeoutError):
+            libspec_manager._create_builtin_libspecs(["String", "XML"])
+        assert not [f for f in os.listdir(builtins_dir) if f.endswith(".tmp")]
+    finally:
+        libspec_manager.dispose()
+
+
+def test_source_mtime_cache(libspec_manager, workspace_dir):
+    import time
+    from robotframework_ls.impl.libspec_manager import _SourceMtimeCache
+    from robotframework_ls.impl.libspec_manager import _normfile
+    from robocorp_ls_core import watchdog_wrapper
+    from robocorp_ls_core.basic import wait_for_condition
+
+    os.makedirs(workspace_dir)
+    source = os.path.join(workspace_dir, "my_lib.py")
+    with open(source, "w") as stream:
+        stream.write("")
+
+    observer = watchdog_wrapper.create_observer()
+    cache = _SourceMtimeCache(observer)
+    try:
+        normfile, mtime = cache.get_normfile_and_mtime(source)
+        assert normfile == _normfile(source)
+        assert mtime == os.path.getmtime(source)
+
+        # Cached: no stat is done.
+        original_getmtime = os.path.getmtime
+
+        def getmtime(*args, **kwargs):
+            raise AssertionError("Should not stat cached source.")
+
+        os.path.getmtime = getmtime
+        try:
+            assert cache.get_normfile_and_mtime(source) == (normfile, mtime)
+        finally:
+            os.path.getmtime = original_getmtime
+
+        # A change in the filesystem invalidates the entry.
+        new_mtime = mtime + 10
+        os.utime(source, (new_mtime, new_mtime))
+        wait_for_condition(
+            lambda: cache.get_normfile_and_mtime(source)[1] == new_mtime,
+            msg="Change in source not detected.",
+        )
+    finally:
+        cache.dispose()
+        observer.dispose()
+
+    # When the directory can't be watched the mtime is re-checked after a timeout.
+    class _UnableToWatch(object):
+        def notify_on_any_change(self, *args, **kwargs):
+            raise RuntimeError("Unable to watch")
+
+    cache = _SourceMtimeCache(_UnableToWatch())
+    cache.UNWATCHED_TIMEOUT = 0.1
+    assert cache.get_normfile_and_mtime(source)[1] == new_mtime
+    os.utime(source, (mtime, mtime))
+    time.sleep(0.2)
+    assert cache.get_normfile_and_mtime(source)[1] == mtime
+
+
 def test_libspec_manager_basic(workspace, libspec_manager):
     import os
     from robotframework_ls.impl import robot_constants
@@ -286,3 +618,449 @@ def test_libspec_manager_basic(workspace, libspec_manager):
 
     assert get_library_info("case1_library", create=False) is None
     assert get_library_info("case1_library") is not None
+
+
+def test_libspec_content_store(libspec_manager, workspace_dir):
+    from robocorp_ls_core import uris
+
+    os.makedirs(workspace_dir)
+    with open(os.path.join(workspace_dir, "lib_with_args.py"), "w") as stream:
+        stream.write(
+            """
+class lib_with_args(object):
+    def __init__(self, arg):
+        pass
+
+    def my_keyword(self):
+        pass
+"""
+        )
+
+    doc_uri = uris.from_fs_path(os.path.join(workspace_dir, "my.robot"))
+    library_doc_a = libspec_manager.get_library_info(
+        "lib_with_args.py", current_doc_uri=doc_uri, arguments=("a",)
+    )
+    library_doc_b = libspec_manager.get_library_info(
+        "lib_with_args.py", current_doc_uri=doc_uri, arguments=("b",)
+    )
+    assert library_doc_a is not None
+    assert [kw.name for kw in library_doc_a.keywords] == ["My Keyword"]
+
+    # Both specs have the same contents: the LibraryDoc is shared.
+    assert library_doc_a is library_doc_b
+    assert library_doc_a.source == os.path.join(workspace_dir, "lib_with_args.py")
+
+    user_libspec_dir = libspec_manager.user_libspec_dir
+    spec_filenames = [
+        os.path.join(user_libspec_dir, f)
+        for f in os.listdir(user_libspec_dir)
+        if f.startswith("lib_with_args") and f.endswith(".libspec")
+    ]
+    assert len(spec_filenames) == 2
+    stats = [os.stat(f) for f in spec_filenames]
+    assert (stats[0].st_dev, stats[0].st_ino) == (stats[1].st_dev, stats[1].st_ino)
+
+
+def test_libspec_regenerate_same_content(libspec_manager, workspace_dir):
+    import time
+    from robocorp_ls_core import uris
+    from robocorp_ls_core.unittest_tools.fixtures import wait_for_test_condition
+
+    os.makedirs(workspace_dir)
+    lib_filename = os.path.join(workspace_dir, "same_content_lib.py")
+
+    def write_lib(body):
+        with open(lib_filename, "w") as stream:
+            stream.write(
+                """
+def my_keyword():
+    %s
+"""
+                % (body,)
+            )
+
+    write_lib("pass")
+    doc_uri = uris.from_fs_path(os.path.join(workspace_dir, "my.robot"))
+    library_doc = libspec_manager.get_library_info(
+        "same_content_lib.py", current_doc_uri=doc_uri
+    )
+    assert library_doc is not None
+
+    (lib_info,) = list(libspec_manager._iter_lib_info("same_content_lib"))
+
+    # Change the library without changing the generated spec (so, the spec
+    # is still a link to the same content and its mtime doesn't change).
+    time.sleep(1.1)
+    write_lib("return")
+
+    def check_invalid():
+        return not lib_info.verify_sources_sync(
+            (), None, libspec_manager._source_mtime_cache
+        )
+
+    wait_for_test_condition(check_invalid, sleep=1 / 5.0)
+
+    for _i in range(2):
+        library_doc = libspec_manager.get_library_info(
+            "same_content_lib.py", current_doc_uri=doc_uri
+        )
+        assert library_doc is not None
+        assert [kw.name for kw in library_doc.keywords] == ["My Keyword"]
+
+
+def test_libspec_new_variant_after_source_change(libspec_manager, workspace_dir):
+    import time
+    from robocorp_ls_core import uris
+    from robocorp_ls_core.unittest_tools.fixtures import wait_for_test_condition
+
+    os.makedirs(workspace_dir)
+    lib_filename = os.path.join(workspace_dir, "variant_lib.py")
+
+    def write_lib(keyword_names):
+        with open(lib_filename, "w") as stream:
+            stream.write(
+                """
+class variant_lib(object):
+    def __init__(self, arg=None):
+        pass
+"""
+            )
+            for keyword_name in keyword_names:
+                stream.write("\n    def %s(self):\n        pass\n" % (keyword_name,))
+
+    write_lib(["my_keyword"])
+    doc_uri = uris.from_fs_path(os.path.join(workspace_dir, "my.robot"))
+
+    def get_keyword_names(arguments):
+        library_doc = libspec_manager.get_library_info(
+            "variant_lib.py", current_doc_uri=doc_uri, arguments=arguments
+        )
+        assert library_doc is not None
+        return [kw.name for kw in library_doc.keywords]
+
+    fresh_worker_requests = []
+    pool = libspec_manager.libdoc_worker_pool
+    original_submit = pool.submit
+
+    def submit(fn, *args, fresh_worker=False):
+        fresh_worker_requests.append(fresh_worker)
+        return original_submit(fn, *args, fresh_worker=fresh_worker)
+
+    pool.submit = submit
+
+    assert get_keyword_names(("a",)) == ["My Keyword"]
+    assert fresh_worker_requests == [False]
+
+    time.sleep(1.1)
+    write_lib(["my_keyword", "new_keyword"])
+    wait_for_test_condition(
+        lambda: libspec_manager._get_changed_sources("variant_lib.py"),
+        sleep=1 / 5.0,
+    )
+
+    # A new variant (which has no spec yet) of the changed library must not
+    # be generated in a worker which has the old module imported.
+    del fresh_worker_requests[:]
+    assert get_keyword_names(("b",)) == ["My Keyword", "New Keyword"]
+    assert fresh_worker_requests == [True]
+
+    # Once generated in a fresh worker, the pool doesn't need to be recycled
+    # again for the same change.
+    del fresh_worker_requests[:]
+    assert get_keyword_names(("c",)) == ["My Keyword", "New Keyword"]
+    assert fresh_worker_requests == [False]
+
+
+def test_libspec_content_store_regenerate_identical(tmpdir):
+    import hashlib
+    from robotframework_ls.impl.libspec_content_store import LibspecContentStore
+    from robotframework_ls.impl.libspec_manager import _commit_libspec
+    from robotframework_ls.impl.libspec_manager import _get_tmp_libspec_filename
+
+    user_libspec_dir = str(tmpdir.join("user"))
+    os.makedirs(user_libspec_dir)
+    content_store = LibspecContentStore(str(tmpdir.join("content")), "4.0")
+    libspec_filename = os.path.join(user_libspec_dir, "my_lib.libspec")
+
+    def generate(generated):
+        tmp_libspec_filename = _get_tmp_libspec_filename(libspec_filename)
+        assert not os.path.exists(tmp_libspec_filename)
+        with open(tmp_libspec_filename, "w") as stream:
+            stream.write(
+                '<keywordspec name="my_lib" generated="%s"></keywordspec>' % (generated,)
+            )
+        content_hash = content_store.add(tmp_libspec_filename)
+        _commit_libspec(
+            tmp_libspec_filename,
+            libspec_filename,
+            is_builtin=True,
+            content_hash=content_hash,
+            content_store=content_store,
+        )
+        return content_hash
+
+    content_hash = generate("1")
+    # Identical contents: the spec is already a link to the same content.
+    assert generate("2") == content_hash
+    assert generate("3") == content_hash
+
+    # No temporary files are left behind and the content isn't changed.
+    assert sorted(os.listdir(user_libspec_dir)) == [
+        "my_lib.libspec",
+        "my_lib.libspec.m",
+    ]
+    with open(content_store.get_content_filename(content_hash), "rb") as stream:
+        assert hashlib.sha256(stream.read()).hexdigest() == content_hash
+
+
+def test_libspec_gc(tmpdir):
+    import time
+    from robotframework_ls.impl.libspec_gc import LibspecGarbageCollector
+    from robotframework_ls.impl.libspec_manager import _norm_filename
+
+    user_libspec_dir = str(tmpdir.join("user"))
+    os.makedirs(user_libspec_dir)
+
+    now = time.time()
+    day = 24 * 60 * 60
+    for i, name in enumerate(("old", "lib1", "lib2", "lib3")):
+        spec_filename = os.path.join(user_libspec_dir, name + ".libspec")
+        for filename in (spec_filename, spec_filename + ".m"):
+            with open(filename, "w") as stream:
+                stream.write("x" * 1024 * 100)
+        mtime = now - (100 - i) * day if name == "old" else now - (10 - i) * day
+        os.utime(spec_filename, (mtime, mtime))
+
+    gc = LibspecGarbageCollector(user_libspec_dir)
+
+    def listdir():
+        return sorted(f for f in os.listdir(user_libspec_dir) if not f.startswith("."))
+
+    # Only the one older than the max age is removed.
+    removed = gc.collect(max_size_mb=0, max_age_days=30, now=now)
+    assert [os.path.basename(f) for f in removed] == ["old.libspec"]
+    assert listdir() == [
+        "lib1.libspec",
+        "lib1.libspec.m",
+        "lib2.libspec",
+        "lib2.libspec.m",
+        "lib3.libspec",
+        "lib3.libspec.m",
+    ]
+
+    # lib1 is the oldest, but it was recently used (so, lib2 is removed when
+    # the size is exceeded).
+    gc.on_spec_used(_norm_filename(os.path.join(user_libspec_dir, "lib1.libspec")))
+    removed = gc.collect(max_size_mb=0.5, max_age_days=0, now=now)
+    assert [os.path.basename(f) for f in removed] == ["lib2.libspec"]
+    assert listdir() == [
+        "lib1.libspec",
+        "lib1.libspec.m",
+        "lib3.libspec",
+        "lib3.libspec.m",
+    ]
+
+    # The last use is persisted for other processes.
+    other_process_gc = LibspecGarbageCollector(user_libspec_dir)
+    removed = other_process_gc.collect(max_size_mb=0.3, max_age_days=0, now=now)
+    assert [os.path.basename(f) for f in removed] == ["lib3.libspec"]
+
+
+def test_libspec_gc_locks_and_copy_mode(tmpdir):
+    import threading
+    import time
+    from robocorp_ls_core.system_mutex import timed_acquire_mutex
+    from robotframework_ls.impl.libspec_gc import LibspecGarbageCollector
+    from robotframework_ls.impl.libspec_manager import _get_libspec_rw_mutex_name
+
+    user_libspec_dir = str(tmpdir.join("user"))
+    content_dir = str(tmpdir.join("content"))
+    os.makedirs(user_libspec_dir)
+    os.makedirs(content_dir)
+
+    now = time.time()
+    old = now - 100 * 24 * 60 * 60
+    spec_filename = os.path.join(user_libspec_dir, "old.libspec")
+    content_filename = os.path.join(content_dir, "abc.libspec")
+    for filename in (spec_filename, content_filename):
+        with open(filename, "w") as stream:
+            stream.write("x")
+        os.utime(filename, (old, old))
+
+    # When some spec is a copy of the contents, the contents aren't collected
+    # based on the number of links.
+    with open(os.path.join(content_dir, ".copy_mode"), "w"):
+        pass
+
+    gc = LibspecGarbageCollector(user_libspec_dir, content_dir)
+
+    # While the spec is being read in another process (or thread) it's kept.
+    acquired = threading.Event()
+    release = threading.Event()
+
+    def read_spec():
+        with timed_acquire_mutex(
+            _get_libspec_rw_mutex_name(spec_filename), shared=True
+        ):
+            acquired.set()
+            release.wait(10)
+
+    t = threading.Thread(target=read_spec)
+    t.start()
+    try:
+        assert acquired.wait(10)
+        assert gc.collect(max_size_mb=0, max_age_days=30, now=now) == []
+        assert os.path.exists(spec_filename)
+    finally:
+        release.set()
+        t.join(10)
+
+    assert gc.collect(max_size_mb=0, max_age_days=30, now=now) == [spec_filename]
+    assert os.path.exists(content_filename)
+
+    os.remove(os.path.join(content_dir, ".copy_mode"))
+    gc.collect(max_size_mb=0, max_age_days=30, now=now)
+    assert not os.path.exists(content_filename)
+
+
+def test_libspec_discovery(tmpdir):
+    import time
+    from robotframework_ls.impl import libspec_discovery
+    from robotframework_ls.impl.libspec_discovery import LibspecDirScanner
+
+    root = str(tmpdir.join("root"))
+    for relative in (
+        "a/b/c.libspec",
+        "a/d.libspec",
+        ".git/git.libspec",
+        "node_modules/pkg/node.libspec",
+        "env/lib/env.libspec",
+        "env/pyvenv.cfg",
+        "out/out.libspec",
+    ):
+        filename = os.path.join(root, *relative.split("/"))
+        if not os.path.isdir(os.path.dirname(filename)):
+            os.makedirs(os.path.dirname(filename))
+        with open(filename, "w") as stream:
+            stream.write("")
+
+    def make_dirs_old():
+        old = time.time() - 60
+        for dirpath, _dirs, _files in os.walk(root):
+            os.utime(dirpath, (old, old))
+
+    make_dirs_old()
+    scanner = LibspecDirScanner(root, recursive=True, excludes=["out"])
+
+    def found():
+        return sorted(
+            os.path.relpath(f, root).replace(os.sep, "/") for f in scanner.scan()
+        )
+
+    assert found() == ["a/b/c.libspec", "a/d.libspec"]
+
+    listed = []
+    original_list_dir = LibspecDirScanner._list_dir
+
+    def _list_dir(self, dirpath, relative_path):
+        listed.append(relative_path)
+        return original_list_dir(self, dirpath, relative_path)
+
+    LibspecDirScanner._list_dir = _list_dir
+    try:
+        # Nothing changed: nothing is listed again.
+        assert found() == ["a/b/c.libspec", "a/d.libspec"]
+        assert listed == []
+
+        # Only the changed dir is listed again.
+        with open(os.path.join(root, "a", "b", "new.libspec"), "w") as stream:
+            stream.write("")
+        assert found() == ["a/b/c.libspec", "a/b/new.libspec", "a/d.libspec"]
+        assert listed == ["a/b"]
+    finally:
+        LibspecDirScanner._list_dir = original_list_dir
+
+    # Changing the excludes makes a full scan.
+    scanner.set_excludes([])
+    assert found() == [
+        "a/b/c.libspec",
+        "a/b/new.libspec",
+        "a/d.libspec",
+        "out/out.libspec",
+    ]
+    assert "node_modules" in libspec_discovery.DEFAULT_EXCLUDES
+
+
+def test_libspec_failures_cache(tmpdir):
+    from robotframework_ls.impl.libspec_manager import _LibspecFailuresCache
+    from robotframework_ls.impl.libspec_manager import _get_import_candidates
+    from robotframework_ls.impl import libspec_manager as libspec_manager_module
+
+    base = str(tmpdir)
+    cache = _LibspecFailuresCache()
+    for libname in ("my_lib", "my_pkg.Library", "other"):
+        files, dirs = _get_import_candidates(libname, [base])
+        cache.add((libname,), reason="error", files=files, dirs=dirs, now=0)
+    assert cache.get(("my_lib",), now=1).reason == "error"
+    assert len(cache) == 3
+
+    # Only changes in the paths the import could use invalidate it.
+    assert not cache.on_path_changed(os.path.join(base, "my_lib_other.py"))
+    assert not cache.on_path_changed(os.path.join(base, "dir", "my_lib.py"))
+    assert len(cache) == 3
+
+    assert cache.on_path_changed(os.path.join(base, "my_lib.py"))
+    assert cache.get(("my_lib",), now=1) is None
+
+    assert cache.on_path_changed(os.path.join(base, "my_pkg", "sub", "helper.py"))
+    assert cache.get(("my_pkg.Library",), now=1) is None
+    assert len(cache) == 1
+
+    # The entry expires and the ttl is doubled on each consecutive failure.
+    ttl = libspec_manager_module._FAILURE_BASE_TTL
+    assert cache.get(("other",), now=ttl - 1) is not None
+    assert cache.get(("other",), now=ttl) is None
+    entry = cache.add(("other",), now=ttl)
+    assert entry.failures == 2
+    assert entry.ttl == ttl * 2
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_libspec_binary_cache_mapped(workspace_dir, monkeypatch):
+    from robotframework_ls.impl import libspec_manager as libspec_manager_module
+    from robotframework_ls.impl import libspec_cache
+    from robotframework_ls_tests.fixtures import LIBSPEC_1
+
+    if not libspec_cache._USE_MMAP:
+        return
+
+    monkeypatch.setattr(libspec_cache, "_MAX_MAPPED_FILES", 2)
+    os.makedirs(workspace_dir)
+
+    expected_docs = None
+    loaded = []
+    for i in range(3):
+        spec_filename = os.path.join(workspace_dir, "my%s.libspec" % (i,))
+        with open(spec_filename, "w") as stream:
+            stream.write(LIBSPEC_1)
+
+        libdoc, _mtime = libspec_manager_module._load_library_doc_and_mtime(
+            spec_filename, use_binary_cache=True
+        )
+        expected_docs = [kw.doc for kw in libdoc.keywords]
+        cached, _mtime = libspec_manager_module._load_library_doc_and_mtime(
+            spec_filename, use_binary_cache=True
+        )
+        loaded.append(cached)
+
+    # Only the last 2 are kept mapped.
+    assert len(libspec_cache._mapped_files) == 2
+
+    # The one which isn't mapped anymore is mapped again on demand.
+    assert [kw.doc for kw in loaded[0].keywords] == expected_docs
+    assert len(libspec_cache._mapped_files) == 2
+    for cache_file in list(libspec_cache._mapped_files):
+        cache_file.close()
+    assert not libspec_cache._mapped_files
@@ -0,0 +1,87 @@
+import os
+import threading
+
+
+class _LibspecManagerStub(object):
+    def __init__(self):
+        self.calls = []
+        self.release = threading.Event()
+        self.libspec_discovery_excludes = ()
+
+    def get_library_target_filename(self, libname, current_doc_uri):
+        return None
+
+    def get_library_info(self, libname, create=True, current_doc_uri=None, arguments=(), alias=None):
+        self.calls.append(libname)
+        assert self.release.wait(10)
+
+
+def test_libspec_warmup(tmpdir):
+    from robotframework_ls.impl.libspec_warmup import LibspecWarmup
+    from robotframework_ls.impl.robot_workspace import RobotWorkspace
+    from robocorp_ls_core import uris
+    from robocorp_ls_core.basic import wait_for_condition
+
+    root = str(tmpdir.join("ws"))
+    os.makedirs(root)
+    for name, libraries in (
+        ("a.robot", ("LibA1", "LibA2")),
+        ("b.robot", ("LibB",)),
+    ):
+        with open(os.path.join(root, name), "w") as stream:
+            stream.write("*** Settings ***\n")
+            for library in libraries:
+                stream.write("Library    %s\n" % (library,))
+
+    libspec_manager = _LibspecManagerStub()
+    warmup = LibspecWarmup(libspec_manager)
+    warmup.workspace = RobotWorkspace(uris.from_fs_path(root))
+    try:
+        warmup.add_folder(root)
+
+        # The first library is being generated (and blocks).
+        wait_for_condition(lambda: len(libspec_manager.calls) == 1)
+        wait_for_condition(lambda: len(warmup.get_pending_libraries()) == 2)
+        first = libspec_manager.calls[0]
+
+        # Opening a document prioritizes its libraries.
+        b_uri = uris.from_fs_path(os.path.join(root, "b.robot"))
+        warmup.on_doc_opened(b_uri)
+        if first != "LibB":
+            wait_for_condition(lambda: warmup.get_pending_libraries()[0] == "LibB")
+
+        # Removing the folder cancels the libraries only imported by documents
+        # which aren't opened.
+        warmup.remove_folder(root)
+        expected = [] if first == "LibB" else ["LibB"]
+        assert warmup.get_pending_libraries() == expected
+
+        libspec_manager.release.set()
+        wait_for_condition(lambda: not warmup.get_pending_libraries())
+        wait_for_condition(lambda: len(libspec_manager.calls) == 1 + len(expected))
+        assert libspec_manager.calls == [first] + expected
+    finally:
+        warmup.dispose()
+
+
+def test_libspec_warmup_scan_excludes(tmpdir):
+    from robotframework_ls.impl.libspec_warmup import LibspecWarmup
+    from robocorp_ls_core import uris
+
+    root = str(tmpdir.join("ws"))
+    for dirname in ("", "node_modules", "venv", "sub", "skipped"):
+        os.makedirs(os.path.join(root, dirname), exist_ok=True)
+        with open(os.path.join(root, dirname, "a.robot"), "w") as stream:
+            stream.write("*** Settings ***\nLibrary    Lib\n")
+
+    libspec_manager = _LibspecManagerStub()
+    libspec_manager.libspec_discovery_excludes = ("skipped",)
+    warmup = LibspecWarmup(libspec_manager)
+    try:
+        warmup._scan_folder(root)
+        assert sorted(warmup._pending_docs) == sorted(
+            uris.from_fs_path(os.path.join(root, dirname, "a.robot"))
+            for dirname in ("", "sub")
+        )
+    finally:
+        warmup.dispose()
@@ -67,3 +67,278 @@ def test_document_from_file(workspace, workspace_dir, cases):
 
     # The old one in memory doesn't change after the file is removed
     assert cached_doc3.source == "new contents"
+
+
+def _ast_as_tuples(ast):
+    import ast as ast_module
+    from robot.parsing.model.statements import Statement
+
+    ret = []
+    for node in ast_module.walk(ast):
+        if isinstance(node, Statement):
+            ret.append(
+                (
+                    node.__class__.__name__,
+                    tuple(
+                        (t.type, t.value, t.lineno, t.col_offset, t.error)
+                        for t in node.tokens
+                    ),
+                )
+            )
+        else:
+            ret.append((node.__class__.__name__,))
+    return ret
+
+
+def _change(line, col, end_line, end_col, text):
+    return {
+        "range": {
+            "start": {"line": line, "character": col},
+            "end": {"line": end_line, "character": end_col},
+        },
+        "text": text,
+    }
+
+
+def test_get_ast_incremental(tmpdir):
+    from robocorp_ls_core import uris
+    from robocorp_ls_core.lsp import TextDocumentItem
+    from robotframework_ls.impl.robot_workspace import RobotWorkspace
+    from robotframework_ls.impl.robot_workspace import RobotDocument
+
+    ws = RobotWorkspace(uris.from_fs_path(str(tmpdir)), generate_ast=True)
+    doc_uri = uris.from_fs_path(str(tmpdir.join("my.robot")))
+    ws.put_document(
+        TextDocumentItem(
+            doc_uri,
+            text="""*** Settings ***
+Library    Collections
+
+*** Test Cases ***
+Test 1
+    Log    1
+
+Test 2
+    Log    2
+    My Keyword
+
+*** Keywords ***
+My Keyword
+    Log    3
+
+Other Keyword
+    Log    4
+""",
+        )
+    )
+    doc = ws.get_document(doc_uri, accept_from_file=False)
+    initial_ast = doc.get_ast()
+    initial_ast_as_tuples = _ast_as_tuples(initial_ast)
+
+    changes = [
+        # Change inside a line of a test case.
+        _change(5, 8, 5, 9, "Changed"),
+        # Add a line in a test case.
+        _change(9, 14, 9, 14, "\n    Log    New"),
+        # Add a line in the last keyword.
+        _change(17, 14, 17, 14, "\n    Log    Last"),
+        # Create a new keyword (boundaries of the block change).
+        _change(13, 14, 13, 14, "\n\nNew Keyword\n    No Operation"),
+        # Change in the settings.
+        _change(1, 0, 1, 0, "Library    String\n"),
+        # Remove the name of a test case.
+        _change(8, 0, 8, 6, ""),
+        # Change spanning multiple sections.
+        _change(2, 0, 5, 0, ""),
+    ]
+
+    version = 1
+    for change in changes:
+        version += 1
+        ws.update_document(TextDocumentItem(doc_uri, version=version), change)
+        new_doc = ws.get_document(doc_uri, accept_from_file=False)
+        assert new_doc is not doc
+        incremental_ast = new_doc.get_ast()
+
+        full_ast = RobotDocument(new_doc.uri, new_doc.source).get_ast()
+        assert _ast_as_tuples(incremental_ast) == _ast_as_tuples(full_ast)
+        doc = new_doc
+
+    # The previous AST must not be changed.
+    assert _ast_as_tuples(initial_ast) == initial_ast_as_tuples
+
+
+def test_get_ast_incremental_reuses_nodes(tmpdir):
+    from robocorp_ls_core import uris
+    from robocorp_ls_core.lsp import TextDocumentItem
+    from robotframework_ls.impl.robot_workspace import RobotWorkspace
+
+    ws = RobotWorkspace(uris.from_fs_path(str(tmpdir)), generate_ast=True)
+    doc_uri = uris.from_fs_path(str(tmpdir.join("my.robot")))
+    ws.put_document(
+        TextDocumentItem(
+            doc_uri,
+            text="""*** Test Cases ***
+Test 1
+    Log    1
+
+*** Keywords ***
+My Keyword
+    Log    3
+
+Other Keyword
+    Log    4
+""",
+        )
+    )
+    doc = ws.get_document(doc_uri, accept_from_file=False)
+    ast = doc.get_ast()
+
+    # Pending changes (the AST is only requested after all of those).
+    ws.update_document(TextDocumentItem(doc_uri, version=2), _change(6, 12, 6, 12, "0"))
+    ws.update_document(TextDocumentItem(doc_uri, version=3), _change(6, 13, 6, 13, "0"))
+    new_doc = ws.get_document(doc_uri, accept_from_file=False)
+    new_ast = new_doc.get_ast()
+    assert "Log    300" in new_doc.source
+
+    # Only the changed keyword is re-parsed.
+    assert new_ast is not ast
+    assert new_ast.sections[0] is ast.sections[0]
+    assert new_ast.sections[1] is not ast.sections[1]
+    assert new_ast.sections[1].body[0] is not ast.sections[1].body[0]
+    assert new_ast.sections[1].body[1] is ast.sections[1].body[1]
+
+
+def test_get_ast_incremental_reused_node_find_token(tmpdir):
+    from robocorp_ls_core import uris
+    from robocorp_ls_core.lsp import TextDocumentItem
+    from robotframework_ls.impl import ast_utils
+    from robotframework_ls.impl.robot_workspace import RobotWorkspace
+
+    ws = RobotWorkspace(uris.from_fs_path(str(tmpdir)), generate_ast=True)
+    doc_uri = uris.from_fs_path(str(tmpdir.join("my.robot")))
+    ws.put_document(
+        TextDocumentItem(
+            doc_uri,
+            text="""*** Keywords ***
+My Keyword
+    Log    1
+
+Other Keyword
+    Log    2
+""",
+        )
+    )
+    doc = ws.get_document(doc_uri, accept_from_file=False)
+    ast = doc.get_ast()
+    other_keyword = ast.sections[0].body[1]
+
+    # Fill the caches in the block which will be reused.
+    token_info = ast_utils.find_token(other_keyword, 5, 4)
+    assert token_info.token.value == "Log"
+    assert token_info.token.lineno == 6
+    assert getattr(other_keyword, ast_utils.LINE_INDEX_CACHE_ATTR) is not None
+
+    # Change in the previous keyword which doesn't change the number of lines.
+    ws.update_document(TextDocumentItem(doc_uri, version=2), _change(2, 12, 2, 12, "0"))
+    new_doc = ws.get_document(doc_uri, accept_from_file=False)
+    new_ast = new_doc.get_ast()
+    assert new_ast.sections[0].body[0] is not ast.sections[0].body[0]
+    assert new_ast.sections[0].body[1] is other_keyword
+
+    # The caches in the reused block are still valid.
+    for node in (other_keyword, new_ast):
+        token_info = ast_utils.find_token(node, 5, 11)
+        assert token_info.token.value == "2"
+        assert token_info.token.lineno == 6
+        assert token_info.node.lineno == 6
+
+    token_info = ast_utils.find_token(new_ast, 2, 11)
+    assert token_info.token.value == "10"
+
+
+def test_get_ast_incremental_template(tmpdir):
+    from robocorp_ls_core import uris
+    from robocorp_ls_core.lsp import TextDocumentItem
+    from robotframework_ls.impl.robot_workspace import RobotWorkspace
+    from robotframework_ls.impl.robot_workspace import RobotDocument
+
+    ws = RobotWorkspace(uris.from_fs_path(str(tmpdir)), generate_ast=True)
+    doc_uri = uris.from_fs_path(str(tmpdir.join("my.robot")))
+    ws.put_document(
+        TextDocumentItem(
+            doc_uri,
+            text="""*** Settings ***
+Test Template    Log
+
+*** Test Cases ***
+Test 1
+    1
+""",
+        )
+    )
+    doc = ws.get_document(doc_uri, accept_from_file=False)
+    doc.get_ast()
+
+    for version, change in enumerate(
+        [
+            _change(5, 5, 5, 5, "0"),
+            # Removing the template changes how the test cases are lexed.
+            _change(1, 0, 2, 0, ""),
+        ]
+    ):
+        ws.update_document(TextDocumentItem(doc_uri, version=version + 2), change)
+        new_doc = ws.get_document(doc_uri, accept_from_file=False)
+        full_ast = RobotDocument(new_doc.uri, new_doc.source).get_ast()
+        assert _ast_as_tuples(new_doc.get_ast()) == _ast_as_tuples(full_ast)
+
+
+def test_get_ast_incremental_block_name_changes(tmpdir):
+    from robocorp_ls_core import uris
+    from robocorp_ls_core.lsp import TextDocumentItem
+    from robotframework_ls.impl.robot_workspace import RobotWorkspace
+    from robotframework_ls.impl.robot_workspace import RobotDocument
+
+    source = """*** Test Cases ***
+Test 1
+    Log    1
+
+Test 2
+    Log    2
+
+*** Keywords ***
+My Keyword
+    Log    3
+
+Other Keyword
+    Log    4
+"""
+    for change in [
+        # The name of the block is indented (it becomes a part of the
+        # previous block).
+        _change(4, 0, 4, 0, "  "),
+        # The name of the block becomes a continuation.
+        _change(4, 0, 4, 0, "...    "),
+        # A line starting with '*' is an (invalid) section header which
+        # changes how the lines after it are lexed.
+        _change(9, 0, 9, 0, "**\n"),
+        _change(4, 0, 4, 0, "*"),
+    ]:
+        ws = RobotWorkspace(uris.from_fs_path(str(tmpdir)), generate_ast=True)
+        doc_uri = uris.from_fs_path(str(tmpdir.join("my.robot")))
+        ws.put_document(TextDocumentItem(doc_uri, text=source))
+        ws.get_document(doc_uri, accept_from_file=False).get_ast()
+
+        ws.update_document(TextDocumentItem(doc_uri, version=2), change)
+        new_doc = ws.get_document(doc_uri, accept_from_file=False)
+        full_ast = RobotDocument(new_doc.uri, new_doc.source).get_ast()
+        assert _ast_as_tuples(new_doc.get_ast()) == _ast_as_tuples(full_ast)
+
+        test_names = [
+            (test.name, test.lineno)
+            for section in new_doc.get_ast().sections
+            if section.__class__.__name__ == "TestCaseSection"
+            for test in section.body
+        ]
+        if change["text"] == "  ":
+            assert test_names == [("Test 1", 2)]
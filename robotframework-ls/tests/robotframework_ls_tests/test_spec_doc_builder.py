@@ -44,3 +44,113 @@ def test_spec_doc_builder(
                 ]
             }
         data_regression.check(check, basename=f"{p.name}_expected")
+
+
+def test_spec_doc_builder_data_roundtrip(original_datadir):
+    from robotframework_ls.impl.robot_specbuilder import SpecDocBuilder
+    from robotframework_ls.impl.robot_specbuilder import library_doc_to_data
+    from robotframework_ls.impl.robot_specbuilder import library_doc_from_data
+    import marshal
+
+    for p in original_datadir.glob("*.libspec"):
+        library_doc = SpecDocBuilder().build(str(p))
+        data = marshal.loads(marshal.dumps(library_doc_to_data(library_doc)))
+        loaded = library_doc_from_data(str(p), data)
+
+        assert library_doc_to_data(loaded) == library_doc_to_data(library_doc)
+        assert loaded.source == library_doc.source
+        for keyword in loaded.keywords:
+            assert keyword.libdoc is loaded
+
+
+def test_spec_doc_builder_normalized_name_index(original_datadir):
+    from robotframework_ls.impl.robot_specbuilder import SpecDocBuilder
+    from robotframework_ls.impl.text_utilities import normalize_robot_name
+
+    for p in original_datadir.glob("*.libspec"):
+        library_doc = SpecDocBuilder().build(str(p))
+        for keyword in library_doc.keywords:
+            assert keyword.normalized_name == normalize_robot_name(keyword.name)
+            assert keyword in library_doc.get_keywords_by_normalized_name(
+                keyword.normalized_name
+            )
+
+            prefix = keyword.normalized_name[:3]
+            found = list(library_doc.iter_keywords_by_normalized_name(prefix))
+            assert keyword in found
+            assert set(found) == set(
+                kw
+                for kw in library_doc.keywords
+                if kw.normalized_name.startswith(prefix)
+            )
+
+        assert library_doc.get_keywords_by_normalized_name("notthere") == []
+
+
+def test_spec_doc_builder_compact_model(original_datadir):
+    from robotframework_ls.impl.robot_specbuilder import SpecDocBuilder
+    from robotframework_ls.impl.robot_specbuilder import library_doc_to_data
+    from robotframework_ls.impl.robot_specbuilder import library_doc_from_data
+    import marshal
+    import sys
+
+    for p in original_datadir.glob("*.libspec"):
+        library_doc = SpecDocBuilder().build(str(p))
+        loaded = library_doc_from_data(
+            str(p), marshal.loads(marshal.dumps(library_doc_to_data(library_doc)))
+        )
+        for libdoc in (library_doc, loaded):
+            assert not hasattr(libdoc, "__dict__")
+            assert isinstance(libdoc.keywords, tuple)
+            assert isinstance(libdoc.inits, tuple)
+            for keyword in libdoc.keywords:
+                assert not hasattr(keyword, "__dict__")
+                assert isinstance(keyword.tags, tuple)
+                for arg in keyword.args:
+                    assert not hasattr(arg, "__dict__")
+                    assert arg.arg_name is sys.intern(arg.arg_name)
+                    if arg.arg_type is not None:
+                        assert arg.arg_type is sys.intern(arg.arg_type)
+
+
+def test_spec_doc_builder_header_only(original_datadir):
+    from robotframework_ls.impl.robot_specbuilder import SpecDocBuilder
+
+    for p in original_datadir.glob("*.libspec"):
+        library_doc = SpecDocBuilder().build(str(p))
+        header = SpecDocBuilder().build(str(p), header_only=True)
+        assert header.keywords == ()
+        assert header.inits == ()
+        assert header.doc == ""
+        for attr in ("name", "type", "version", "specversion", "scope", "source"):
+            assert getattr(header, attr) == getattr(library_doc, attr)
+
+
+def test_keyword_doc_source_resolved_once(tmpdir, monkeypatch):
+    from robotframework_ls.impl.robot_specbuilder import KeywordDoc
+    from robotframework_ls.impl.robot_specbuilder import LibraryDoc
+    import os
+    import weakref
+
+    spec_filename = str(tmpdir.join("lib.libspec"))
+    library_doc = LibraryDoc(spec_filename, name="lib", source="lib.py")
+    keyword = KeywordDoc(weakref.ref(library_doc), name="kw", source="lib.py")
+
+    original_make_absolute = LibraryDoc._make_absolute
+    calls = []
+
+    def _make_absolute(self, source):
+        calls.append(source)
+        return original_make_absolute(self, source)
+
+    monkeypatch.setattr(LibraryDoc, "_make_absolute", _make_absolute)
+
+    expected = os.path.join(str(tmpdir), "lib.py")
+    assert keyword.source == expected
+    assert keyword.source == expected
+    assert calls == ["lib.py"]
+
+    absolute_keyword = KeywordDoc(weakref.ref(library_doc), name="kw2", source=expected)
+    assert absolute_keyword.source == expected
+    assert KeywordDoc(weakref.ref(library_doc), name="kw3").source is None
+    assert calls == ["lib.py"]
@@ -37,6 +37,62 @@ def test_diagnostics(language_server, ws_root_path, data_regression):
     check_diagnostics(language_server, data_regression)
 
 
+def test_diagnostics_of_dependents(language_server, ws_root_path):
+    from robocorp_ls_core import uris
+    from robocorp_ls_core.unittest_tools.fixtures import TIMEOUT
+    import time
+
+    language_server.initialize(ws_root_path, process_id=os.getpid())
+
+    resource_contents = """*** Keywords ***
+My Keyword
+    No Operation"""
+    suite_contents = """*** Settings ***
+Resource    my.resource
+
+*** Test Cases ***
+Check
+    My Keyword"""
+
+    os.makedirs(ws_root_path, exist_ok=True)
+    resource_path = os.path.join(ws_root_path, "my.resource")
+    suite_path = os.path.join(ws_root_path, "my_suite.robot")
+    with open(resource_path, "w") as stream:
+        stream.write(resource_contents)
+    with open(suite_path, "w") as stream:
+        stream.write(suite_contents)
+
+    resource_uri = uris.from_fs_path(resource_path)
+    suite_uri = uris.from_fs_path(suite_path)
+
+    def wait_for_diagnostics(uri, check):
+        timeout_at = time.time() + TIMEOUT
+        while time.time() < timeout_at:
+            message_matcher = language_server.obtain_pattern_message_matcher(
+                {"method": "textDocument/publishDiagnostics"}
+            )
+            if not message_matcher.event.wait(timeout_at - time.time()):
+                break
+            params = message_matcher.msg["params"]
+            if params["uri"] == uri and check(params["diagnostics"]):
+                return
+        raise AssertionError("Diagnostics not published as expected for: %s" % (uri,))
+
+    language_server.open_doc(suite_uri, 1, suite_contents)
+    language_server.open_doc(resource_uri, 1, resource_contents)
+    wait_for_diagnostics(suite_uri, lambda diagnostics: diagnostics == [])
+
+    # Changing the keywords of the resource lints the suite again.
+    language_server.change_doc(
+        resource_uri, 2, resource_contents.replace("My Keyword", "Renamed Keyword")
+    )
+    wait_for_diagnostics(
+        suite_uri,
+        lambda diagnostics: [d["message"] for d in diagnostics]
+        == ["Undefined keyword: My Keyword."],
+    )
+
+
 def test_section_completions_integrated(language_server, ws_root_path, data_regression):
     language_server.initialize(ws_root_path, process_id=os.getpid())
     uri = "untitled:Untitled-1"
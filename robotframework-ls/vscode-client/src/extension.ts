@@ -38,7 +38,9 @@ function createClientOptions(initializationOptions: object): LanguageClientOptio
 	const clientOptions: LanguageClientOptions = {
 		documentSelector: ["robotframework"],
 		synchronize: {
-			configurationSection: ["robot", "robocorp.home"]
+			configurationSection: ["robot", "robocorp.home"],
+			// Used to keep the keywords from resources which aren't opened up to date.
+			fileEvents: workspace.createFileSystemWatcher("**/*.{robot,resource,txt,tsv}")
 		},
 		outputChannel: OUTPUT_CHANNEL,
 		initializationOptions: initializationOptions,